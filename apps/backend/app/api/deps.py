@@ -1,17 +1,52 @@
-from typing import Generator
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Generator, TypeVar, Union
 
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_access_token
-from app.db.session import SessionLocal
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.security import decode_access_token_claims
+from app.db.read_routing import read_sessionmaker
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.db.models.user import User
 
 security = HTTPBearer(auto_error=False)
 
+DbSession = Union[Session, AsyncSession]
+T = TypeVar("T")
 
-def get_db() -> Generator[Session, None, None]:
+
+@dataclass(frozen=True)
+class Principal:
+    """Usuário autenticado, sem sessão/ORM atrelado (é o que fica no cache)."""
+
+    id: str
+    email: str
+    name: str | None
+
+
+# token -> Principal. TTL nunca passa do exp do próprio token.
+principal_cache = LRUCache(maxsize=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: str) -> None:
+    """Derruba do cache todos os tokens desse usuário."""
+    principal_cache.delete_where(lambda p: p.id == user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
@@ -19,20 +54,94 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# DB_MODE escolhe o tipo de sessão entregue às rotas
+get_db = get_async_db if settings.is_async_db() else get_sync_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], /, **kwargs: Any) -> T:
+    """
+    Roda uma função de service (sync, recebe Session) com a sessão da rota.
+    - AsyncSession: via run_sync, no event loop (greenlet), sem ocupar o threadpool
+    - Session: no threadpool, como um handler `def` faria
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, **kwargs)
+    return await run_in_threadpool(fn, db, **kwargs)
+
+
+async def end_transaction(db: DbSession) -> None:
+    """
+    Fecha a transação da sessão e devolve a conexão ao pool antes de uma espera longa fora do
+    banco (ex.: fila do argon2). Objetos lidos ficam expirados: copie o que precisar antes.
+    """
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        await run_in_threadpool(db.rollback)
+
+
+def _load_principal(db: Session, *, user_id: str) -> Principal | None:
+    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    if not user:
+        return None
+    return Principal(id=user.id, email=user.email, name=user.name)
+
+
+async def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
     if creds is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     token = creds.credentials
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
-        user_id = decode_access_token(token)
+        user_id, exp = decode_access_token_claims(token)
     except Exception:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # miss: sessão própria, só aqui (hit não pega conexão do pool)
+    if settings.is_async_db():
+        async with AsyncSessionLocal() as db:
+            principal = await db.run_sync(_load_principal, user_id=user_id)
+    else:
+        def _lookup() -> Principal | None:
+            with SessionLocal() as db:
+                return _load_principal(db, user_id=user_id)
+
+        principal = await run_in_threadpool(_lookup)
+
+    if principal is None:
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return user
+
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        principal_cache.set(token, principal, ttl_seconds=ttl)
+    return principal
+
+
+def get_sync_read_db(current_user: Principal = Depends(get_current_user)) -> Generator[Session, None, None]:
+    db = read_sessionmaker(current_user.id)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(current_user: Principal = Depends(get_current_user)) -> AsyncGenerator[AsyncSession, None]:
+    async with read_sessionmaker(current_user.id, is_async=True)() as db:
+        yield db
+
+
+# rotas só de leitura (relatórios, listagens): réplica, exceto logo depois de uma escrita do usuário
+get_read_db = get_async_read_db if settings.is_async_db() else get_sync_read_db
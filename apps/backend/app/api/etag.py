@@ -0,0 +1,62 @@
+"""
+GET condicional com ETag fraca a partir da versão dos dados do usuário.
+
+O cliente manda de volta o ETag em If-None-Match; se bater, a rota responde 304
+sem rodar a consulta/agregação.
+"""
+from typing import Callable, TypeVar
+
+from fastapi import Response
+from sqlalchemy.orm import Session
+
+from app.services.version_service import get_data_version
+
+# revalida sempre, mas deixa o navegador guardar a resposta pra usar no 304
+CACHE_CONTROL = "private, no-cache"
+
+T = TypeVar("T")
+
+
+def weak_etag(*parts: object) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # comparação fraca: ignora o prefixo W/
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def load_if_modified(
+    db: Session,
+    *,
+    user_id: str,
+    if_none_match: str | None,
+    load: Callable[[Session, int], T],
+    etag_extra: tuple = (),
+) -> tuple[str, T | None]:
+    """
+    Lê a versão, compara com If-None-Match e só então chama load(db, versão).
+    Devolve (etag, None) quando não mudou. Pra rodar via run_db: tudo numa ida só ao
+    threadpool/run_sync, sem segurar a conexão entre duas idas.
+    A versão é lida ANTES do load: se uma escrita entrar no meio, o resultado fica sob a
+    versão velha (nunca dado velho sob versão nova).
+    """
+    version = get_data_version(db, user_id=user_id)
+    etag = weak_etag(version, *etag_extra)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, load(db, version)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
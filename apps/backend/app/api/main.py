@@ -1,27 +1,85 @@
+import asyncio
+import contextlib
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.engine import make_url
 
+from app.api.middleware import RateLimitMiddleware, RequestMetricsMiddleware
+from app.core import events
 from app.core.config import settings
+from app.core.security import preload_backends
+from app.services import partition_service
+from app.services.report_job_service import runner as report_job_runner
 from app.api.routes.auth import router as auth_router
 from app.api.routes.works import router as works_router
 from app.api.routes.timer import router as timer_router
+from app.api.routes.timers import router as timers_router
 from app.api.routes.reports import router as reports_router
+from app.api.routes.stream import router as stream_router
+from app.api.routes.health import router as health_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # jose/argon2 carregam em paralelo com os primeiros requests, não antes do primeiro
+    threading.Thread(target=preload_backends, name="preload-crypto", daemon=True).start()
+    listener = None
+    if settings.EVENTS_BACKEND == "postgres":
+        # LISTEN usa psycopg direto: tira o "+driver" da URL do SQLAlchemy
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        listener = asyncio.create_task(events.listen_postgres(dsn))
+    maintenance = None
+    if settings.TIME_ENTRY_PARTITION_CHECK_HOURS > 0 and make_url(settings.DATABASE_URL).get_backend_name() == "postgresql":
+        # cria as partições dos próximos meses antes de alguém precisar delas
+        maintenance = asyncio.create_task(
+            partition_service.run_maintenance(settings.TIME_ENTRY_PARTITION_CHECK_HOURS * 3600)
+        )
+    yield
+    report_job_runner.shutdown()
+    for task in (listener, maintenance):
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+def create_app() -> FastAPI:
+    """
+    Monta o app. Não abre conexão nem thread: dá pra importar/criar antes do fork
+    (`uvicorn --factory app.api.main:create_app`, `gunicorn --preload`).
+    """
+    app = FastAPI(title="Worklog API", lifespan=lifespan)
 
-app = FastAPI(title="Worklog API")
+    # por dentro do CORS (o 429 leva os headers de CORS) e das métricas (o 429 aparece nelas)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_list(),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # deixa o front ler o Server-Timing do RequestMetricsMiddleware
+        expose_headers=["Server-Timing", "Retry-After"],
+    )
+    app.add_middleware(RequestMetricsMiddleware)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_list(),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    app.include_router(auth_router)
+    app.include_router(works_router)
+    app.include_router(timer_router)
+    app.include_router(timers_router)
+    app.include_router(reports_router)
+    app.include_router(stream_router)
+    app.include_router(health_router)
+    return app
 
-app.include_router(auth_router)
-app.include_router(works_router)
-app.include_router(timer_router)
-app.include_router(reports_router)
 
-@app.get("/health")
-def health():
-    return {"ok": True}
+def __getattr__(name: str):
+    # `uvicorn app.api.main:app` continua valendo; o app só é montado quando alguém pede
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,150 @@
+import json
+import logging
+import random
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import principal_cache
+from app.core import metrics
+from app.core.config import settings
+from app.core.errors import too_many_requests
+from app.core.rate_limit import RateLimiter, limiter, route_class
+from app.core.security import decode_access_token_claims
+from app.db import query_stats
+
+logger = logging.getLogger("app.requests")
+
+
+def _route_label(scope: Scope) -> str:
+    # template da rota (/works/{work_id}/timer), não o path: cardinalidade fixa
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    Por request: tempo do handler, e (nos amostrados) quantidade/tempo de SQL e a query
+    mais lenta. Devolve no header Server-Timing, alimenta os histogramas de /metrics e
+    loga os requests acima de SLOW_REQUEST_MS.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.sample_rate = settings.request_metrics_sample_rate()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+        stats, token = query_stats.begin() if sampled else (None, None)
+        t0 = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if stats is not None:
+                    # headers saem antes do corpo: num stream, vale o que rodou até aqui
+                    handler_ms = (time.perf_counter() - t0) * 1000
+                    timing = (
+                        f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries", '
+                        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}, "
+                        f"app;dur={handler_ms:.1f}"
+                    )
+                    message.setdefault("headers", []).append((b"server-timing", timing.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            if token is not None:
+                query_stats.end(token)
+            self._record(scope, status, elapsed, stats)
+
+    def _record(self, scope: Scope, status: int, elapsed: float, stats: query_stats.QueryStats | None) -> None:
+        method = scope["method"]
+        route = _route_label(scope)
+        metrics.request_duration.observe(elapsed, method, route, str(status))
+        if stats is not None:
+            metrics.request_db_duration.observe(stats.total_seconds, method, route)
+            metrics.request_db_queries.observe(stats.count, method, route)
+
+        if elapsed * 1000 < settings.SLOW_REQUEST_MS:
+            return
+        record = {
+            "event": "slow_request",
+            "method": method,
+            "route": route,
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+        }
+        if stats is not None:
+            record.update(
+                {
+                    "db_queries": stats.count,
+                    "db_ms": round(stats.total_seconds * 1000, 1),
+                    "slowest_query_ms": round(stats.slowest_seconds * 1000, 1),
+                    "slowest_query": stats.slowest_statement,
+                }
+            )
+        logger.warning(json.dumps(record))
+
+
+def _bearer_token(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            return token.strip() or None
+    return None
+
+
+def _subject(scope: Scope, cls: str) -> str:
+    """sub do JWT (o mesmo usuário que get_current_user vai achar); sem token válido, o IP."""
+    token = None if cls == "auth" else _bearer_token(scope)
+    if token is not None:
+        # peek: quem conta hit/miss do cache de auth é o get_current_user
+        cached = principal_cache.peek(token)
+        if cached is not None:
+            return f"u:{cached.id}"
+        try:
+            user_id, _ = decode_access_token_claims(token)
+            return f"u:{user_id}"
+        except ValueError:
+            pass  # a rota responde 401; até lá conta no IP
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """
+    Token bucket por usuário e classe de rota (app.core.rate_limit). Fica por fora das rotas:
+    o 429 sai antes de qualquer dependência, então não pega sessão nem conexão do pool.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.limiter.enabled:
+            await self.app(scope, receive, send)
+            return
+        cls = route_class(scope["method"], scope["path"])
+        if cls is not None:
+            retry_after = await self.limiter.retry_after(cls, _subject(scope, cls))
+            if retry_after:
+                exc = too_many_requests(retry_after=retry_after)
+                await JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)(
+                    scope, receive, send
+                )
+                return
+        await self.app(scope, receive, send)
@@ -1,35 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.core.security import hash_password, verify_password, create_access_token
-from app.db.models.user import User
+from app.api.deps import DbSession, end_transaction, get_db, run_db
+from app.core.errors import service_unavailable
+from app.core.security import HashingBusy, hash_password_async, verify_password_async, create_access_token
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
+from app.services.auth_service import create_user, get_user_by_email
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+BUSY_RETRY_AFTER_SECONDS = 2
+
 
 @router.post("/register")
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
-    exists = db.query(User).filter(User.email == payload.email).first()
+async def register(payload: RegisterRequest, db: DbSession = Depends(get_db)):
+    exists = await run_db(db, get_user_by_email, email=payload.email)
     if exists:
         raise HTTPException(status_code=409, detail="Email already registered")
+    # sem conexão presa durante a fila do hashing; create_user abre outra transação
+    await end_transaction(db)
+
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except HashingBusy:
+        raise service_unavailable("Too many auth requests, try again", retry_after=BUSY_RETRY_AFTER_SECONDS)
 
-    u = User(
-    email=payload.email,
-    password_hash=hash_password(payload.password),
-    name=payload.name,
- )
-    db.add(u)
-    db.commit()
+    await run_db(db, create_user, email=payload.email, password_hash=password_hash, name=payload.name)
     return {"ok": True}
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    u = db.query(User).filter(User.email == payload.email).first()
-    if not u or not verify_password(payload.password, u.password_hash):
+async def login(payload: LoginRequest, db: DbSession = Depends(get_db)):
+    u = await run_db(db, get_user_by_email, email=payload.email)
+    if not u:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    user_id, password_hash = u.id, u.password_hash
+    # a verificação pode esperar na fila do hashing: não segura a conexão do pool até lá
+    await end_transaction(db)
+
+    try:
+        ok = await verify_password_async(payload.password, password_hash)
+    except HashingBusy:
+        raise service_unavailable("Too many auth requests, try again", retry_after=BUSY_RETRY_AFTER_SECONDS)
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token(subject=u.id)
+    token = create_access_token(subject=user_id)
     return TokenResponse(access_token=token)
@@ -0,0 +1,120 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import principal_cache
+from app.api.routes.reports import summary_cache
+from app.core import events, metrics
+from app.core.rate_limit import limiter
+from app.core.security import hashing_pool
+from app.db import read_routing
+from app.services.report_job_service import runner as report_job_runner
+from app.db.pool_metrics import snapshot_all as pool_snapshot
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+def health():
+    return {"ok": True}
+
+
+@router.get("/health/pool")
+def pool_health():
+    # espera no checkout, conexões em uso e overflow de cada pool
+    return pool_snapshot()
+
+
+@router.get("/health/replica")
+def replica_health():
+    # quantas leituras foram pra réplica e quantas voltaram pro primário (read-your-writes)
+    return {
+        "configured": read_routing.replica_configured(),
+        "lag_seconds": read_routing.replica_lag_seconds(),
+        **read_routing.recent_writers.stats(),
+    }
+
+
+@router.get("/health/hashing")
+def hashing_health():
+    # fila do pool de argon2 (login/register)
+    return hashing_pool.stats()
+
+
+@router.get("/health/report-jobs")
+def report_jobs_health():
+    # pool dos relatórios em background deste processo
+    return report_job_runner.stats()
+
+
+@router.get("/health/rate-limit")
+def rate_limit_health():
+    # admitidos/recusados (429) por classe de rota neste processo
+    return limiter.stats()
+
+
+@router.get("/health/events")
+def events_health():
+    # assinantes SSE abertos neste processo
+    return events.broker.stats()
+
+
+@router.get("/health/cache")
+def cache_health():
+    # hit ratio dos caches em memória deste processo
+    return {"summary": summary_cache.stats(), "auth": principal_cache.stats()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    # histogramas por rota + os mesmos números dos /health/*, no formato do Prometheus
+    lines: list[str] = []
+    for h in metrics.HISTOGRAMS:
+        lines += h.render()
+
+    pools = pool_snapshot()
+    for field in ("in_use", "idle", "overflow", "wait_max_seconds"):
+        lines += metrics.render_gauges(
+            f"db_pool_{field}", f"Pool de conexões: {field}",
+            [({"pool": name}, p[field]) for name, p in pools.items() if field in p],
+        )
+    for metric, field in (("checkouts", "checkouts"), ("timeouts", "timeouts"), ("wait_seconds", "wait_total_seconds")):
+        lines += metrics.render_gauges(
+            f"db_pool_{metric}_total", f"Pool de conexões: {field}",
+            [({"pool": name}, p[field]) for name, p in pools.items()], kind="counter",
+        )
+
+    caches = {"summary": summary_cache.stats(), "auth": principal_cache.stats()}
+    lines += metrics.render_gauges("cache_size", "Entradas no cache", [({"cache": n}, c["size"]) for n, c in caches.items()])
+    lines += metrics.render_gauges("cache_hit_ratio", "Hit ratio do cache", [({"cache": n}, c["hit_ratio"]) for n, c in caches.items()])
+    for field in ("hits", "misses", "evictions"):
+        lines += metrics.render_gauges(
+            f"cache_{field}_total", f"Cache: {field}", [({"cache": n}, c[field]) for n, c in caches.items()], kind="counter"
+        )
+
+    routing = read_routing.recent_writers.stats()
+    lines += metrics.render_gauges(
+        "db_read_routing_total", "Leituras roteadas (réplica vs primário por read-your-writes)",
+        [({"target": "replica"}, routing["replica_reads"]), ({"target": "primary"}, routing["primary_reads"])],
+        kind="counter",
+    )
+
+    hashing = hashing_pool.stats()
+    lines += metrics.render_gauges("password_hash_queue_depth", "Hashes esperando worker", [({}, hashing["queue_depth"])])
+    lines += metrics.render_gauges("password_hash_rejected_total", "Login/register recusados (503)", [({}, hashing["rejected"])], kind="counter")
+
+    jobs = report_job_runner.stats()
+    lines += metrics.render_gauges("report_jobs_in_flight", "Relatórios em background rodando ou na fila", [({}, jobs["in_flight"])])
+    lines += metrics.render_gauges("report_jobs_rejected_total", "Jobs recusados (503)", [({}, jobs["rejected"])], kind="counter")
+
+    limits = limiter.stats()
+    for field in ("admitted", "rejected"):
+        lines += metrics.render_gauges(
+            f"rate_limit_{field}_total", f"Requests {field} pelo rate limit",
+            [({"class": c}, n) for c, n in limits[field].items()], kind="counter",
+        )
+
+    ev = events.broker.stats()
+    lines += metrics.render_gauges("sse_subscribers", "Streams SSE abertos", [({}, ev["subscribers"])])
+    lines += metrics.render_gauges("events_published_total", "Eventos de timer publicados", [({}, ev["published"])], kind="counter")
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,21 +1,76 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from datetime import date
 
-from app.api.deps import get_db, get_current_user
-from app.db.models.user import User
-from app.services.reports_service import get_summary
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import DbSession, Principal, get_current_user, get_db, get_read_db, run_db
+from app.api.etag import load_if_modified, not_modified, set_etag
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.errors import bad_request, service_unavailable
+from app.db.read_routing import read_sessionmaker
+from app.schemas.reports import ReportJobCreateRequest, ReportJobResponse
+from app.services.report_job_service import ReportJobsBusy, cancel_job, enqueue_job, get_job
+from app.services.reports_service import (
+    GROUP_DIMENSIONS,
+    TIME_GRAINS,
+    aiter_entries_export,
+    get_summary,
+    get_timeseries,
+    iter_entries_export,
+)
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# (user_id, date_from, date_to, data_version) -> resultado de get_summary.
+# Versão nova = chave nova: nada a invalidar, as antigas saem pelo LRU.
+summary_cache = LRUCache(maxsize=settings.SUMMARY_CACHE_SIZE)
+
+
+def _range_days(date_from: str, date_to: str) -> int:
+    try:
+        d_from, d_to = date.fromisoformat(date_from), date.fromisoformat(date_to)
+    except ValueError:
+        raise bad_request("dates must be YYYY-MM-DD")
+    if d_from > d_to:
+        raise bad_request("date_from cannot be after date_to")
+    return (d_to - d_from).days + 1
+
+
+def _check_sync_range(date_from: str, date_to: str) -> None:
+    # ranges longos (vários anos) vão por POST /reports/jobs, fora do request
+    limit = settings.REPORT_SYNC_MAX_DAYS
+    if limit and _range_days(date_from, date_to) > limit:
+        raise bad_request(f"range longer than {limit} days: use POST /reports/jobs")
+
 
 @router.get("/summary")
-def summary(
+async def summary(
+    request: Request,
+    response: Response,
     date_from: str = Query(..., description="YYYY-MM-DD"),
     date_to: str = Query(..., description="YYYY-MM-DD"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    data = get_summary(db, user_id=current_user.id, date_from=date_from, date_to=date_to)
+    _check_sync_range(date_from, date_to)
+
+    def load(s, version: int) -> dict:
+        key = (current_user.id, date_from, date_to, version)
+        data = summary_cache.get(key)
+        if data is None:
+            data = get_summary(s, user_id=current_user.id, date_from=date_from, date_to=date_to)
+            summary_cache.set(key, data)
+        return data
+
+    etag, data = await run_db(
+        db, load_if_modified, user_id=current_user.id, if_none_match=request.headers.get("if-none-match"), load=load
+    )
+    if data is None:
+        return not_modified(etag)
+    set_etag(response, etag)
 
     # Ajuste do campo 'from' para evitar conflito em python
     return {
@@ -26,3 +81,116 @@ def summary(
         "currency": data["currency"],
         "by_work": data["by_work"],
     }
+
+
+def _parse_group_by(values: list[str]) -> list[str]:
+    # aceita repetido (?group_by=month&group_by=sprint) ou separado por vírgula
+    dims = [d.strip() for v in values for d in v.split(",") if d.strip()]
+    if not dims:
+        raise bad_request("group_by is required")
+    unknown = [d for d in dims if d not in GROUP_DIMENSIONS]
+    if unknown:
+        raise bad_request(f"group_by must be in {', '.join(GROUP_DIMENSIONS)}")
+    if len(set(dims)) != len(dims):
+        raise bad_request("group_by has duplicated dimensions")
+    if sum(d in TIME_GRAINS for d in dims) > 1:
+        raise bad_request("group_by accepts only one of day, week, month")
+    return dims
+
+
+@router.get("/timeseries")
+async def timeseries(
+    request: Request,
+    response: Response,
+    date_from: str = Query(..., description="YYYY-MM-DD"),
+    date_to: str = Query(..., description="YYYY-MM-DD"),
+    group_by: list[str] = Query(..., description="day|week|month, sprint, work"),
+    db: DbSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    dims = _parse_group_by(group_by)
+    _check_sync_range(date_from, date_to)
+
+    def load(s, version: int) -> dict:
+        return get_timeseries(s, user_id=current_user.id, date_from=date_from, date_to=date_to, group_by=dims)
+
+    etag, data = await run_db(
+        db, load_if_modified, user_id=current_user.id, if_none_match=request.headers.get("if-none-match"), load=load
+    )
+    if data is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return data
+
+
+@router.get("/entries/export")
+async def export_entries(
+    date_from: str = Query(..., description="YYYY-MM-DD"),
+    date_to: str = Query(..., description="YYYY-MM-DD"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: Principal = Depends(get_current_user),
+):
+    _range_days(date_from, date_to)
+
+    params = dict(user_id=current_user.id, date_from=date_from, date_to=date_to, fmt=format)
+
+    # a sessão vive junto com o stream (não com o request), por isso não usa get_read_db
+    if settings.is_async_db():
+        session_factory = read_sessionmaker(current_user.id, is_async=True)
+
+        async def body():
+            async with session_factory() as db:
+                async for chunk in aiter_entries_export(db, **params):
+                    yield chunk
+    else:
+        session_factory = read_sessionmaker(current_user.id)
+
+        def body():
+            with session_factory() as db:
+                yield from iter_entries_export(db, **params)
+
+    filename = f"entries_{date_from}_{date_to}.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/jobs", response_model=ReportJobResponse, status_code=202)
+async def create_report_job(
+    payload: ReportJobCreateRequest,
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    _range_days(payload.date_from, payload.date_to)
+    params = {"date_from": payload.date_from, "date_to": payload.date_to}
+    if payload.kind == "timeseries":
+        params["group_by"] = _parse_group_by(payload.group_by or [])
+    elif payload.group_by:
+        raise bad_request("group_by is only valid for timeseries")
+
+    try:
+        job = await run_db(db, enqueue_job, user_id=current_user.id, kind=payload.kind, params=params)
+    except ReportJobsBusy:
+        raise service_unavailable("report workers busy, try again later", retry_after=5)
+    return ReportJobResponse(**job)
+
+
+# status vem do primário: a réplica pode ainda não ter visto o fim do job
+@router.get("/jobs/{job_id}", response_model=ReportJobResponse)
+async def report_job(
+    job_id: str,
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return ReportJobResponse(**await run_db(db, get_job, job_id=job_id, user_id=current_user.id))
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=ReportJobResponse)
+async def cancel_report_job(
+    job_id: str,
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return ReportJobResponse(**await run_db(db, cancel_job, job_id=job_id, user_id=current_user.id))
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import Principal, get_current_user
+from app.core.config import settings
+from app.core.errors import conflict
+from app.core.events import broker
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+
+def _sse(evt: dict) -> str:
+    return f"id: {evt.get('seq', '')}\nevent: {evt['type']}\ndata: {json.dumps(evt, default=str)}\n\n"
+
+
+@router.get("/timers")
+async def stream_timers(current_user: Principal = Depends(get_current_user)):
+    """
+    Server-Sent Events com os eventos de timer do usuário (timer.started, timer.stopped,
+    work.closed, entry.deleted, entries.imported). "resync" = o cliente ficou pra trás e
+    deve recarregar o estado (ex.: GET /timers).
+    """
+    try:
+        sub = broker.subscribe(current_user.id)
+    except OverflowError:
+        raise conflict("too many open streams")
+
+    async def body():
+        try:
+            yield "retry: 3000\n: connected\n\n"
+            while True:
+                try:
+                    evt = await asyncio.wait_for(sub.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield _sse(evt)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,76 +1,123 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.api.deps import get_db, get_current_user
-from app.db.models.user import User
+from app.api.deps import DbSession, Principal, get_db, get_current_user, get_read_db, run_db
+from app.api.etag import load_if_modified, not_modified, set_etag
+from app.api.serialization import json_response
 from app.schemas.timer import (
+    BulkImportResponse,
     TimerStartResponse,
     TimerStopResponse,
     TimerStateResponse,
     TimeEntriesResponse,
-    TimeEntryItem,
+    time_entries_page_adapter,
 )
 from app.services.timer_service import (
     start_timer,
     stop_timer,
-    get_timer_state,
+    get_work_or_404,
     list_entries,
     soft_delete_time_entry,
+    timer_state_for_work,
 )
+from app.services.import_service import import_entries, parse_import
+from app.utils.time import today_iso_br
 
 router = APIRouter(prefix="/works", tags=["timer"])
 
 
 @router.get("/{work_id}/timer", response_model=TimerStateResponse)
-def timer_state(
+async def timer_state(
     work_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    state = get_timer_state(db, work_id=work_id, user_id=current_user.id)
+    def load(s) -> tuple:
+        # dono antes do If-None-Match: o ETag do usuário não vira 304 pra work alheio/inexistente
+        w = get_work_or_404(s, work_id=work_id, user_id=current_user.id)
+        # o dia entra no ETag porque is_finished/EXPIRED muda na virada sem nenhuma escrita
+        return load_if_modified(
+            s,
+            user_id=current_user.id,
+            if_none_match=request.headers.get("if-none-match"),
+            load=lambda s2, _version: timer_state_for_work(s2, w),
+            etag_extra=(work_id, today_iso_br()),
+        )
+
+    etag, state = await run_db(db, load)
+    if state is None:
+        return not_modified(etag)
+    set_etag(response, etag)
     return TimerStateResponse(**state)
 
 
 @router.get("/{work_id}/entries", response_model=TimeEntriesResponse)
-def entries(
+async def entries(
     work_id: str,
     limit: int = Query(200, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = Query(None, description="next_cursor da página anterior"),
+    db: DbSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    items = list_entries(db, work_id=work_id, user_id=current_user.id, limit=limit)
-    return TimeEntriesResponse(items=[TimeEntryItem(**x) for x in items])
+    items, next_cursor = await run_db(
+        db, list_entries, work_id=work_id, user_id=current_user.id, limit=limit, cursor=cursor
+    )
+    return json_response(time_entries_page_adapter, {"items": items, "next_cursor": next_cursor})
 
 
 @router.post("/{work_id}/timer/start", response_model=TimerStartResponse)
-def timer_start(
+async def timer_start(
     work_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    entry, created = start_timer(db, work_id=work_id, user_id=current_user.id)
+    entry, created = await run_db(db, start_timer, work_id=work_id, user_id=current_user.id)
     status = "started" if created else "already_running"
     return TimerStartResponse(status=status, entry_id=entry.id, started_at=entry.started_at)
 
 
 @router.post("/{work_id}/timer/stop", response_model=TimerStopResponse)
-def timer_stop(
+async def timer_stop(
     work_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    entry = stop_timer(db, work_id=work_id, user_id=current_user.id)
+    entry = await run_db(db, stop_timer, work_id=work_id, user_id=current_user.id)
     if entry is None:
         return TimerStopResponse(status="not_running")
     return TimerStopResponse(status="stopped", entry_id=entry.id, ended_at=entry.ended_at)
 
 
 @router.delete("/{work_id}/entries/{entry_id}")
-def delete_entry(
+async def delete_entry(
     work_id: str,
     entry_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    soft_delete_time_entry(db, work_id=work_id, entry_id=entry_id, user_id=current_user.id)
+    await run_db(db, soft_delete_time_entry, work_id=work_id, entry_id=entry_id, user_id=current_user.id)
     return {"ok": True}
+
+
+@router.post("/{work_id}/entries:bulk", response_model=BulkImportResponse)
+async def bulk_import_entries(
+    work_id: str,
+    request: Request,
+    format: str | None = Query(None, pattern="^(csv|ndjson)$", description="default: pelo Content-Type"),
+    dry_run: bool = Query(False, description="só valida, não grava"),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "json" in content_type else "csv"
+
+    body = await request.body()
+    # parsing é CPU puro: fora do event loop
+    rows = await run_in_threadpool(parse_import, body, format)
+    result = await run_db(
+        db, import_entries, work_id=work_id, user_id=current_user.id, rows=rows, dry_run=dry_run
+    )
+    return BulkImportResponse(**result)
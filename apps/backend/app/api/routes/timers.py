@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import DbSession, Principal, get_db, get_current_user, run_db
+from app.core.errors import bad_request
+from app.schemas.timer import TimerStatesResponse, TimerStateItem
+from app.services.timer_service import get_timer_states
+
+router = APIRouter(prefix="/timers", tags=["timer"])
+
+MAX_WORK_IDS = 500
+
+
+@router.get("", response_model=TimerStatesResponse)
+async def timer_states(
+    work_ids: str | None = Query(None, description="ids separados por vírgula; sem o parâmetro = todos os works"),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    ids = None
+    if work_ids is not None:
+        ids = list(dict.fromkeys(x.strip() for x in work_ids.split(",") if x.strip()))
+        if len(ids) > MAX_WORK_IDS:
+            raise bad_request(f"at most {MAX_WORK_IDS} work_ids")
+
+    states = await run_db(db, get_timer_states, user_id=current_user.id, work_ids=ids)
+    return TimerStatesResponse(items=[TimerStateItem(**x) for x in states])
@@ -1,27 +1,31 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import DbSession, Principal, get_db, get_current_user, get_read_db, run_db
+from app.api.serialization import json_response
 from app.core.errors import bad_request
-from app.db.models.user import User
-from app.db.models.work import Work
-from app.schemas.work import WorkCreateRequest, WorkCreateResponse, WorksListResponse, WorkListItem
+from app.schemas.work import WorkCreateRequest, WorkCreateResponse, WorksListResponse, works_page_adapter
 from app.schemas.work_close import WorkCloseRequest, WorkCloseResponse
-from app.services.work_service import close_work
+from app.services.work_service import close_work, create_work as create_work_service, list_works as list_works_service
 
 router = APIRouter(prefix="/works", tags=["works"])
 
+# página de quem manda só o cursor; sem limit nem cursor a lista vem inteira (o front chama
+# GET /works uma vez e não pagina)
+DEFAULT_WORKS_PAGE_SIZE = 200
+
 
 @router.post("", response_model=WorkCreateResponse)
-def create_work(
+async def create_work(
     payload: WorkCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if payload.start_date > payload.end_date:
         raise bad_request("start_date cannot be after end_date")
 
-    w = Work(
+    w = await run_db(
+        db,
+        create_work_service,
         user_id=current_user.id,
         title=payload.title,
         sprint_name=payload.sprint_name,
@@ -30,48 +34,34 @@ def create_work(
         hourly_rate_cents=payload.hourly_rate_cents,
         currency=payload.currency,
     )
-    db.add(w)
-    db.commit()
-    db.refresh(w)
     return WorkCreateResponse(id=w.id)
 
 
 @router.get("", response_model=WorksListResponse)
-def list_works(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_works(
+    limit: int | None = Query(None, ge=1, le=1000, description="sem limit nem cursor: todos os works"),
+    cursor: str | None = Query(None, description="next_cursor da página anterior"),
+    db: DbSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    works = (
-        db.query(Work)
-        .filter(Work.user_id == current_user.id)
-        .order_by(Work.start_date.desc())
-        .all()
-    )
-
-    return WorksListResponse(
-        items=[
-            WorkListItem(
-                id=w.id,
-                title=w.title,
-                sprint_name=w.sprint_name,
-                hourly_rate_cents=w.hourly_rate_cents,
-                currency=w.currency,
-            )
-            for w in works
-        ]
+    if limit is None and cursor is not None:
+        limit = DEFAULT_WORKS_PAGE_SIZE
+    items, next_cursor = await run_db(
+        db, list_works_service, user_id=current_user.id, limit=limit, cursor=cursor
     )
+    return json_response(works_page_adapter, {"items": items, "next_cursor": next_cursor})
 
 
 @router.post("/{work_id}/close", response_model=WorkCloseResponse)
-def close_work_route(
+async def close_work_route(
     work_id: str,
     payload: WorkCloseRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    w = close_work(db, work_id=work_id, user_id=current_user.id, reason=payload.reason)
+    w = await run_db(db, close_work, work_id=work_id, user_id=current_user.id, reason=payload.reason)
     return WorkCloseResponse(
         id=w.id,
         closed_at=w.closed_at.isoformat(),
         closed_reason=w.closed_reason,
-    )
\ No newline at end of file
+    )
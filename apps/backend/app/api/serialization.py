@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(adapter: TypeAdapter, value: Any) -> Response:
+    """
+    Serializa `value` uma vez só, direto pra bytes JSON (pydantic-core).
+    Retornar um Response faz o FastAPI pular a validação/serialização do response_model,
+    que continua declarado na rota só pra documentação (OpenAPI).
+    """
+    return Response(content=adapter.dump_json(value), media_type="application/json")
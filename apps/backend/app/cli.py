@@ -0,0 +1,115 @@
+"""
+Comandos de manutenção do backend.
+
+Uso: python -m app.cli <comando> [opções]
+"""
+import argparse
+import sys
+from datetime import date
+
+from app.db.models.work import Work
+from app.db.session import SessionLocal
+from app.services.import_service import import_entries, parse_import
+from app.services.partition_service import ensure_partitions, is_partitioned
+from app.services.reconcile_service import find_total_drift, repair_total_drift
+from app.services.rollup_service import rebuild_daily_totals
+from app.services.settlement_service import settle_closed_works
+from app.services.version_service import bump_data_version_for_works
+
+
+def cmd_rebuild_daily_totals(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        n = rebuild_daily_totals(db, work_id=args.work_id)
+        # fechamentos dos encerrados saem do rollup: regrava junto
+        settle_closed_works(db, work_ids=None if args.work_id is None else [args.work_id])
+        # relatórios podem mudar: invalida ETag/cache dos donos
+        bump_data_version_for_works(db, work_ids=None if args.work_id is None else [args.work_id])
+        db.commit()
+    print(f"work_daily_totals: {n} linhas gravadas")
+    return 0
+
+
+def cmd_reconcile_totals(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        drifts = find_total_drift(db, work_id=args.work_id)
+        for d in drifts:
+            print(f"{d.work_id}: gravado={d.stored_seconds} real={d.actual_seconds} diff={d.actual_seconds - d.stored_seconds}")
+        if drifts and args.fix:
+            repair_total_drift(db, drifts)
+            settle_closed_works(db, work_ids=[d.work_id for d in drifts])
+            bump_data_version_for_works(db, work_ids=[d.work_id for d in drifts])
+            db.commit()
+            print(f"{len(drifts)} works corrigidos")
+        elif not drifts:
+            print("nenhuma divergência")
+    # sem --fix, divergência encontrada vira exit code 1 (útil em cron/CI)
+    return 1 if drifts and not args.fix else 0
+
+
+def cmd_import_entries(args: argparse.Namespace) -> int:
+    fmt = args.format or ("ndjson" if args.file.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.file, "rb") as f:
+        rows = parse_import(f.read(), fmt)
+
+    with SessionLocal() as db:
+        w = db.query(Work).filter(Work.id == args.work_id).first()
+        if not w:
+            print(f"work {args.work_id} não encontrado", file=sys.stderr)
+            return 2
+        result = import_entries(db, work_id=w.id, user_id=w.user_id, rows=rows, dry_run=args.dry_run)
+
+    for e in result["errors"]:
+        print(f"linha {e['row']}: {e['error']}", file=sys.stderr)
+    print(f"{result['inserted']} entries importadas, {len(result['errors'])} com erro")
+    return 1 if result["errors"] else 0
+
+
+def cmd_create_partitions(args: argparse.Namespace) -> int:
+    since = date.fromisoformat(args.since + "-01") if args.since else None
+    with SessionLocal() as db:
+        if not is_partitioned(db):
+            print("time_entries não é particionada (só no Postgres, depois da migração)")
+            return 0
+        created = ensure_partitions(db, months_ahead=args.months_ahead, since=since)
+        db.commit()
+    for name in created:
+        print(f"criada {name}")
+    print(f"{len(created)} partições criadas")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("rebuild-daily-totals", help="recalcula o rollup work_daily_totals")
+    p.add_argument("--work-id", default=None, help="só esse work (default: todos)")
+    p.set_defaults(func=cmd_rebuild_daily_totals)
+
+    p = sub.add_parser("reconcile-totals", help="confere (e corrige com --fix) works.total_closed_seconds")
+    p.add_argument("--work-id", default=None, help="só esse work (default: todos)")
+    p.add_argument("--fix", action="store_true", help="grava o valor real nos works divergentes")
+    p.set_defaults(func=cmd_reconcile_totals)
+
+    p = sub.add_parser("import-entries", help="importa entries fechadas de um CSV/NDJSON")
+    p.add_argument("--work-id", required=True)
+    p.add_argument("--file", required=True, help="CSV (started_at,ended_at[,note]) ou NDJSON")
+    p.add_argument("--format", choices=["csv", "ndjson"], default=None, help="default: pela extensão")
+    p.add_argument("--dry-run", action="store_true", help="só valida, não grava")
+    p.set_defaults(func=cmd_import_entries)
+
+    p = sub.add_parser("create-partitions", help="cria as partições mensais de time_entries (Postgres)")
+    p.add_argument("--months-ahead", type=int, default=None, help="default: TIME_ENTRY_PARTITIONS_AHEAD_MONTHS")
+    p.add_argument("--since", default=None, help="YYYY-MM: cria também os meses desde esse (default: mês corrente)")
+    p.set_defaults(func=cmd_create_partitions)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
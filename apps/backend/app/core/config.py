@@ -5,12 +5,113 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True)
 
     DATABASE_URL: str
+    # "sync": create_engine + handlers no threadpool | "async": create_async_engine (psycopg 3)
+    DB_MODE: str = "sync"
+    DATABASE_ASYNC_URL: str | None = None
+
+    # pool de conexões (vale pros engines sync e async)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = -1  # -1 = nunca recicla
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = sem limite (só Postgres)
+
+    # réplica de leitura (opcional) pra relatórios e listagens; sem valor, tudo vai pro primário
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_ASYNC_URL: str | None = None
+    # depois de uma escrita o usuário lê do primário por esse tempo (cobre o lag da réplica)
+    READ_YOUR_WRITES_SECONDS: float = 5
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200
     CORS_ORIGINS: str = "http://localhost:5173"
+    ENVIRONMENT: str = "dev"  # "dev" | "prod"
+
+    # métricas por request (RequestMetricsMiddleware); sem valor: 1.0 em dev, 0.05 em prod
+    REQUEST_METRICS_SAMPLE_RATE: float | None = None
+    SLOW_REQUEST_MS: int = 500
+
+    # argon2 (passlib) e pool dedicado de hashing; sem valor, vale o default do passlib
+    # (hoje time_cost=3, memory_cost=65536 KiB, parallelism=4)
+    ARGON2_TIME_COST: int | None = None
+    ARGON2_MEMORY_COST_KIB: int | None = None
+    ARGON2_PARALLELISM: int | None = None
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # além disso, login/register recebem 503
+
+    # eventos de timer / SSE ("memory": só este processo | "postgres": LISTEN/NOTIFY entre workers)
+    EVENTS_BACKEND: str = "memory"
+    SSE_QUEUE_SIZE: int = 100
+    SSE_MAX_STREAMS_PER_USER: int = 5
+    SSE_HEARTBEAT_SECONDS: int = 15
+
+    # cache token -> usuário autenticado (get_current_user)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+
+    # cache de /reports/summary por (usuário, range, data_version)
+    SUMMARY_CACHE_SIZE: int = 2000
+
+    # relatórios em background (POST /reports/jobs)
+    REPORT_SYNC_MAX_DAYS: int = 400  # summary/timeseries síncronos até esse range; 0 = sem limite
+    REPORT_JOB_WORKERS: int = 2  # jobs rodando ao mesmo tempo neste processo (limite global)
+    REPORT_JOB_MAX_QUEUE: int = 20  # esperando worker; além disso, 503
+    REPORT_JOB_MAX_ACTIVE_PER_USER: int = 2  # na fila ou rodando; além disso, 429
+    REPORT_JOB_TIMEOUT_SECONDS: int = 600  # na fila (desde a criação) ou rodando (desde o início) há mais que isso vira failed
+    REPORT_JOB_RETENTION_DAYS: int = 7
+
+    # partições mensais de time_entries (Postgres): meses criados à frente, e de quanto em
+    # quanto tempo cada worker confere (0 = só pelo `python -m app.cli create-partitions`)
+    TIME_ENTRY_PARTITIONS_AHEAD_MONTHS: int = 3
+    TIME_ENTRY_PARTITION_CHECK_HOURS: float = 24
+
+    # limite de requests por usuário, token bucket por classe de rota (RateLimitMiddleware)
+    # backend "memory": por processo | "redis": compartilhado entre workers (RATE_LIMIT_REDIS_URL)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str | None = None
+    # tokens repostos por segundo (0 = classe sem limite) e tamanho da rajada
+    RATE_LIMIT_POLL_PER_SECOND: float = 5
+    RATE_LIMIT_POLL_BURST: int = 30
+    RATE_LIMIT_WRITE_PER_SECOND: float = 2
+    RATE_LIMIT_WRITE_BURST: int = 20
+    RATE_LIMIT_REPORT_PER_SECOND: float = 0.5
+    RATE_LIMIT_REPORT_BURST: int = 10
+    RATE_LIMIT_AUTH_PER_SECOND: float = 0.2
+    RATE_LIMIT_AUTH_BURST: int = 10
 
     def cors_list(self) -> List[str]:
         return [x.strip() for x in self.CORS_ORIGINS.split(",") if x.strip()]
 
+    def is_prod(self) -> bool:
+        return self.ENVIRONMENT.strip().lower() in ("prod", "production")
+
+    def request_metrics_sample_rate(self) -> float:
+        if self.REQUEST_METRICS_SAMPLE_RATE is not None:
+            return self.REQUEST_METRICS_SAMPLE_RATE
+        return 0.05 if self.is_prod() else 1.0
+
+    def is_async_db(self) -> bool:
+        return self.DB_MODE.strip().lower() == "async"
+
+    def async_database_url(self) -> str:
+        # se não vier explícita, deriva da DATABASE_URL trocando o driver
+        return self.DATABASE_ASYNC_URL or _to_async_url(self.DATABASE_URL)
+
+    def async_read_database_url(self) -> str | None:
+        if not self.DATABASE_READ_URL:
+            return None
+        return self.DATABASE_READ_ASYNC_URL or _to_async_url(self.DATABASE_READ_URL)
+
+
+def _to_async_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
 settings = Settings()
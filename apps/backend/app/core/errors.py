@@ -19,3 +19,13 @@ def not_found(detail: str = "Not found") -> HTTPException:
 
 def conflict(detail: str = "Conflict") -> HTTPException:
     return HTTPException(status_code=409, detail=detail)
+
+
+def too_many_requests(detail: str = "Too many requests", retry_after: int | None = None) -> HTTPException:
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+    return HTTPException(status_code=429, detail=detail, headers=headers)
+
+
+def service_unavailable(detail: str = "Service unavailable", retry_after: int | None = None) -> HTTPException:
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+    return HTTPException(status_code=503, detail=detail, headers=headers)
@@ -0,0 +1,149 @@
+"""
+Eventos de timer (start/stop/close/delete) publicados depois do commit.
+
+- Os services chamam emit(db, ...) dentro da transação; o evento só sai se o commit acontecer.
+- Backend "memory": entrega direto pro broker deste processo.
+- Backend "postgres": vira pg_notify na mesma transação (o Postgres só entrega no commit) e
+  cada worker escuta o canal com LISTEN e repassa pro seu broker local.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Set
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.read_routing import recent_writers
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "timer_events"
+_PENDING_KEY = "pending_timer_events"
+
+
+class Subscription:
+    """Fila limitada de um cliente. Se o cliente não acompanhar, descarta e pede resync."""
+
+    def __init__(self, user_id: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, evt: dict) -> None:
+        # roda sempre no loop do assinante
+        try:
+            self.queue.put_nowait(evt)
+        except asyncio.QueueFull:
+            # consumidor lento: joga fora o que estava pendente e manda um resync só
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+
+class EventBroker:
+    """Pub/sub em memória, por usuário. publish() pode ser chamado de qualquer thread."""
+
+    def __init__(self):
+        self._subs: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self, user_id: str) -> Subscription:
+        sub = Subscription(user_id, asyncio.get_running_loop(), settings.SSE_QUEUE_SIZE)
+        with self._lock:
+            subs = self._subs.setdefault(user_id, set())
+            if len(subs) >= settings.SSE_MAX_STREAMS_PER_USER:
+                raise OverflowError("too many streams")
+            subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.user_id]
+
+    def publish(self, user_id: str, evt: dict) -> None:
+        evt = {**evt, "seq": next(self._seq)}
+        with self._lock:
+            subs = list(self._subs.get(user_id, ()))
+            self.published += 1
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, evt)
+            except RuntimeError:
+                # loop já fechado (shutdown)
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._subs),
+                "subscribers": sum(len(s) for s in self._subs.values()),
+                "published": self.published,
+            }
+
+
+broker = EventBroker()
+
+
+def _use_postgres(db: Session) -> bool:
+    return settings.EVENTS_BACKEND == "postgres" and db.get_bind().dialect.name == "postgresql"
+
+
+def emit(db: Session, *, user_id: str, type: str, **data) -> None:
+    """Agenda um evento pra depois do commit da transação corrente de `db`."""
+    evt = {"type": type, "at": datetime.now(timezone.utc).isoformat(), **data}
+    if _use_postgres(db):
+        payload = json.dumps({"user_id": user_id, "event": evt}, default=str)
+        db.execute(select(func.pg_notify(PG_CHANNEL, payload)))
+        return
+    db.info.setdefault(_PENDING_KEY, []).append((user_id, evt))
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    for user_id, evt in pending or ():
+        broker.publish(user_id, evt)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def listen_postgres(dsn: str) -> None:
+    """LISTEN no canal de eventos e repassa pro broker local. Reconecta com backoff."""
+    import psycopg
+
+    delay = 1.0
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {PG_CHANNEL}")
+                delay = 1.0
+                async for n in conn.notifies():
+                    try:
+                        msg = json.loads(n.payload)
+                        # escrita feita em outro worker: read-your-writes aqui também
+                        recent_writers.mark(msg["user_id"])
+                        broker.publish(msg["user_id"], msg["event"])
+                    except (ValueError, KeyError):
+                        logger.warning("evento inválido no canal %s", PG_CHANNEL)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("LISTEN %s caiu; reconectando em %.0fs", PG_CHANNEL, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
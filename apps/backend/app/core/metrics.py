@@ -0,0 +1,85 @@
+"""
+Histogramas por rota (em memória, por processo) e saída no formato texto do Prometheus.
+"""
+import math
+import threading
+from typing import Dict, Iterable, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# segundos (latência do request e tempo de banco)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# quantidade de queries por request (N+1 aparece aqui)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Iterable[str], buckets: Iterable[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> (contagem por bucket, soma, total)
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, le in enumerate(self.buckets):
+                if value <= le:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v[0]), v[1], v[2]) for k, v in sorted(self._series.items())]
+        for label_values, counts, total, n in items:
+            base = _labels(zip(self.labels, label_values))
+            for le, c in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{_fmt(le)}"}} {c}')
+            lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="+Inf"}} {n}')
+            lines.append(f"{self.name}_sum{{{base}}} {_fmt(total)}")
+            lines.append(f"{self.name}_count{{{base}}} {n}")
+        return lines
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+
+
+def _fmt(v: float) -> str:
+    if isinstance(v, float) and math.isinf(v):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render_gauges(name: str, help: str, samples: Iterable[Tuple[Dict[str, str], float]], *, kind: str = "gauge") -> list[str]:
+    """Uma métrica simples (gauge/counter) com várias séries."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        base = _labels(labels.items())
+        lines.append(f"{name}{{{base}}} {_fmt(value)}" if base else f"{name} {_fmt(value)}")
+    return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Tempo total do request", ("method", "route", "status"), DURATION_BUCKETS
+)
+request_db_duration = Histogram(
+    "http_request_db_seconds", "Tempo de SQL por request (amostrado)", ("method", "route"), DURATION_BUCKETS
+)
+request_db_queries = Histogram(
+    "http_request_db_queries", "Queries por request (amostrado)", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+
+HISTOGRAMS = (request_duration, request_db_duration, request_db_queries)
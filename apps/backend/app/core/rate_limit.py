@@ -0,0 +1,188 @@
+"""
+Limite de requests por usuário (token bucket), aplicado pelo RateLimitMiddleware antes de
+rota, dependência ou sessão: request recusado não decodifica body nem pega conexão do pool.
+
+- Chave: classe da rota + sub do JWT (ou IP, sem token válido e nas rotas de /auth).
+- Classes: "poll" (GETs: timer, listas, stream), "write" (POST/DELETE), "report"
+  (/reports/summary, timeseries, export e criação de job), "auth" (login/register).
+- Backend "memory": baldes deste processo (com N workers, cada um dá o orçamento inteiro).
+  Backend "redis": baldes compartilhados (RATE_LIMIT_REDIS_URL, pacote `redis` instalado).
+  Qualquer objeto com `async take(key, rate, burst) -> float` serve (RateLimiter.backend).
+"""
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Protocol, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXEMPT_PREFIXES = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+REDIS_KEY_PREFIX = "ratelimit:"
+
+
+@dataclass(frozen=True)
+class Budget:
+    rate: float  # tokens repostos por segundo
+    burst: int  # tamanho do balde
+
+
+def route_class(method: str, path: str) -> str | None:
+    """Classe de orçamento do request; None = não limitado. Decide só por método/path (antes do roteamento)."""
+    if method == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/auth/"):
+        return "auth"
+    # status/cancel de job é acompanhamento barato, não relatório
+    if path.startswith("/reports/") and not path.startswith("/reports/jobs/"):
+        return "report"
+    return "poll" if method in ("GET", "HEAD") else "write"
+
+
+class BucketBackend(Protocol):
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Tira um token do balde `key`. 0 = admitido; senão, segundos até ter um token."""
+        ...
+
+
+class MemoryBuckets:
+    """key -> (tokens, monotonic da última atualização, monotonic em que o balde enche de novo)."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._prune_at = 4096
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(self._buckets) >= self._prune_at:
+                # balde que já encheu de novo é igual a balde nenhum
+                self._buckets = {k: v for k, v in self._buckets.items() if v[2] > now}
+                self._prune_at = 2 * len(self._buckets) + 4096
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# reposição e consumo atômicos no Redis, com o relógio do próprio Redis (workers sem skew)
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Baldes num Redis compartilhado pelos workers. O cliente conecta no primeiro uso."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the `redis` package") from e
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TAKE)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        return float(await self._script(keys=[REDIS_KEY_PREFIX + key], args=[rate, burst]))
+
+
+def _make_backend() -> BucketBackend:
+    name = settings.RATE_LIMIT_BACKEND.strip().lower()
+    if name == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis needs RATE_LIMIT_REDIS_URL")
+        return RedisBuckets(settings.RATE_LIMIT_REDIS_URL)
+    if name != "memory":
+        raise RuntimeError(f"unknown RATE_LIMIT_BACKEND {name!r}")
+    return MemoryBuckets()
+
+
+class RateLimiter:
+    """Orçamentos por classe de rota + backend dos baldes + contadores pra /health e /metrics."""
+
+    def __init__(self, budgets: Dict[str, Budget], *, enabled: bool):
+        self.budgets = budgets
+        self.enabled = enabled
+        self._backend: BucketBackend | None = None
+        self._lock = threading.Lock()
+        self.admitted = {c: 0 for c in budgets}
+        self.rejected = {c: 0 for c in budgets}
+        self.backend_errors = 0
+
+    @property
+    def backend(self) -> BucketBackend:
+        # criado no primeiro request: o import do app não carrega redis nem abre nada
+        if self._backend is None:
+            self._backend = _make_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: BucketBackend) -> None:
+        self._backend = backend
+
+    async def retry_after(self, cls: str, subject: str) -> int:
+        """0 = pode seguir; senão, segundos (inteiros, pro header Retry-After) até liberar."""
+        budget = self.budgets[cls]
+        if budget.rate <= 0:
+            return 0  # classe sem limite
+        try:
+            wait = await self.backend.take(f"{cls}:{subject}", budget.rate, budget.burst)
+        except Exception:
+            # backend compartilhado fora do ar não derruba a API: deixa passar
+            logger.exception("rate limit backend")
+            with self._lock:
+                self.backend_errors += 1
+            wait = 0.0
+        with self._lock:
+            if wait > 0:
+                self.rejected[cls] += 1
+            else:
+                self.admitted[cls] += 1
+        return max(1, math.ceil(wait)) if wait > 0 else 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "backend": settings.RATE_LIMIT_BACKEND,
+                "budgets": {c: {"rate": b.rate, "burst": b.burst} for c, b in self.budgets.items()},
+                "admitted": dict(self.admitted),
+                "rejected": dict(self.rejected),
+                "backend_errors": self.backend_errors,
+                "buckets": len(self._backend) if isinstance(self._backend, MemoryBuckets) else None,
+            }
+
+
+limiter = RateLimiter(
+    {
+        "poll": Budget(settings.RATE_LIMIT_POLL_PER_SECOND, settings.RATE_LIMIT_POLL_BURST),
+        "write": Budget(settings.RATE_LIMIT_WRITE_PER_SECOND, settings.RATE_LIMIT_WRITE_BURST),
+        "report": Budget(settings.RATE_LIMIT_REPORT_PER_SECOND, settings.RATE_LIMIT_REPORT_BURST),
+        "auth": Budget(settings.RATE_LIMIT_AUTH_PER_SECOND, settings.RATE_LIMIT_AUTH_BURST),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
@@ -1,32 +1,125 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from functools import lru_cache
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# passlib/argon2 e python-jose são importados no primeiro uso (~60 ms somados no cold start);
+# o lifespan do app chama preload_backends() numa thread, depois que o servidor já está de pé.
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    from passlib.context import CryptContext
+
+    # só o que foi configurado: o resto fica no default do passlib (o mesmo dos hashes já gravados)
+    params = {
+        "argon2__time_cost": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST_KIB,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+    }
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        **{k: v for k, v in params.items() if v is not None},
+    )
+
+
+def preload_backends() -> None:
+    """Importa jose e argon2 antes do primeiro login/request autenticado precisar."""
+    from jose import jwt  # noqa: F401
+
+    pwd_context().handler("argon2").get_backend()
+
+
+class HashingBusy(Exception):
+    """Fila do pool de hashing cheia; quem chamou deve responder 503."""
+
+
+class _HashingPool:
+    """
+    Pool de threads só pro argon2 (o argon2-cffi solta o GIL), separado do threadpool
+    das rotas. Limita quantos hashes ficam esperando: acima disso rejeita na hora.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingBusy()
+            self._in_flight += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+hashing_pool = _HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return pwd_context().verify(password, password_hash)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await hashing_pool.run(verify_password, password, password_hash)
 
 
 def create_access_token(*, subject: str) -> str:
+    from jose import jwt
+
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {"sub": subject, "exp": expire}
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
-def decode_access_token(token: str) -> str:
+def decode_access_token_claims(token: str) -> tuple[str, int | None]:
+    """Retorna (sub, exp em epoch segundos ou None)."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         sub = payload.get("sub")
         if not sub:
             raise ValueError("missing sub")
-        return str(sub)
+        exp = payload.get("exp")
+        return str(sub), int(exp) if exp is not None else None
     except JWTError as e:
         raise ValueError("invalid token") from e
+
+
+def decode_access_token(token: str) -> str:
+    sub, _ = decode_access_token_claims(token)
+    return sub
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Integer, cast, func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models.time_entry import TimeEntry
+
+
+def entry_seconds(dialect_name: str) -> ColumnElement:
+    """
+    Duração de uma time entry (ended_at - started_at) em segundos inteiros, calculada no banco.
+    Segue a mesma regra de utils.time.seconds_between: descarta a fração e nunca fica negativa.
+    """
+    if dialect_name == "postgresql":
+        delta = func.extract("epoch", TimeEntry.ended_at - TimeEntry.started_at)
+        return cast(func.greatest(func.floor(delta), 0), BigInteger)
+
+    # SQLite guarda DateTime como texto "YYYY-MM-DD HH:MM:SS.ffffff" (sem fuso, sempre UTC aqui).
+    # julianday()/strftime() arredondam a fração, então soma segundos inteiros + microssegundos
+    # em aritmética inteira.
+    def _micros(col):
+        whole = cast(func.strftime("%s", func.substr(col, 1, 19)), Integer) * literal(1_000_000)
+        frac = cast(func.substr(col, 21, 6), Integer)
+        return whole + frac
+
+    delta_us = _micros(TimeEntry.ended_at) - _micros(TimeEntry.started_at)
+    return func.max(delta_us // 1_000_000, 0)
@@ -0,0 +1,83 @@
+"""add work_daily_totals rollup
+
+Revision ID: 14c326b163ed
+Revises: 734cd12d1b8e
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '14c326b163ed'
+down_revision: Union[str, Sequence[str], None] = '734cd12d1b8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Backfill congelado (não importa rollup_service: a migration não pode mudar quando o serviço
+# mudar). Mesma regra de split_seconds_by_day_br: corta cada sessão na meia-noite BR e trunca
+# pelo acumulado (floor(corte - início)), então a soma dos dias bate com os segundos da sessão.
+BACKFILL_POSTGRES = """
+INSERT INTO work_daily_totals (work_id, day, seconds)
+SELECT te.work_id, d.day::date,
+       SUM(
+           floor(extract(epoch FROM least(te.ended_at, (d.day + interval '1 day') AT TIME ZONE 'America/Sao_Paulo') - te.started_at))
+           - floor(extract(epoch FROM greatest(te.started_at, d.day AT TIME ZONE 'America/Sao_Paulo') - te.started_at))
+       )::bigint
+FROM time_entries te
+CROSS JOIN LATERAL generate_series(
+    date_trunc('day', te.started_at AT TIME ZONE 'America/Sao_Paulo'),
+    date_trunc('day', te.ended_at AT TIME ZONE 'America/Sao_Paulo'),
+    interval '1 day'
+) AS d(day)
+WHERE te.ended_at > te.started_at AND te.deleted_at IS NULL
+GROUP BY te.work_id, d.day
+HAVING SUM(
+    floor(extract(epoch FROM least(te.ended_at, (d.day + interval '1 day') AT TIME ZONE 'America/Sao_Paulo') - te.started_at))
+    - floor(extract(epoch FROM greatest(te.started_at, d.day AT TIME ZONE 'America/Sao_Paulo') - te.started_at))
+) <> 0
+"""
+
+# SQLite (dev): sem fuso no banco, BR fixo em -03:00 (sem horário de verão desde 2019).
+# Instantes em microssegundos a partir do texto gravado ("YYYY-MM-DD HH:MM:SS.ffffff", UTC).
+_SQLITE_US = "CAST(strftime('%s', substr({c}, 1, 19)) AS INTEGER) * 1000000 + CAST(substr({c} || '.000000', 21, 6) AS INTEGER)"
+BACKFILL_SQLITE = f"""
+INSERT INTO work_daily_totals (work_id, day, seconds)
+WITH RECURSIVE e AS (
+    SELECT work_id, {_SQLITE_US.format(c="started_at")} AS s_us, {_SQLITE_US.format(c="ended_at")} AS e_us
+    FROM time_entries
+    WHERE ended_at IS NOT NULL AND deleted_at IS NULL
+),
+d(work_id, s_us, e_us, day_us) AS (
+    SELECT work_id, s_us, e_us, ((s_us / 1000000 - 10800) / 86400 * 86400 + 10800) * 1000000
+    FROM e WHERE e_us > s_us
+    UNION ALL
+    SELECT work_id, s_us, e_us, day_us + 86400000000 FROM d WHERE day_us + 86400000000 < e_us
+)
+SELECT work_id, date(day_us / 1000000 - 10800, 'unixepoch'),
+       SUM((min(e_us, day_us + 86400000000) - s_us) / 1000000 - (max(s_us, day_us) - s_us) / 1000000) AS seconds
+FROM d
+GROUP BY work_id, day_us
+HAVING seconds <> 0
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "work_daily_totals",
+        sa.Column("work_id", sa.String(length=36), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("seconds", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["work_id"], ["works.id"], name="fk_work_daily_totals_work_id_works", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("work_id", "day", name="pk_work_daily_totals"),
+    )
+
+    # backfill a partir das time_entries existentes
+    op.execute(BACKFILL_POSTGRES if op.get_bind().dialect.name == "postgresql" else BACKFILL_SQLITE)
+
+
+def downgrade() -> None:
+    op.drop_table("work_daily_totals")
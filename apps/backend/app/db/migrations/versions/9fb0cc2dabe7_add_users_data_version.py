@@ -0,0 +1,29 @@
+"""add users.data_version
+
+Revision ID: 9fb0cc2dabe7
+Revises: f3d2686fa5a3
+Create Date: 2026-10-18 15:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9fb0cc2dabe7'
+down_revision: Union[str, Sequence[str], None] = 'f3d2686fa5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_version")
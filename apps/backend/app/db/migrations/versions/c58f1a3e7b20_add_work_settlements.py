@@ -0,0 +1,85 @@
+"""add work_settlements
+
+Revision ID: c58f1a3e7b20
+Revises: b41e7d2c9a05
+Create Date: 2026-10-18 18:20:47.905116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58f1a3e7b20'
+down_revision: Union[str, Sequence[str], None] = 'b41e7d2c9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Backfill congelado do settle_work (sem importar o serviço): segundos e dias do rollup,
+# contagem e pontas das entries fechadas vivas, valor com o arredondamento de
+# cents_from_hourly_rate (inteiro mais próximo, empate pro par). SUM(bigint) no Postgres é
+# numeric: o CAST mantém a divisão inteira.
+BACKFILL = """
+INSERT INTO work_settlements (
+    work_id, total_seconds, earned_cents, entry_count,
+    first_started_at, last_ended_at, first_day, last_day, settled_at
+)
+SELECT
+    s.work_id,
+    s.seconds,
+    CASE
+        WHEN s.seconds <= 0 THEN 0
+        WHEN 2 * (s.amount % 3600) > 3600 OR (2 * (s.amount % 3600) = 3600 AND (s.amount / 3600) % 2 = 1)
+            THEN s.amount / 3600 + 1
+        ELSE s.amount / 3600
+    END,
+    s.entry_count, s.first_started_at, s.last_ended_at, s.first_day, s.last_day, CURRENT_TIMESTAMP
+FROM (
+    SELECT
+        w.id AS work_id,
+        COALESCE(r.seconds, 0) AS seconds,
+        w.hourly_rate_cents * COALESCE(r.seconds, 0) AS amount,
+        COALESCE(e.entry_count, 0) AS entry_count,
+        e.first_started_at, e.last_ended_at, r.first_day, r.last_day
+    FROM works w
+    LEFT JOIN (
+        SELECT work_id, CAST(SUM(seconds) AS BIGINT) AS seconds, MIN(day) AS first_day, MAX(day) AS last_day
+        FROM work_daily_totals
+        WHERE seconds <> 0
+        GROUP BY work_id
+    ) r ON r.work_id = w.id
+    LEFT JOIN (
+        SELECT work_id, COUNT(*) AS entry_count, MIN(started_at) AS first_started_at, MAX(ended_at) AS last_ended_at
+        FROM time_entries
+        WHERE ended_at IS NOT NULL AND deleted_at IS NULL
+        GROUP BY work_id
+    ) e ON e.work_id = w.id
+    WHERE w.closed_at IS NOT NULL
+) s
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "work_settlements",
+        sa.Column("work_id", sa.String(length=36), nullable=False),
+        sa.Column("total_seconds", sa.BigInteger(), nullable=False),
+        sa.Column("earned_cents", sa.BigInteger(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("first_started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("first_day", sa.Date(), nullable=True),
+        sa.Column("last_day", sa.Date(), nullable=True),
+        sa.Column("settled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["work_id"], ["works.id"], name="fk_work_settlements_work_id_works", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("work_id", name="pk_work_settlements"),
+    )
+
+    # backfill dos works já encerrados
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table("work_settlements")
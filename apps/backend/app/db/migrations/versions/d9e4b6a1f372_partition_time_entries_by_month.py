@@ -0,0 +1,139 @@
+"""partition time_entries by month
+
+Revision ID: d9e4b6a1f372
+Revises: c58f1a3e7b20
+Create Date: 2026-10-18 20:05:13.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b6a1f372'
+down_revision: Union[str, Sequence[str], None] = 'c58f1a3e7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_TABLE = "time_entries_unpartitioned"
+COLUMNS = "id, work_id, started_at, ended_at, deleted_at, note"
+OPEN_ENTRY_WHERE = sa.text("ended_at IS NULL AND deleted_at IS NULL")
+LIVE_WHERE = sa.text("deleted_at IS NULL")
+
+# Partições congeladas aqui (sem importar partition_service): default + um mês BR por partição,
+# do mês da entry mais antiga até 3 meses à frente. Os seguintes ficam com a manutenção do app.
+CREATE_PARTITIONS = f"""
+DO $$
+DECLARE
+    current_month date := date_trunc('month', now() AT TIME ZONE 'America/Sao_Paulo')::date;
+    m date;
+    last_month date;
+BEGIN
+    CREATE TABLE time_entries_default PARTITION OF time_entries DEFAULT;
+
+    SELECT least(current_month, coalesce(date_trunc('month', min(started_at) AT TIME ZONE 'America/Sao_Paulo')::date, current_month))
+      INTO m FROM {OLD_TABLE};
+    last_month := (current_month + interval '3 months')::date;
+    WHILE m <= last_month LOOP
+        EXECUTE 'CREATE TABLE ' || quote_ident('time_entries_' || to_char(m, 'YYYY_MM'))
+            || ' PARTITION OF time_entries FOR VALUES FROM ('
+            || quote_literal((m::timestamp AT TIME ZONE 'America/Sao_Paulo')::text) || ') TO ('
+            || quote_literal(((m + interval '1 month')::timestamp AT TIME ZONE 'America/Sao_Paulo')::text) || ')';
+        m := (m + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def _set_aside_old_table() -> None:
+    # nomes de PK/índices são globais no schema: a tabela velha libera os dela
+    op.execute(f"ALTER TABLE time_entries RENAME TO {OLD_TABLE}")
+    pk = op.get_bind().execute(
+        sa.text("SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:t) AND contype = 'p'"),
+        {"t": OLD_TABLE},
+    ).scalar()
+    if pk is not None:
+        op.execute(f'ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT "{pk}" TO {OLD_TABLE}_pkey')
+    for index in ("ix_time_entries_work_id", "ux_time_entries_open_per_work", "ix_time_entries_work_started_live"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def _create_indexes(*, partitioned: bool) -> None:
+    op.create_index("ix_time_entries_work_id", "time_entries", ["work_id"], unique=False)
+    op.create_index(
+        "ix_time_entries_work_started_live",
+        "time_entries",
+        ["work_id", "started_at"],
+        unique=False,
+        postgresql_where=LIVE_WHERE,
+    )
+    # índice único em tabela particionada precisa da chave de partição: "1 timer aberto por
+    # work" passa a ser garantido pelo lock no work em start_timer; aqui fica só o acesso
+    op.create_index(
+        "ix_time_entries_open" if partitioned else "ux_time_entries_open_per_work",
+        "time_entries",
+        ["work_id"],
+        unique=not partitioned,
+        postgresql_where=OPEN_ENTRY_WHERE,
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite (dev): sem partição, fica a tabela única com o índice único do timer aberto
+        return
+
+    _set_aside_old_table()
+    op.execute(
+        f"""
+        CREATE TABLE time_entries (
+            id VARCHAR(36) NOT NULL,
+            work_id VARCHAR(36) NOT NULL,
+            started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            ended_at TIMESTAMP WITH TIME ZONE,
+            deleted_at TIMESTAMP WITH TIME ZONE,
+            note VARCHAR(255),
+            CONSTRAINT pk_time_entries PRIMARY KEY (id, started_at),
+            CONSTRAINT fk_time_entries_work_id_works FOREIGN KEY (work_id) REFERENCES works (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (started_at)
+        """
+    )
+    _create_indexes(partitioned=True)
+
+    # uma partição por mês do histórico existente até os próximos meses, antes da cópia
+    op.execute(CREATE_PARTITIONS)
+
+    op.execute(f"INSERT INTO time_entries ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}")
+    op.execute(f"DROP TABLE {OLD_TABLE}")
+    op.execute("ANALYZE time_entries")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute(f"ALTER TABLE time_entries RENAME TO {OLD_TABLE}")
+    op.execute(f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT pk_time_entries TO {OLD_TABLE}_pkey")
+    for index in ("ix_time_entries_work_id", "ix_time_entries_open", "ix_time_entries_work_started_live"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.create_table(
+        "time_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("work_id", sa.String(length=36), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("note", sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(["work_id"], ["works.id"], name="fk_time_entries_work_id_works", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", name="pk_time_entries"),
+    )
+    op.execute(f"INSERT INTO time_entries ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}")
+    # derruba a particionada junto com as partições
+    op.execute(f"DROP TABLE {OLD_TABLE}")
+    _create_indexes(partitioned=False)
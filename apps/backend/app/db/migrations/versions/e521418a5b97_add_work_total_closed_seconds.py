@@ -0,0 +1,38 @@
+"""add works.total_closed_seconds
+
+Revision ID: e521418a5b97
+Revises: 14c326b163ed
+Create Date: 2026-10-18 11:02:17.530941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e521418a5b97'
+down_revision: Union[str, Sequence[str], None] = '14c326b163ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "works",
+        sa.Column("total_closed_seconds", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    # backfill a partir do rollup diário (já consistente com as time_entries)
+    op.execute(
+        """
+        UPDATE works
+        SET total_closed_seconds = COALESCE(
+            (SELECT SUM(d.seconds) FROM work_daily_totals d WHERE d.work_id = works.id), 0
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("works", "total_closed_seconds")
@@ -0,0 +1,51 @@
+"""add works.open_entry_id / open_entry_started_at
+
+Revision ID: e6a2c94f1d08
+Revises: d9e4b6a1f372
+Create Date: 2026-10-18 22:14:36.207519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2c94f1d08'
+down_revision: Union[str, Sequence[str], None] = 'd9e4b6a1f372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_ENTRY = "te.work_id = works.id AND te.ended_at IS NULL AND te.deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("works") as batch:
+        batch.add_column(sa.Column("open_entry_id", sa.String(length=36), nullable=True))
+        batch.add_column(sa.Column("open_entry_started_at", sa.DateTime(timezone=True), nullable=True))
+
+    # backfill: a entry aberta de cada work (se houver mais de uma, a mais recente)
+    op.execute(
+        f"""
+        UPDATE works
+        SET open_entry_started_at = (SELECT max(te.started_at) FROM time_entries te WHERE {OPEN_ENTRY}),
+            open_entry_id = (
+                SELECT te.id FROM time_entries te WHERE {OPEN_ENTRY}
+                ORDER BY te.started_at DESC, te.id DESC LIMIT 1
+            )
+        """
+    )
+
+    with op.batch_alter_table("works") as batch:
+        batch.create_check_constraint(
+            "ck_works_open_entry_pointer",
+            "(open_entry_id IS NULL) = (open_entry_started_at IS NULL)",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("works") as batch:
+        batch.drop_constraint("ck_works_open_entry_pointer", type_="check")
+        batch.drop_column("open_entry_started_at")
+        batch.drop_column("open_entry_id")
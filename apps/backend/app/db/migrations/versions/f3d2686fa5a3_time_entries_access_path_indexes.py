@@ -0,0 +1,56 @@
+"""time_entries access path indexes
+
+Revision ID: f3d2686fa5a3
+Revises: e521418a5b97
+Create Date: 2026-10-18 13:41:05.226870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3d2686fa5a3'
+down_revision: Union[str, Sequence[str], None] = 'e521418a5b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_ENTRY_WHERE = sa.text("ended_at IS NULL AND deleted_at IS NULL")
+LIVE_WHERE = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    # o índice antigo (cb12ad0a31a6) não considerava deleted_at e pode nem existir
+    op.execute("DROP INDEX IF EXISTS ux_time_entries_open_per_work;")
+
+    # 1 timer aberto por work: garante no banco o que start_timer só checa com race
+    op.create_index(
+        "ux_time_entries_open_per_work",
+        "time_entries",
+        ["work_id"],
+        unique=True,
+        postgresql_where=OPEN_ENTRY_WHERE,
+        sqlite_where=OPEN_ENTRY_WHERE,
+    )
+    op.create_index(
+        "ix_time_entries_work_started_live",
+        "time_entries",
+        ["work_id", "started_at"],
+        unique=False,
+        postgresql_where=LIVE_WHERE,
+        sqlite_where=LIVE_WHERE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_time_entries_work_started_live", table_name="time_entries")
+    op.drop_index("ux_time_entries_open_per_work", table_name="time_entries")
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_time_entries_open_per_work
+        ON time_entries (work_id)
+        WHERE ended_at IS NULL;
+        """
+    )
@@ -1,5 +1,8 @@
 from .user import User
 from .work import Work
 from .time_entry import TimeEntry
+from .work_daily_total import WorkDailyTotal
+from .report_job import ReportJob
+from .work_settlement import WorkSettlement
 
-__all__ = ["User", "Work", "TimeEntry"]
+__all__ = ["User", "Work", "TimeEntry", "WorkDailyTotal", "ReportJob", "WorkSettlement"]
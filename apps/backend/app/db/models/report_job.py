@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, String
+from app.db.base import Base
+
+
+class ReportJob(Base):
+    """Relatório calculado em background (POST /reports/jobs). Rodado por report_job_service."""
+
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # jobs do usuário por idade (limite de ativos e limpeza dos antigos)
+        Index("ix_report_jobs_user_created", "user_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)  # "summary" | "timeseries"
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # queued -> running -> done | failed | canceled
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,16 +1,42 @@
 import uuid
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index, text
 from app.db.base import Base
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # Postgres: particionada por mês de started_at (partition_service), por isso a PK
+        # inclui started_at e não dá pra ter índice único só em work_id. "1 timer aberto por
+        # work" fica com o ponteiro Work.open_entry_id (timer_service.start_timer); o índice é só acesso.
+        Index(
+            "ix_time_entries_open",
+            "work_id",
+            postgresql_where=text("ended_at IS NULL AND deleted_at IS NULL"),
+        ).ddl_if(dialect="postgresql"),
+        # SQLite (dev) não particiona nem tem FOR UPDATE: continua com o índice único
+        Index(
+            "ux_time_entries_open_per_work",
+            "work_id",
+            unique=True,
+            sqlite_where=text("ended_at IS NULL AND deleted_at IS NULL"),
+        ).ddl_if(dialect="sqlite"),
+        # listagem / ranges por work, só entries vivas
+        Index(
+            "ix_time_entries_work_started_live",
+            "work_id",
+            "started_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     work_id: Mapped[str] = mapped_column(String(36), ForeignKey("works.id"), index=True, nullable=False)
 
-    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
     ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String
+from sqlalchemy import BigInteger, String
 from app.db.base import Base
 
 class User(Base):
@@ -10,3 +10,6 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     name: Mapped[str | None] = mapped_column(String(120), nullable=False)
+
+    # incrementada a cada escrita do usuário (ver services/version_service); vira ETag/chave de cache
+    data_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
@@ -1,13 +1,19 @@
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, BigInteger, ForeignKey
 from app.db.base import Base
 from datetime import datetime
-from sqlalchemy import DateTime
+from sqlalchemy import CheckConstraint, DateTime
 
 
 class Work(Base):
     __tablename__ = "works"
+    __table_args__ = (
+        CheckConstraint(
+            "(open_entry_id IS NULL) = (open_entry_started_at IS NULL)",
+            name="ck_works_open_entry_pointer",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True, nullable=False)
@@ -24,4 +30,12 @@ class Work(Base):
     closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     closed_reason: Mapped[str | None] = mapped_column(String(120), nullable=True)
 
+    # soma das entries fechadas; mantida por timer_service.account_closed_entry
+    total_closed_seconds: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+    # entry aberta (timer rodando), pela PK inteira (id, started_at): lida sem procurar em
+    # time_entries (particionada). Só start/stop_timer e close_work mexem, com o lock no work.
+    open_entry_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    open_entry_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     entries = relationship("TimeEntry", back_populates="work", cascade="all, delete-orphan")
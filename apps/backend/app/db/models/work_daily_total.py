@@ -0,0 +1,17 @@
+from datetime import date
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Date, BigInteger, ForeignKey
+from app.db.base import Base
+
+
+class WorkDailyTotal(Base):
+    """Rollup de segundos fechados por work e por dia (fuso BR). Mantido por rollup_service."""
+
+    __tablename__ = "work_daily_totals"
+
+    work_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("works.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
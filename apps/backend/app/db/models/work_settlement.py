@@ -0,0 +1,31 @@
+from datetime import date, datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Integer, String
+from app.db.base import Base
+
+
+class WorkSettlement(Base):
+    """
+    Fechamento de um work encerrado (close_work): totais congelados pra relatórios e estado
+    do timer não varrerem entries/rollup de novo. Regravado por settlement_service se uma
+    entry do work for apagada depois.
+    """
+
+    __tablename__ = "work_settlements"
+
+    work_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("works.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    total_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    earned_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    first_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # primeiro/último dia (fuso BR) com tempo no rollup: o fechamento só substitui o rollup
+    # num relatório cujo range cobre os dois
+    first_day: Mapped[date | None] = mapped_column(Date, nullable=True)
+    last_day: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    settled_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Contadores de um pool (por processo). Alimentados pelos eventos do pool e por _TimedPoolMixin."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.pool = None
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def observe_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_total_seconds += seconds
+            if seconds > self.wait_max_seconds:
+                self.wait_max_seconds = seconds
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_total_seconds": round(self.wait_total_seconds, 6),
+                "wait_avg_seconds": round(self.wait_total_seconds / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_max_seconds": round(self.wait_max_seconds, 6),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "size": pool.size(),
+                    "in_use": pool.checkedout(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return data
+
+
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+
+class _TimedPoolMixin:
+    """Mede o tempo de espera por uma conexão no checkout (não existe evento 'antes do checkout')."""
+
+    _metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self._metrics is not None:
+                self._metrics.observe_wait(time.perf_counter() - t0, timed_out=True)
+            raise
+        if self._metrics is not None:
+            self._metrics.observe_wait(time.perf_counter() - t0)
+        return conn
+
+    def recreate(self):
+        new = super().recreate()
+        new._metrics = self._metrics
+        if self._metrics is not None:
+            self._metrics.pool = new
+        return new
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Registra as métricas do pool de `engine` com o nome dado (aceita AsyncEngine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    metrics = PoolMetrics(name)
+    metrics.pool = pool
+    if isinstance(pool, _TimedPoolMixin):
+        pool._metrics = metrics
+
+    event.listen(pool, "checkout", lambda *_: metrics.incr("checkouts"))
+    event.listen(pool, "checkin", lambda *_: metrics.incr("checkins"))
+    event.listen(pool, "connect", lambda *_: metrics.incr("connects"))
+    event.listen(pool, "invalidate", lambda *_: metrics.incr("invalidations"))
+
+    POOL_METRICS[name] = metrics
+    return metrics
+
+
+def snapshot_all() -> dict:
+    return {name: m.snapshot() for name, m in POOL_METRICS.items()}
@@ -0,0 +1,73 @@
+"""
+Contagem/tempo de SQL por request.
+
+Os eventos before/after_cursor_execute do engine alimentam o QueryStats do request
+corrente (contextvar). Fora de um request amostrado não há QueryStats e o custo é só
+o lookup do contextvar. O contexto é copiado pro threadpool (sync) e segue no greenlet
+do run_sync (async), então as queries dos services caem no request certo.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_STATEMENT_MAX_LEN = 200
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def observe(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = " ".join(statement.split())[:SLOWEST_STATEMENT_MAX_LEN]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def begin() -> tuple[QueryStats, object]:
+    """Começa a contar pro contexto atual. Devolve (stats, token pro end)."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end(token) -> None:
+    _current.reset(token)
+
+
+def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.observe(statement, time.perf_counter() - starts.pop())
+
+
+def _on_error(ctx) -> None:
+    # statement que falhou não passa pelo after_cursor_execute
+    starts = ctx.connection.info.get("query_start") if ctx.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Liga a contagem por request em `engine` (aceita AsyncEngine)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before)
+    event.listen(sync_engine, "after_cursor_execute", _after)
+    event.listen(sync_engine, "handle_error", _on_error)
@@ -0,0 +1,120 @@
+"""
+Leituras na réplica (DATABASE_READ_URL), escritas no primário.
+
+- Rotas só de leitura (relatórios, listagens) pegam a sessão por read_sessionmaker/get_read_db.
+- Read-your-writes: toda escrita que incrementa data_version marca o usuário; por
+  READ_YOUR_WRITES_SECONDS depois do commit, as leituras dele voltam pro primário.
+- A marca é por processo. Com EVENTS_BACKEND=postgres as escritas também chegam aos outros
+  workers pelo LISTEN (events.listen_postgres) e marcam lá; com "memory", vale só no worker
+  que escreveu.
+"""
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import session as db_session
+
+_WRITTEN_KEY = "written_user_ids"
+
+
+class RecentWriters:
+    """user_id -> até quando (monotonic) as leituras dele ficam no primário."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._prune_at = 1024
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def mark(self, user_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window_seconds
+            if len(self._until) >= self._prune_at:
+                # usuários que escreveram e não voltaram a ler
+                self._until = {u: t for u, t in self._until.items() if t > now}
+                self._prune_at = 2 * len(self._until) + 1024
+
+    def is_recent(self, user_id: str) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def count(self, *, replica: bool) -> None:
+        with self._lock:
+            if replica:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            total = self.replica_reads + self.primary_reads
+            return {
+                "window_seconds": self.window_seconds,
+                "recent_writers": sum(1 for t in self._until.values() if t > now),
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "replica_ratio": self.replica_reads / total if total else 0.0,
+            }
+
+
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_SECONDS)
+
+
+def replica_configured() -> bool:
+    return db_session.read_engine is not None
+
+
+def read_sessionmaker(user_id: str, *, is_async: bool = False):
+    """Fábrica de sessão pra uma leitura do usuário: réplica, ou primário se ele escreveu há pouco."""
+    if is_async:
+        replica, primary = db_session.AsyncReadSessionLocal, db_session.AsyncSessionLocal
+    else:
+        replica, primary = db_session.ReadSessionLocal, db_session.SessionLocal
+    if replica is primary:
+        return primary
+    use_replica = not recent_writers.is_recent(user_id)
+    recent_writers.count(replica=use_replica)
+    return replica if use_replica else primary
+
+
+def note_write(db: Session, *, user_id: str) -> None:
+    """Marca que a transação corrente escreve dados do usuário (vale a partir do commit)."""
+    db.info.setdefault(_WRITTEN_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_writers(session: Session) -> None:
+    for user_id in session.info.pop(_WRITTEN_KEY, ()):
+        recent_writers.mark(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_writers(session: Session) -> None:
+    session.info.pop(_WRITTEN_KEY, None)
+
+
+def replica_lag_seconds() -> float | None:
+    """
+    Atraso de replay da réplica (Postgres em hot standby); 0 se já aplicou tudo o que recebeu.
+    None sem réplica ou sem como medir.
+    """
+    engine = db_session.read_engine
+    if engine is None or engine.dialect.name != "postgresql":
+        return None
+    with engine.connect() as conn:
+        lag = conn.execute(
+            text(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() THEN NULL "
+                "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+        ).scalar()
+    return None if lag is None else float(lag)
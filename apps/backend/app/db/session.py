@@ -1,7 +1,80 @@
+import os
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_engine
+from app.db.query_stats import instrument_queries
+
+
+def engine_kwargs(url: str, *, is_async: bool = False) -> dict:
+    """Parâmetros de pool/conexão vindos do Settings."""
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        # sqlite em memória usa SingletonThreadPool/StaticPool; não mexe
+        return {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    kwargs = {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if u.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        # vale pra psycopg2 e psycopg 3
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return kwargs
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+
+engine = create_engine(settings.DATABASE_URL, **engine_kwargs(settings.DATABASE_URL))
+instrument_engine(engine, "primary")
+instrument_queries(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# réplica de leitura (DATABASE_READ_URL); sem ela, ReadSessionLocal é o próprio primário.
+# Quem escolhe entre as duas por request é app.db.read_routing.
+read_engine = None
+ReadSessionLocal = SessionLocal
+
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(settings.DATABASE_READ_URL, **engine_kwargs(settings.DATABASE_READ_URL))
+    instrument_engine(read_engine, "replica")
+    instrument_queries(read_engine)
+    ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
+
+# modo async (DB_MODE=async): engine/sessões async; os services rodam via AsyncSession.run_sync
+async_engine = None
+AsyncSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+
+if settings.is_async_db():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = settings.async_database_url()
+    async_engine = create_async_engine(_async_url, **engine_kwargs(_async_url, is_async=True))
+    instrument_engine(async_engine, "primary_async")
+    instrument_queries(async_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = AsyncSessionLocal
+
+    _async_read_url = settings.async_read_database_url()
+    if _async_read_url:
+        async_read_engine = create_async_engine(_async_read_url, **engine_kwargs(_async_read_url, is_async=True))
+        instrument_engine(async_read_engine, "replica_async")
+        instrument_queries(async_read_engine)
+        AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+def _forget_pools_after_fork() -> None:
+    # gunicorn --preload: o filho não pode reusar conexões herdadas do pai (close=False: não fecha as do pai)
+    for e in (engine, read_engine, async_engine, async_read_engine):
+        if e is not None:
+            getattr(e, "sync_engine", e).dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
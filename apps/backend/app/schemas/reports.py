@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Any, Literal
+
 from pydantic import BaseModel
 
 class WorkSummaryItem(BaseModel):
@@ -15,3 +18,21 @@ class SummaryResponse(BaseModel):
     total_earned_cents: int
     currency: str
     by_work: list[WorkSummaryItem]
+
+
+class ReportJobCreateRequest(BaseModel):
+    kind: Literal["summary", "timeseries"]
+    date_from: str
+    date_to: str
+    group_by: list[str] | None = None  # só timeseries
+
+class ReportJobResponse(BaseModel):
+    id: str
+    kind: str
+    params: dict[str, Any]
+    status: str  # queued | running | done | failed | canceled
+    result: dict[str, Any] | None = None  # mesmo corpo de /reports/summary ou /reports/timeseries
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
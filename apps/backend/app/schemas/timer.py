@@ -1,5 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel
+from typing_extensions import TypedDict
+
+from pydantic import BaseModel, TypeAdapter
 
 
 class TimerStartResponse(BaseModel):
@@ -26,6 +28,14 @@ class TimerStateResponse(BaseModel):
     closed_at: datetime | None = None  # pra UI
 
 
+class TimerStateItem(TimerStateResponse):
+    work_id: str
+
+
+class TimerStatesResponse(BaseModel):
+    items: list[TimerStateItem]
+
+
 class TimeEntryItem(BaseModel):
     id: str
     started_at: datetime
@@ -34,4 +44,33 @@ class TimeEntryItem(BaseModel):
 
 
 class TimeEntriesResponse(BaseModel):
-    items: list[TimeEntryItem]
\ No newline at end of file
+    items: list[TimeEntryItem]
+    next_cursor: str | None = None  # passar em ?cursor= pra próxima página
+
+
+# Mesmo formato de TimeEntriesResponse, como TypedDict: a rota serializa os dicts do
+# service direto em JSON (pydantic-core), sem instanciar um model por linha nem validar de novo.
+class TimeEntryRow(TypedDict):
+    id: str
+    started_at: datetime
+    ended_at: datetime | None
+    duration_seconds: int
+
+
+class TimeEntriesPage(TypedDict):
+    items: list[TimeEntryRow]
+    next_cursor: str | None
+
+
+time_entries_page_adapter = TypeAdapter(TimeEntriesPage)
+
+
+class BulkImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    errors: list[BulkImportRowError]
+    dry_run: bool = False
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
+
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class WorkCreateRequest(BaseModel):
@@ -24,3 +26,21 @@ class WorkListItem(BaseModel):
 
 class WorksListResponse(BaseModel):
     items: list[WorkListItem]
+    next_cursor: str | None = None  # passar em ?cursor= pra próxima página
+
+
+# Mesmo formato de WorksListResponse, como TypedDict (ver schemas/timer.TimeEntriesPage)
+class WorkListRow(TypedDict):
+    id: str
+    title: str
+    sprint_name: str
+    hourly_rate_cents: int
+    currency: str
+
+
+class WorksPage(TypedDict):
+    items: list[WorkListRow]
+    next_cursor: str | None
+
+
+works_page_adapter = TypeAdapter(WorksPage)
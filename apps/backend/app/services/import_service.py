@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import uuid
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.errors import bad_request
+from app.db.models.time_entry import TimeEntry
+from app.db.models.work import Work
+from app.services import rollup_service
+from app.services.timer_service import ensure_work_is_active, get_work_or_404
+from app.services.version_service import bump_data_version
+from app.utils.time import BR_TZ, as_utc
+
+BULK_BATCH_SIZE = 5000
+NOTE_MAX_LEN = 255
+# colunas na ordem do COPY
+COPY_COLUMNS = ("id", "work_id", "started_at", "ended_at", "note")
+
+
+@dataclass
+class ImportRow:
+    row: int  # número da linha de dados (1 = primeira depois do header no CSV)
+    started_at: str | None
+    ended_at: str | None
+    note: str | None
+    error: str | None = None  # erro de parsing da linha
+
+
+@dataclass
+class _Candidate:
+    row: int
+    started_at: datetime
+    ended_at: datetime
+    note: str | None
+
+
+def parse_import(content: bytes | str, fmt: str) -> List[ImportRow]:
+    """Lê CSV (header started_at,ended_at[,note]) ou NDJSON (um objeto por linha)."""
+    try:
+        text = content.decode("utf-8-sig") if isinstance(content, bytes) else content
+    except UnicodeDecodeError:
+        raise bad_request("file must be UTF-8 encoded")
+    rows: List[ImportRow] = []
+
+    if fmt == "ndjson":
+        for n, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            if not isinstance(obj, dict):
+                rows.append(ImportRow(row=n, started_at=None, ended_at=None, note=None, error="invalid json"))
+                continue
+            note = obj.get("note")
+            if note is not None and not isinstance(note, str):
+                rows.append(ImportRow(row=n, started_at=None, ended_at=None, note=None, error="note must be a string"))
+                continue
+            rows.append(ImportRow(row=n, started_at=obj.get("started_at"), ended_at=obj.get("ended_at"), note=note))
+        return rows
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {"started_at", "ended_at"} <= set(reader.fieldnames):
+        raise bad_request("CSV precisa das colunas started_at e ended_at")
+    for n, rec in enumerate(reader, start=1):
+        rows.append(ImportRow(row=n, started_at=rec.get("started_at"), ended_at=rec.get("ended_at"), note=rec.get("note") or None))
+    return rows
+
+
+def _parse_ts(value) -> datetime:
+    # ISO 8601; sem fuso = horário de Brasília
+    dt = datetime.fromisoformat(str(value).strip())
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=BR_TZ or timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _br_day(dt: datetime) -> str:
+    return dt.astimezone(BR_TZ or timezone.utc).date().isoformat()
+
+
+def _validate_rows(rows: List[ImportRow], w: Work) -> tuple[List[_Candidate], List[dict]]:
+    errors: List[dict] = []
+    candidates: List[_Candidate] = []
+
+    for r in rows:
+        if r.error is not None:
+            errors.append({"row": r.row, "error": r.error})
+            continue
+        try:
+            started_at = _parse_ts(r.started_at)
+            ended_at = _parse_ts(r.ended_at)
+        except (TypeError, ValueError):
+            errors.append({"row": r.row, "error": "started_at/ended_at must be ISO 8601"})
+            continue
+        if ended_at <= started_at:
+            errors.append({"row": r.row, "error": "ended_at must be after started_at"})
+            continue
+        if _br_day(started_at) < w.start_date or _br_day(ended_at) > w.end_date:
+            errors.append({"row": r.row, "error": "entry outside work start_date/end_date"})
+            continue
+        if r.note is not None and len(r.note) > NOTE_MAX_LEN:
+            errors.append({"row": r.row, "error": f"note longer than {NOTE_MAX_LEN}"})
+            continue
+        candidates.append(_Candidate(r.row, started_at, ended_at, r.note))
+
+    return candidates, errors
+
+
+def _existing_intervals(db: Session, *, work_id: str, lo: datetime, hi: datetime) -> tuple[list, list]:
+    """Intervalos já gravados que podem colidir com [lo, hi): starts ordenados + máximo acumulado dos ends."""
+    now = datetime.now(timezone.utc)
+    rows = db.execute(
+        select(TimeEntry.started_at, TimeEntry.ended_at)
+        .where(
+            TimeEntry.work_id == work_id,
+            TimeEntry.deleted_at.is_(None),
+            TimeEntry.started_at < hi,
+        )
+        .order_by(TimeEntry.started_at)
+    ).all()
+
+    starts: list = []
+    max_ends: list = []
+    running = datetime.min.replace(tzinfo=timezone.utc)
+    for s, e in rows:
+        # entry aberta ocupa até agora
+        end = as_utc(e) if e is not None else now
+        if end <= lo:
+            continue
+        running = max(running, end)
+        starts.append(as_utc(s))
+        max_ends.append(running)
+    return starts, max_ends
+
+
+def _check_overlaps(db: Session, *, work_id: str, candidates: List[_Candidate]) -> tuple[List[_Candidate], List[dict]]:
+    """
+    Uma passada ordenada: cada linha é comparada com a última aceita do próprio lote e,
+    por busca binária, com as entries existentes do work. O(n log n), sem N queries.
+    """
+    if not candidates:
+        return [], []
+    candidates.sort(key=lambda c: (c.started_at, c.row))
+    lo = candidates[0].started_at
+    hi = max(c.ended_at for c in candidates)
+    starts, max_ends = _existing_intervals(db, work_id=work_id, lo=lo, hi=hi)
+
+    accepted: List[_Candidate] = []
+    errors: List[dict] = []
+    last: _Candidate | None = None
+    for c in candidates:
+        idx = bisect_left(starts, c.ended_at)
+        if idx > 0 and max_ends[idx - 1] > c.started_at:
+            errors.append({"row": c.row, "error": "overlaps an existing entry"})
+            continue
+        if last is not None and c.started_at < last.ended_at:
+            errors.append({"row": c.row, "error": f"overlaps row {last.row}"})
+            continue
+        accepted.append(c)
+        last = c
+    return accepted, errors
+
+
+def _copy_rows(db: Session, records: List[dict]) -> bool:
+    """COPY ... FROM STDIN no Postgres (psycopg 3 ou psycopg2). Retorna False se não der pra usar."""
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql" or getattr(dialect, "is_async", False):
+        return False
+    raw = db.connection().connection.driver_connection
+    sql = f"COPY time_entries ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+    cur = raw.cursor()
+    try:
+        if hasattr(cur, "copy"):  # psycopg 3
+            with cur.copy(sql) as copy:
+                for rec in records:
+                    copy.write_row(tuple(rec[c] for c in COPY_COLUMNS))
+            return True
+        if hasattr(cur, "copy_expert"):  # psycopg2
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for rec in records:
+                writer.writerow(["" if rec[c] is None else rec[c] for c in COPY_COLUMNS])
+            buf.seek(0)
+            cur.copy_expert(sql.replace("FROM STDIN", "FROM STDIN WITH (FORMAT csv)"), buf)
+            return True
+        return False
+    finally:
+        cur.close()
+
+
+def import_entries(
+    db: Session, *, work_id: str, user_id: str, rows: List[ImportRow], dry_run: bool = False
+) -> dict:
+    """
+    Importa entries fechadas em lote. Linhas inválidas (formato, fora das datas do work,
+    sobreposição) voltam em `errors` e as válidas entram numa transação só, junto com
+    o rollup diário e o total do work.
+    """
+    # lock no work como em start/stop_timer e close_work: a checagem de sobreposição e o
+    # insert não correm contra outro import, um timer aberto ou o fechamento do work
+    # (dry run não grava nada: não trava os outros)
+    w = get_work_or_404(db, work_id=work_id, user_id=user_id, lock=not dry_run)
+    ensure_work_is_active(w)
+
+    candidates, errors = _validate_rows(rows, w)
+    accepted, overlap_errors = _check_overlaps(db, work_id=work_id, candidates=candidates)
+    errors.extend(overlap_errors)
+    errors.sort(key=lambda e: e["row"])
+
+    if dry_run or not accepted:
+        return {"inserted": 0, "errors": errors, "dry_run": dry_run}
+
+    records = [
+        {
+            "id": str(uuid.uuid4()),
+            "work_id": work_id,
+            "started_at": c.started_at,
+            "ended_at": c.ended_at,
+            "note": c.note,
+        }
+        for c in accepted
+    ]
+
+    if not _copy_rows(db, records):
+        for i in range(0, len(records), BULK_BATCH_SIZE):
+            db.execute(insert(TimeEntry), records[i : i + BULK_BATCH_SIZE])
+
+    # rollup e contador: uma escrita por dia tocado, não por linha
+    total = rollup_service.apply_intervals(
+        db, work_id=work_id, intervals=[(c.started_at, c.ended_at) for c in accepted]
+    )
+    db.execute(
+        update(Work)
+        .where(Work.id == work_id)
+        .values(total_closed_seconds=Work.total_closed_seconds + total)
+    )
+    bump_data_version(db, user_id=user_id)
+    events.emit(db, user_id=user_id, type="entries.imported", work_id=work_id, count=len(records))
+    db.commit()
+    return {"inserted": len(records), "errors": errors, "dry_run": False}
@@ -0,0 +1,147 @@
+"""
+Partições mensais de time_entries (Postgres).
+
+time_entries é particionada por RANGE (started_at), uma partição por mês no fuso BR
+(time_entries_YYYY_MM, de 00:00 do dia 1 até 00:00 do dia 1 seguinte): o export de um mês
+e os ranges por dia dos relatórios caem em uma partição só. time_entries_default pega o que
+não tem partição ainda (ex.: import de histórico antigo); ensure_partitions cria os meses que
+faltam, à frente e atrás, e move pra eles o que estiver na default.
+
+Em SQLite (dev) a tabela é uma só e tudo aqui vira no-op.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.utils.time import BR_TZ, br_day_start_utc
+
+logger = logging.getLogger(__name__)
+
+PARENT = "time_entries"
+DEFAULT_PARTITION = "time_entries_default"
+# pg_advisory_xact_lock: workers/cron criando partição ao mesmo tempo esperam um ao outro
+ADVISORY_LOCK_KEY = 7_340_001
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:t))"),
+            {"t": PARENT},
+        ).scalar()
+    )
+
+
+def month_of(dt: datetime) -> date:
+    """Mês (dia 1) em que cai o instante `dt`, no fuso BR."""
+    return dt.astimezone(BR_TZ or timezone.utc).date().replace(day=1)
+
+
+def add_months(month: date, n: int) -> date:
+    y, m = divmod(month.month - 1 + n, 12)
+    return date(month.year + y, m + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def partition_bounds(month: date) -> tuple[datetime, datetime]:
+    return br_day_start_utc(month), br_day_start_utc(add_months(month, 1))
+
+
+def existing_partitions(db: Session) -> set[str]:
+    rows = db.execute(
+        text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:t)"),
+        {"t": PARENT},
+    )
+    return {name for (name,) in rows}
+
+
+def _create_month(db: Session, month: date) -> int:
+    """
+    Cria a partição do mês trazendo o que estiver na default nesse range. Retorna quantas
+    linhas saíram da default. Não faz commit.
+    """
+    name = partition_name(month)
+    lo, hi = partition_bounds(month)
+    bounds = {"lo": lo, "hi": hi}
+    # CREATE ... PARTITION OF falharia com linhas do range na default: cria solta, move e anexa
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = db.execute(
+        text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE started_at >= :lo AND started_at < :hi"),
+        bounds,
+    ).rowcount
+    if moved:
+        db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE started_at >= :lo AND started_at < :hi"), bounds)
+    # limites vêm de datas, não de input: seguro montar o literal
+    db.execute(
+        text(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+        )
+    )
+    return moved
+
+
+def ensure_partitions(db: Session, *, months_ahead: int | None = None, since: date | None = None) -> list[str]:
+    """
+    Garante a default e as partições de `since` (default: mês corrente) até `months_ahead`
+    meses à frente, mais os meses que tiverem linhas paradas na default.
+    Retorna os nomes criados. Não faz commit.
+    """
+    if not is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.TIME_ENTRY_PARTITIONS_AHEAD_MONTHS
+
+    db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": ADVISORY_LOCK_KEY})
+    existing = existing_partitions(db)
+    created: list[str] = []
+    if DEFAULT_PARTITION not in existing:
+        db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT} DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+
+    current = month_of(datetime.now(timezone.utc))
+    first = min(since.replace(day=1), current) if since is not None else current
+    last = add_months(current, months_ahead)
+    lo, hi = db.execute(text(f"SELECT min(started_at), max(started_at) FROM {DEFAULT_PARTITION}")).one()
+    if lo is not None:
+        first, last = min(first, month_of(lo)), max(last, month_of(hi))
+
+    moved = 0
+    month = first
+    while month <= last:
+        if partition_name(month) not in existing:
+            moved += _create_month(db, month)
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    if moved:
+        logger.info("time_entries: %d linhas movidas da partição default", moved)
+    return created
+
+
+def _maintain_once() -> list[str]:
+    with SessionLocal() as db:
+        created = ensure_partitions(db)
+        db.commit()
+    return created
+
+
+async def run_maintenance(interval_seconds: float) -> None:
+    """Loop do lifespan: garante as partições dos próximos meses ao subir e a cada intervalo."""
+    while True:
+        try:
+            created = await asyncio.to_thread(_maintain_once)
+            if created:
+                logger.info("time_entries: partições criadas: %s", ", ".join(created))
+        except Exception:
+            logger.exception("manutenção das partições de time_entries")
+        await asyncio.sleep(interval_seconds)
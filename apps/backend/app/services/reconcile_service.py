@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import List
+
+from sqlalchemy import BigInteger, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.expressions import entry_seconds
+from app.db.models.work import Work
+from app.db.models.time_entry import TimeEntry
+
+
+@dataclass
+class TotalDrift:
+    work_id: str
+    stored_seconds: int
+    actual_seconds: int
+
+
+def find_total_drift(db: Session, *, work_id: str | None = None) -> List[TotalDrift]:
+    """
+    Compara Work.total_closed_seconds com a soma real das time_entries fechadas
+    (calculada no banco, uma query). Retorna só os works divergentes.
+    """
+    seconds = entry_seconds(db.get_bind().dialect.name)
+    actual = (
+        select(
+            TimeEntry.work_id.label("work_id"),
+            cast(func.sum(seconds), BigInteger).label("seconds"),
+        )
+        .where(TimeEntry.ended_at.is_not(None), TimeEntry.deleted_at.is_(None))
+        .group_by(TimeEntry.work_id)
+        .subquery()
+    )
+
+    stmt = select(
+        Work.id,
+        Work.total_closed_seconds,
+        func.coalesce(actual.c.seconds, 0),
+    ).outerjoin(actual, actual.c.work_id == Work.id)
+    if work_id is not None:
+        stmt = stmt.where(Work.id == work_id)
+
+    return [
+        TotalDrift(work_id=w_id, stored_seconds=int(stored), actual_seconds=int(real))
+        for w_id, stored, real in db.execute(stmt)
+        if int(stored) != int(real)
+    ]
+
+
+def repair_total_drift(db: Session, drifts: List[TotalDrift]) -> None:
+    """Grava o valor real nos works divergentes. Não faz commit."""
+    for d in drifts:
+        db.execute(
+            update(Work).where(Work.id == d.work_id).values(total_closed_seconds=d.actual_seconds)
+        )
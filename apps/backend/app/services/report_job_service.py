@@ -0,0 +1,263 @@
+"""
+Relatórios em background: POST /reports/jobs grava um report_jobs "queued" e entrega o id
+pro pool deste processo; um worker calcula (get_summary/get_timeseries) numa sessão de
+leitura própria e grava o resultado em JSON. O request HTTP não segura worker nem conexão.
+
+Limites: REPORT_JOB_WORKERS rodando e REPORT_JOB_MAX_QUEUE esperando por processo (503),
+REPORT_JOB_MAX_ACTIVE_PER_USER ativos por usuário contando no banco (429).
+Cancelar marca "canceled" no banco; se o job está rodando neste processo, a query em curso
+é interrompida no driver. Em outro processo ele termina a query e o resultado é descartado.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.config import settings
+from app.core.errors import not_found, too_many_requests
+from app.db.models.report_job import ReportJob
+from app.db.models.user import User
+from app.db.read_routing import read_sessionmaker
+from app.db.session import SessionLocal
+from app.services.reports_service import get_summary, get_timeseries
+from app.utils.time import as_utc
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("summary", "timeseries")
+ACTIVE_STATUSES = ("queued", "running")
+ERROR_MAX_LEN = 255
+
+
+class ReportJobsBusy(Exception):
+    """Fila do pool cheia; quem chamou deve responder 503."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stale_before() -> datetime:
+    return _utcnow() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS)
+
+
+def _timeout_clock():
+    # rodando conta do início da execução (não do tempo na fila); na fila, da criação
+    return func.coalesce(ReportJob.started_at, ReportJob.created_at)
+
+
+def _is_stale(job: ReportJob) -> bool:
+    return as_utc(job.started_at or job.created_at) < _stale_before()
+
+
+def _compute(db: Session, job: ReportJob) -> dict:
+    p = job.params
+    if job.kind == "summary":
+        return get_summary(db, user_id=job.user_id, date_from=p["date_from"], date_to=p["date_to"])
+    return get_timeseries(
+        db, user_id=job.user_id, date_from=p["date_from"], date_to=p["date_to"], group_by=p["group_by"]
+    )
+
+
+def _as_dict(job: ReportJob) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "params": job.params,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def enqueue_job(db: Session, *, user_id: str, kind: str, params: dict) -> dict:
+    """Grava o job "queued" e entrega pro pool. Pool cheio: o job fica "failed" e sobe ReportJobsBusy."""
+    # trava a linha do usuário (Postgres): dois POSTs simultâneos não passam juntos do limite
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+    active = db.execute(
+        select(func.count())
+        .select_from(ReportJob)
+        .where(
+            ReportJob.user_id == user_id,
+            ReportJob.status.in_(ACTIVE_STATUSES),
+            _timeout_clock() >= _stale_before(),
+        )
+    ).scalar_one()
+    if active >= settings.REPORT_JOB_MAX_ACTIVE_PER_USER:
+        raise too_many_requests("too many report jobs in progress", retry_after=5)
+
+    # aproveita pra limpar os antigos do usuário
+    db.execute(
+        delete(ReportJob).where(
+            ReportJob.user_id == user_id,
+            ReportJob.created_at < _utcnow() - timedelta(days=settings.REPORT_JOB_RETENTION_DAYS),
+        )
+    )
+    job = ReportJob(user_id=user_id, kind=kind, params=params, status="queued", created_at=_utcnow())
+    db.add(job)
+    db.commit()
+
+    try:
+        runner.submit(job.id)
+    except ReportJobsBusy:
+        _finish(db, job.id, from_status="queued", status="failed", error="busy")
+        db.commit()
+        raise
+    return _as_dict(job)
+
+
+def _get_job_or_404(db: Session, *, job_id: str, user_id: str) -> ReportJob:
+    job = db.execute(
+        select(ReportJob).where(ReportJob.id == job_id, ReportJob.user_id == user_id)
+    ).scalar_one_or_none()
+    if job is None:
+        raise not_found("Report job not found")
+    if job.status in ACTIVE_STATUSES and _is_stale(job):
+        # passou do limite (ou o processo que rodava/tinha na fila morreu); se roda aqui, para a query
+        expired = _finish(db, job_id, from_status=job.status, status="failed", error="timed out")
+        db.commit()
+        if expired:
+            runner.interrupt(job_id)
+        db.refresh(job)
+    return job
+
+
+def get_job(db: Session, *, job_id: str, user_id: str) -> dict:
+    return _as_dict(_get_job_or_404(db, job_id=job_id, user_id=user_id))
+
+
+def cancel_job(db: Session, *, job_id: str, user_id: str) -> dict:
+    job = _get_job_or_404(db, job_id=job_id, user_id=user_id)
+    if job.status in ACTIVE_STATUSES:
+        canceled = _finish(db, job_id, from_status=job.status, status="canceled")
+        db.commit()
+        if canceled:
+            runner.interrupt(job_id)
+        db.refresh(job)
+    return _as_dict(job)
+
+
+def _finish(
+    db: Session, job_id: str, *, from_status: str, status: str, result: dict | None = None, error: str | None = None
+) -> bool:
+    """Transição condicional: não sobrescreve um cancel/timeout concorrente. Sem commit."""
+    res = db.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id, ReportJob.status == from_status)
+        .values(status=status, result=result, error=error, finished_at=_utcnow())
+    )
+    return res.rowcount == 1
+
+
+def _claim(job_id: str) -> ReportJob | None:
+    """queued -> running. None se foi cancelado/expirou antes de chegar a vez."""
+    with SessionLocal() as db:
+        res = db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "queued")
+            .values(status="running", started_at=_utcnow())
+        )
+        db.commit()
+        if res.rowcount != 1:
+            return None
+        job = db.get(ReportJob, job_id)
+        db.expunge(job)
+        return job
+
+
+def _interrupter(db: Session):
+    # psycopg/psycopg2: cancel(); sqlite3: interrupt()
+    raw = db.connection().connection.driver_connection
+    return getattr(raw, "cancel", None) or getattr(raw, "interrupt", None)
+
+
+class _ReportJobRunner:
+    """Pool de threads dos jobs, separado do threadpool das rotas (mesma ideia do pool de hashing)."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-job")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running: Dict[str, object] = {}  # job_id -> função que interrompe a query
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, job_id: str) -> None:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ReportJobsBusy()
+            self._in_flight += 1
+        self._executor.submit(self._run, job_id)
+
+    def interrupt(self, job_id: str) -> None:
+        with self._lock:
+            interrupt = self._running.get(job_id)
+        if interrupt is not None:
+            interrupt()
+
+    def _run(self, job_id: str) -> None:
+        try:
+            job = _claim(job_id)
+            if job is not None:
+                self._execute(job)
+        except Exception:
+            logger.exception("report job %s", job_id)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+
+    def _execute(self, job: ReportJob) -> None:
+        status, result, error = "done", None, None
+        try:
+            with read_sessionmaker(job.user_id)() as db:
+                with self._lock:
+                    self._running[job.id] = _interrupter(db)
+                try:
+                    result = _compute(db, job)
+                finally:
+                    with self._lock:
+                        self._running.pop(job.id, None)
+        except Exception as e:
+            # inclui a query interrompida por cancel_job: aí o status já é "canceled" e o update abaixo não pega
+            status, error = "failed", f"{type(e).__name__}: {e}"[:ERROR_MAX_LEN]
+
+        with SessionLocal() as db:
+            if _finish(db, job.id, from_status="running", status=status, result=result, error=error):
+                events.emit(db, user_id=job.user_id, type="report_job.finished", job_id=job.id, status=status)
+            db.commit()
+
+    def shutdown(self) -> None:
+        # o que estava na fila fica "queued" no banco e expira (REPORT_JOB_TIMEOUT_SECONDS);
+        # o que estava rodando é interrompido e vira "failed"
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            interrupts = list(self._running.values())
+        for interrupt in interrupts:
+            interrupt()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "running": len(self._running),
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+runner = _ReportJobRunner(settings.REPORT_JOB_WORKERS, settings.REPORT_JOB_MAX_QUEUE)
@@ -1,14 +1,38 @@
+import csv
+import io
+import json
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, date, timezone, timedelta
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterable, Iterator, List
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import BigInteger, Date, Select, and_, cast, func, not_, or_, select
 
-from app.db.models.work import Work
 from app.db.models.time_entry import TimeEntry
-from app.utils.time import seconds_between
-from app.utils.money import cents_from_hourly_rate
+from app.db.models.work import Work
+from app.db.models.work_daily_total import WorkDailyTotal
+from app.db.models.work_settlement import WorkSettlement
+from app.utils.money import cents_from_hourly_rate, cents_from_hourly_rate_batch
+from app.utils.time import as_utc, br_day_start_utc, epoch_us, seconds_between_batch
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "entry_id",
+    "work_id",
+    "work_title",
+    "sprint_name",
+    "started_at",
+    "ended_at",
+    "duration_seconds",
+    "earned_cents",
+    "currency",
+    "note",
+]
+# dimensões aceitas por get_timeseries; só uma pode ser de tempo
+TIME_GRAINS = ("day", "week", "month")
+GROUP_DIMENSIONS = TIME_GRAINS + ("sprint", "work")
 
 
 def _to_date(s: str) -> date:
@@ -24,6 +48,36 @@ def _end_of_day_utc(d: date) -> datetime:
     return _start_of_day_utc(d) + timedelta(days=1)
 
 
+def _settled_within(d_from: date, d_to: date):
+    # work encerrado cujo tempo inteiro cai no range: o fechamento vale pelo rollup
+    return and_(WorkSettlement.first_day >= d_from, WorkSettlement.last_day <= d_to)
+
+
+def _settled_rows(db: Session, *, user_id: str, d_from: date, d_to: date) -> list:
+    """Works encerrados cobertos pelo range, com os totais do fechamento (uma linha por work)."""
+    return db.execute(
+        select(
+            Work.id,
+            Work.title,
+            Work.sprint_name,
+            Work.hourly_rate_cents,
+            Work.currency,
+            Work.start_date,
+            WorkSettlement.total_seconds,
+            WorkSettlement.earned_cents,
+        )
+        .join(WorkSettlement, WorkSettlement.work_id == Work.id)
+        .where(Work.user_id == user_id, _settled_within(d_from, d_to))
+    ).all()
+
+
+def _not_settled_within(stmt: Select, d_from: date, d_to: date) -> Select:
+    # o resto continua pelo rollup: ativos, sem fechamento ou só parcialmente no range
+    return stmt.outerjoin(WorkSettlement, WorkSettlement.work_id == Work.id).where(
+        or_(WorkSettlement.work_id.is_(None), not_(_settled_within(d_from, d_to)))
+    )
+
+
 @dataclass
 class WorkSummary:
     work_id: str
@@ -36,62 +90,73 @@ class WorkSummary:
 
 def get_summary(db: Session, *, user_id: str, date_from: str, date_to: str) -> Dict:
     """
-    date_from/date_to em YYYY-MM-DD. Intervalo inclusivo.
+    date_from/date_to em YYYY-MM-DD (dias no fuso BR). Intervalo inclusivo.
     Regras:
     - Considera sessões fechadas (ended_at != NULL)
-    - Filtra entradas cuja started_at esteja dentro do range (MVP simples)
-      (Se quiser lidar com sessões que atravessam dias, a gente melhora depois.)
+    - Lê do rollup work_daily_totals: sessões que atravessam a meia-noite já estão
+      divididas entre os dias, então só conta a parte que cai dentro do range
+    - Works encerrados inteiros dentro do range vêm do fechamento (work_settlements),
+      uma linha por work, sem passar pelo rollup
     """
     d_from = _to_date(date_from)
     d_to = _to_date(date_to)
 
-    start_dt = datetime(d_from.year, d_from.month, d_from.day, tzinfo=timezone.utc)
-    end_dt = datetime(d_to.year, d_to.month, d_to.day, tzinfo=timezone.utc)  # 00:00 do dia 'to'
-    end_dt = end_dt.replace(hour=23, minute=59, second=59)
-
-    works = db.query(Work).filter(Work.user_id == user_id).all()
-    work_map = {w.id: w for w in works}
+    settled = _settled_rows(db, user_id=user_id, d_from=d_from, d_to=d_to)
 
-    entries = (
-        db.query(TimeEntry)
-        .join(Work, Work.id == TimeEntry.work_id)
-        .filter(
+    # Uma única query sobre o rollup: custo cresce com o número de dias, não de entries.
+    stmt = (
+        select(
+            Work.id,
+            Work.title,
+            Work.sprint_name,
+            Work.hourly_rate_cents,
+            Work.currency,
+            Work.start_date,
+            cast(func.sum(WorkDailyTotal.seconds), BigInteger).label("total_seconds"),
+        )
+        .join(WorkDailyTotal, WorkDailyTotal.work_id == Work.id)
+        .where(
             Work.user_id == user_id,
-            TimeEntry.deleted_at.is_(None),
-            TimeEntry.ended_at.is_not(None),
-            and_(TimeEntry.started_at >= start_dt, TimeEntry.started_at <= end_dt),
+            and_(WorkDailyTotal.day >= d_from, WorkDailyTotal.day <= d_to),
+        )
+        .group_by(
+            Work.id,
+            Work.title,
+            Work.sprint_name,
+            Work.hourly_rate_cents,
+            Work.currency,
+            Work.start_date,
         )
-        .all()
     )
-
-    per_work_seconds: Dict[str, int] = {}
-    for e in entries:
-        sec = seconds_between(e.started_at, e.ended_at)  # type: ignore[arg-type]
-        per_work_seconds[e.work_id] = per_work_seconds.get(e.work_id, 0) + sec
+    if settled:
+        stmt = _not_settled_within(stmt, d_from, d_to)
+    rows = db.execute(stmt).all()
 
     items: List[WorkSummary] = []
     total_seconds = 0
     total_earned_cents = 0
 
-    for work_id, sec in per_work_seconds.items():
-        w = work_map.get(work_id)
-        if not w:
-            continue
-        earned = cents_from_hourly_rate(w.hourly_rate_cents, sec)
+    per_work = [(r, int(r.total_seconds or 0), None) for r in rows]
+    per_work += [(r, int(r.total_seconds), int(r.earned_cents)) for r in settled]
+    # empate no ganho sai na ordem da listagem de works (start_date, id desc), não na do banco
+    per_work.sort(key=lambda p: (p[0].start_date, p[0].id), reverse=True)
+    for r, sec, earned in per_work:
+        if earned is None:
+            earned = cents_from_hourly_rate(r.hourly_rate_cents, sec)
         items.append(
             WorkSummary(
-                work_id=w.id,
-                title=w.title,
-                sprint_name=w.sprint_name,
+                work_id=r.id,
+                title=r.title,
+                sprint_name=r.sprint_name,
                 total_seconds=sec,
                 total_earned_cents=earned,
-                currency=w.currency,
+                currency=r.currency,
             )
         )
         total_seconds += sec
         total_earned_cents += earned
 
-    # Ordena por ganho desc
+    # Ordena por ganho desc (sort estável: empates mantêm a ordem acima)
     items.sort(key=lambda x: x.total_earned_cents, reverse=True)
 
     return {
@@ -112,3 +177,217 @@ def get_summary(db: Session, *, user_id: str, date_from: str, date_to: str) -> D
             for i in items
         ],
     }
+
+
+def _bucket_start(d: date, grain: str) -> date:
+    # semana ISO (começa na segunda) e mês, igual ao date_trunc do Postgres
+    if grain == "week":
+        return d - timedelta(days=d.weekday())
+    if grain == "month":
+        return d.replace(day=1)
+    return d
+
+
+def get_timeseries(db: Session, *, user_id: str, date_from: str, date_to: str, group_by: List[str]) -> Dict:
+    """
+    Totais agrupados por qualquer combinação de day/week/month (no máximo um) e sprint/work,
+    dias no fuso BR, intervalo inclusivo. Uma query só, sobre o rollup diário:
+    - sessões que atravessam a meia-noite já estão divididas por dia no rollup, então
+      também ficam divididas entre semanas/meses
+    - Postgres agrupa com date_trunc; nos outros bancos o truncamento é feito aqui
+    - ganho calculado por (bucket, work) e somado, como no get_summary por work
+    - semana/mês nas pontas do range contam só os dias de dentro; a chave é o 1º dia do bucket
+    - só volta bucket com tempo registrado (sem preencher os vazios)
+    - sem day/week/month, works encerrados inteiros no range vêm do fechamento
+    """
+    d_from = _to_date(date_from)
+    d_to = _to_date(date_to)
+    grain = next((g for g in group_by if g in TIME_GRAINS), None)
+
+    seconds = cast(func.sum(WorkDailyTotal.seconds), BigInteger).label("total_seconds")
+    cols = [Work.id, Work.title, Work.sprint_name, Work.hourly_rate_cents]
+    truncate_here = False
+    if grain is not None:
+        if grain != "day" and db.get_bind().dialect.name == "postgresql":
+            bucket = cast(func.date_trunc(grain, WorkDailyTotal.day), Date)
+        else:
+            bucket = WorkDailyTotal.day
+            truncate_here = grain != "day"
+        cols.append(bucket.label("bucket"))
+
+    # sem dimensão de tempo, works encerrados inteiros no range saem do fechamento
+    settled = [] if grain is not None else _settled_rows(db, user_id=user_id, d_from=d_from, d_to=d_to)
+
+    stmt = (
+        select(*cols, seconds)
+        .join(WorkDailyTotal, WorkDailyTotal.work_id == Work.id)
+        .where(
+            Work.user_id == user_id,
+            and_(WorkDailyTotal.day >= d_from, WorkDailyTotal.day <= d_to),
+            # dia zerado por delete (ou sessão de 0 s) não vira bucket da série
+            WorkDailyTotal.seconds != 0,
+        )
+        .group_by(*cols)
+    )
+    if settled:
+        stmt = _not_settled_within(stmt, d_from, d_to)
+    rows = db.execute(stmt).all()
+
+    # segundos por (bucket, work); o ganho é arredondado uma vez por par, nos dois caminhos
+    per_work: Dict[tuple, int] = defaultdict(int)
+    meta: Dict[str, tuple] = {}
+    for r in settled:
+        per_work[(None, r.id)] = int(r.total_seconds)
+        meta[r.id] = (r.title, r.sprint_name, r.hourly_rate_cents)
+    for r in rows:
+        b = None
+        if grain is not None:
+            b = _bucket_start(r.bucket, grain) if truncate_here else r.bucket
+        per_work[(b, r.id)] += int(r.total_seconds or 0)
+        meta[r.id] = (r.title, r.sprint_name, r.hourly_rate_cents)
+
+    groups: Dict[tuple, dict] = {}
+    total_seconds = 0
+    total_earned_cents = 0
+    for (b, work_id), sec in per_work.items():
+        title, sprint_name, rate = meta[work_id]
+        earned = cents_from_hourly_rate(rate, sec)
+        key_fields: Dict[str, str] = {}
+        for dim in group_by:
+            if dim in TIME_GRAINS:
+                key_fields[dim] = b.isoformat()
+            elif dim == "sprint":
+                key_fields["sprint_name"] = sprint_name
+            else:
+                key_fields["work_id"] = work_id
+                key_fields["title"] = title
+        g = groups.setdefault(tuple(key_fields.values()), {**key_fields, "total_seconds": 0, "total_earned_cents": 0})
+        g["total_seconds"] += sec
+        g["total_earned_cents"] += earned
+        total_seconds += sec
+        total_earned_cents += earned
+
+    return {
+        "from": date_from,
+        "to": date_to,
+        "group_by": list(group_by),
+        "total_seconds": total_seconds,
+        "total_earned_cents": total_earned_cents,
+        "currency": "BRL",
+        "buckets": [groups[k] for k in sorted(groups)],
+    }
+
+
+def _export_stmt(*, user_id: str, date_from: str, date_to: str) -> Select:
+    # entries com started_at dentro dos dias [date_from, date_to] (fuso BR), só colunas
+    start_dt = br_day_start_utc(_to_date(date_from))
+    end_dt = br_day_start_utc(_to_date(date_to) + timedelta(days=1))
+    return (
+        select(
+            TimeEntry.id,
+            TimeEntry.work_id,
+            Work.title,
+            Work.sprint_name,
+            TimeEntry.started_at,
+            TimeEntry.ended_at,
+            Work.hourly_rate_cents,
+            Work.currency,
+            TimeEntry.note,
+        )
+        .join(Work, Work.id == TimeEntry.work_id)
+        .where(
+            Work.user_id == user_id,
+            TimeEntry.deleted_at.is_(None),
+            TimeEntry.started_at >= start_dt,
+            TimeEntry.started_at < end_dt,
+        )
+        .order_by(TimeEntry.started_at, TimeEntry.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def _export_records(rows: Iterable) -> List[dict]:
+    """Um lote de linhas do _export_stmt -> registros; duração/ganho calculados em lote."""
+    rows = list(rows)
+    # entry aberta vira intervalo vazio: duração 0, ganho 0
+    starts = [epoch_us(r[4]) if r[5] is not None else 0 for r in rows]
+    ends = [epoch_us(r[5]) if r[5] is not None else 0 for r in rows]
+    durations = seconds_between_batch(starts, ends)
+    earned = cents_from_hourly_rate_batch([r[6] for r in rows], durations)
+
+    out: List[dict] = []
+    for row, duration, cents in zip(rows, durations, earned):
+        entry_id, work_id, title, sprint_name, started_at, ended_at, _rate, currency, note = row
+        out.append(
+            {
+                "entry_id": entry_id,
+                "work_id": work_id,
+                "work_title": title,
+                "sprint_name": sprint_name,
+                "started_at": as_utc(started_at).isoformat(),
+                "ended_at": as_utc(ended_at).isoformat() if ended_at is not None else None,
+                "duration_seconds": duration,
+                "earned_cents": cents,
+                "currency": currency,
+                "note": note,
+            }
+        )
+    return out
+
+
+class _ExportFormatter:
+    """Converte lotes de linhas em texto CSV/NDJSON, reaproveitando o buffer."""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator="\n")
+
+    def header(self) -> str:
+        if self.fmt != "csv":
+            return ""
+        self._writer.writerow(EXPORT_COLUMNS)
+        return self._drain()
+
+    def chunk(self, rows: Iterable) -> str:
+        records = _export_records(rows)
+        if self.fmt == "csv":
+            for rec in records:
+                self._writer.writerow(["" if rec[c] is None else rec[c] for c in EXPORT_COLUMNS])
+            return self._drain()
+        return "".join(json.dumps(rec, ensure_ascii=False) + "\n" for rec in records)
+
+    def _drain(self) -> str:
+        out = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return out
+
+
+def iter_entries_export(
+    db: Session, *, user_id: str, date_from: str, date_to: str, fmt: str = "csv"
+) -> Iterator[str]:
+    """
+    Export de todas as entries do usuário no range, em lotes de texto.
+    Usa cursor do lado do servidor (yield_per/stream_results): memória constante.
+    """
+    f = _ExportFormatter(fmt)
+    head = f.header()
+    if head:
+        yield head
+    result = db.execute(_export_stmt(user_id=user_id, date_from=date_from, date_to=date_to))
+    for part in result.partitions():
+        yield f.chunk(part)
+
+
+async def aiter_entries_export(
+    db: AsyncSession, *, user_id: str, date_from: str, date_to: str, fmt: str = "csv"
+) -> AsyncIterator[str]:
+    """Mesmo que iter_entries_export, pra AsyncSession (DB_MODE=async)."""
+    f = _ExportFormatter(fmt)
+    head = f.header()
+    if head:
+        yield head
+    result = await db.stream(_export_stmt(user_id=user_id, date_from=date_from, date_to=date_to))
+    async for part in result.partitions():
+        yield f.chunk(part)
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.time_entry import TimeEntry
+from app.db.models.work_daily_total import WorkDailyTotal
+from app.utils.time import split_seconds_by_day_br
+
+REBUILD_BATCH_SIZE = 5000
+
+
+def _upsert_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def _add_seconds(db: Session, *, work_id: str, day: date, seconds: int) -> None:
+    insert = _upsert_insert(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(WorkDailyTotal).values(work_id=work_id, day=day, seconds=seconds)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WorkDailyTotal.work_id, WorkDailyTotal.day],
+            set_={"seconds": WorkDailyTotal.seconds + stmt.excluded.seconds},
+        )
+        db.execute(stmt)
+        return
+
+    # fallback genérico (sem upsert nativo)
+    res = db.execute(
+        update(WorkDailyTotal)
+        .where(WorkDailyTotal.work_id == work_id, WorkDailyTotal.day == day)
+        .values(seconds=WorkDailyTotal.seconds + seconds)
+    )
+    if res.rowcount == 0:
+        db.add(WorkDailyTotal(work_id=work_id, day=day, seconds=seconds))
+        db.flush()
+
+
+def apply_entry(db: Session, entry: TimeEntry, *, sign: int = 1) -> int:
+    """
+    Soma (sign=1) ou subtrai (sign=-1) uma entry fechada do rollup diário.
+    Retorna os segundos da entry. Não faz commit: roda dentro da transação de quem chamou.
+    """
+    if entry.ended_at is None:
+        return 0
+    total = 0
+    for day, sec in split_seconds_by_day_br(entry.started_at, entry.ended_at):
+        _add_seconds(db, work_id=entry.work_id, day=day, seconds=sign * sec)
+        total += sec
+    return total
+
+
+def apply_intervals(db: Session, *, work_id: str, intervals: Iterable[Tuple[datetime, datetime]]) -> int:
+    """
+    Lança no rollup várias sessões fechadas do mesmo work (ex.: import em lote),
+    com uma escrita por dia tocado. Retorna o total de segundos. Não faz commit.
+    """
+    per_day: Dict[date, int] = defaultdict(int)
+    for started_at, ended_at in intervals:
+        for day, sec in split_seconds_by_day_br(started_at, ended_at):
+            per_day[day] += sec
+    for day, sec in per_day.items():
+        _add_seconds(db, work_id=work_id, day=day, seconds=sec)
+    return sum(per_day.values())
+
+
+def rebuild_daily_totals(db: Session, *, work_id: str | None = None) -> int:
+    """
+    Recalcula work_daily_totals a partir das time_entries (todas ou de um work).
+    Retorna quantas linhas de rollup foram gravadas. Não faz commit.
+    """
+    delete_stmt = delete(WorkDailyTotal)
+    entries_stmt = select(TimeEntry.work_id, TimeEntry.started_at, TimeEntry.ended_at).where(
+        TimeEntry.ended_at.is_not(None),
+        TimeEntry.deleted_at.is_(None),
+    )
+    if work_id is not None:
+        delete_stmt = delete_stmt.where(WorkDailyTotal.work_id == work_id)
+        entries_stmt = entries_stmt.where(TimeEntry.work_id == work_id)
+
+    totals: Dict[Tuple[str, date], int] = defaultdict(int)
+    rows = db.execute(entries_stmt.execution_options(yield_per=REBUILD_BATCH_SIZE))
+    for w_id, started_at, ended_at in rows:
+        for day, sec in split_seconds_by_day_br(started_at, ended_at):
+            totals[(w_id, day)] += sec
+
+    db.execute(delete_stmt)
+
+    batch: list[dict] = []
+    for (w_id, day), sec in totals.items():
+        batch.append({"work_id": w_id, "day": day, "seconds": sec})
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            db.execute(WorkDailyTotal.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.execute(WorkDailyTotal.__table__.insert(), batch)
+
+    return len(totals)
@@ -0,0 +1,86 @@
+"""
+Fechamento (work_settlements) de works encerrados.
+
+close_work grava o fechamento na mesma transação; depois disso relatórios e estado do
+timer leem os totais daqui em vez de somar rollup/entries. Apagar uma entry de um work
+encerrado regrava o fechamento (resettle_work) na transação do delete.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+
+from sqlalchemy import BigInteger, cast, delete, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models.time_entry import TimeEntry
+from app.db.models.work import Work
+from app.db.models.work_daily_total import WorkDailyTotal
+from app.db.models.work_settlement import WorkSettlement
+from app.utils.money import cents_from_hourly_rate
+
+
+def settle_work(db: Session, *, work: Work) -> WorkSettlement:
+    """
+    Calcula e grava o fechamento de `work` (substitui o anterior). Não faz commit.
+    Segundos vêm do rollup (o mesmo que os relatórios somam); contagem e pontas, das entries.
+    """
+    # entries alteradas no ORM (ex.: timer fechado pelo close_work) precisam estar no banco
+    db.flush()
+    seconds, first_day, last_day = db.execute(
+        select(
+            cast(func.coalesce(func.sum(WorkDailyTotal.seconds), 0), BigInteger),
+            func.min(WorkDailyTotal.day),
+            func.max(WorkDailyTotal.day),
+        ).where(WorkDailyTotal.work_id == work.id, WorkDailyTotal.seconds != 0)
+    ).one()
+    count, first_started_at, last_ended_at = db.execute(
+        select(func.count(), func.min(TimeEntry.started_at), func.max(TimeEntry.ended_at)).where(
+            TimeEntry.work_id == work.id,
+            TimeEntry.ended_at.is_not(None),
+            TimeEntry.deleted_at.is_(None),
+        )
+    ).one()
+
+    db.execute(delete(WorkSettlement).where(WorkSettlement.work_id == work.id))
+    settlement = WorkSettlement(
+        work_id=work.id,
+        total_seconds=int(seconds),
+        earned_cents=cents_from_hourly_rate(work.hourly_rate_cents, int(seconds)),
+        entry_count=int(count),
+        first_started_at=first_started_at,
+        last_ended_at=last_ended_at,
+        first_day=first_day,
+        last_day=last_day,
+        settled_at=datetime.now(timezone.utc),
+    )
+    db.add(settlement)
+    db.flush()
+    return settlement
+
+
+def resettle_work(db: Session, *, work: Work) -> None:
+    """Invalida e regrava o fechamento se o work estiver encerrado. Não faz commit."""
+    if work.closed_at is not None:
+        settle_work(db, work=work)
+
+
+def settle_closed_works(db: Session, *, work_ids: Iterable[str] | None = None) -> int:
+    """(Re)grava o fechamento dos works encerrados (todos ou os de work_ids). Retorna quantos. Sem commit."""
+    q = db.query(Work).filter(Work.closed_at.is_not(None))
+    if work_ids is not None:
+        work_ids = list(work_ids)
+        if not work_ids:
+            return 0
+        q = q.filter(Work.id.in_(work_ids))
+    n = 0
+    for w in q.all():
+        settle_work(db, work=w)
+        n += 1
+    return n
+
+
+def get_settlements(db: Session, *, work_ids: Iterable[str]) -> Dict[str, WorkSettlement]:
+    work_ids = list(work_ids)
+    if not work_ids:
+        return {}
+    rows = db.execute(select(WorkSettlement).where(WorkSettlement.work_id.in_(work_ids))).scalars()
+    return {s.work_id: s for s in rows}
@@ -1,88 +1,124 @@
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
-from app.core.errors import not_found, bad_request
+from app.core import events
+from app.core.errors import not_found, bad_request, conflict
 from app.utils.time import today_iso_br
 from app.db.models.work import Work
 from app.db.models.time_entry import TimeEntry
-from app.utils.time import seconds_between
+from app.services import rollup_service
+from app.services.settlement_service import get_settlements, resettle_work
+from app.services.version_service import bump_data_version
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.time import epoch_us, seconds_between_batch
 from fastapi import HTTPException
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def get_work_or_404(db: Session, *, work_id: str, user_id: str) -> Work:
-    w = db.query(Work).filter(Work.id == work_id, Work.user_id == user_id).first()
+def get_work_or_404(db: Session, *, work_id: str, user_id: str, lock: bool = False) -> Work:
+    q = db.query(Work).filter(Work.id == work_id, Work.user_id == user_id)
+    if lock:
+        # FOR UPDATE na linha do work: serializa quem abre/fecha o timer dele (Postgres)
+        q = q.with_for_update()
+    w = q.first()
     if not w:
         raise not_found("Work not found")
     return w
 
 
-def get_open_entry(db: Session, *, work_id: str) -> TimeEntry | None:
-    return (
-        db.query(TimeEntry)
-        .filter(
-            TimeEntry.work_id == work_id,
-            TimeEntry.ended_at.is_(None),
-            TimeEntry.deleted_at.is_(None),
-        )
-        .first()
+def get_open_entry(db: Session, *, work: Work) -> TimeEntry | None:
+    # pela PK inteira gravada no work: uma partição só, sem varrer as de todos os meses
+    if work.open_entry_id is None:
+        return None
+    return db.get(TimeEntry, (work.open_entry_id, work.open_entry_started_at))
+
+
+def account_closed_entry(db: Session, entry: TimeEntry, *, sign: int = 1) -> None:
+    """
+    Lança (sign=1) ou estorna (sign=-1) uma entry fechada no rollup diário e no
+    Work.total_closed_seconds. Roda na transação de quem chamou (sem commit).
+    """
+    sec = rollup_service.apply_entry(db, entry, sign=sign)
+    db.execute(
+        update(Work)
+        .where(Work.id == entry.work_id)
+        .values(total_closed_seconds=Work.total_closed_seconds + sign * sec)
     )
 
 
 def start_timer(db: Session, *, work_id: str, user_id: str) -> tuple[TimeEntry, bool]:
-    w = get_work_or_404(db, work_id=work_id, user_id=user_id)
+    # lock no work: o segundo start espera o commit do primeiro e acha o ponteiro preenchido
+    w = get_work_or_404(db, work_id=work_id, user_id=user_id, lock=True)
     ensure_work_is_active(w)
 
-    open_entry = get_open_entry(db, work_id=work_id)
+    open_entry = get_open_entry(db, work=w)
     if open_entry:
         return open_entry, False
 
     e = TimeEntry(work_id=work_id, started_at=_utcnow(), ended_at=None)
     db.add(e)
+    try:
+        db.flush()
+        # "1 timer aberto por work" garantido no banco: só um start troca o NULL do ponteiro
+        # (time_entries particionada não tem índice único em work_id)
+        claimed = db.execute(
+            update(Work)
+            .where(Work.id == work_id, Work.open_entry_id.is_(None))
+            .values(open_entry_id=e.id, open_entry_started_at=e.started_at)
+        ).rowcount == 1
+    except IntegrityError:
+        # SQLite: ux_time_entries_open_per_work barrou o segundo
+        claimed = False
+    if not claimed:
+        # outro request abriu o timer entre a leitura e o flush (sem FOR UPDATE)
+        db.rollback()
+        open_entry = get_open_entry(db, work=get_work_or_404(db, work_id=work_id, user_id=user_id))
+        if open_entry is None:
+            raise conflict("timer changed concurrently, try again")
+        return open_entry, False
+
+    bump_data_version(db, user_id=user_id)
+    events.emit(db, user_id=user_id, type="timer.started", work_id=work_id, entry_id=e.id, started_at=e.started_at.isoformat())
     db.commit()
     db.refresh(e)
     return e, True
 
 
 def stop_timer(db: Session, *, work_id: str, user_id: str) -> TimeEntry | None:
-    _ = get_work_or_404(db, work_id=work_id, user_id=user_id)
+    # lock no work: dois stops simultâneos não lançam a mesma entry duas vezes no rollup
+    w = get_work_or_404(db, work_id=work_id, user_id=user_id, lock=True)
 
-    open_entry = get_open_entry(db, work_id=work_id)
+    open_entry = get_open_entry(db, work=w)
     if not open_entry:
         return None
 
     open_entry.ended_at = _utcnow()
+    clear_open_entry(w)
+    account_closed_entry(db, open_entry)
+    bump_data_version(db, user_id=user_id)
+    events.emit(db, user_id=user_id, type="timer.stopped", work_id=work_id, entry_id=open_entry.id, ended_at=open_entry.ended_at.isoformat())
     db.commit()
     db.refresh(open_entry)
     return open_entry
 
 
-def get_total_closed_seconds(db: Session, *, work_id: str) -> int:
-    rows = (
-        db.query(TimeEntry)
-        .filter(
-            TimeEntry.work_id == work_id,
-            TimeEntry.ended_at.is_not(None),
-            TimeEntry.deleted_at.is_(None),
-        )
-        .all()
-    )
-
-    total = 0
-    for e in rows:
-        total += seconds_between(e.started_at, e.ended_at)  # type: ignore[arg-type]
-    return total
+def clear_open_entry(w: Work) -> None:
+    w.open_entry_id = None
+    w.open_entry_started_at = None
 
 
-def get_timer_state(db: Session, *, work_id: str, user_id: str) -> dict:
-    w = get_work_or_404(db, work_id=work_id, user_id=user_id)
+def get_total_closed_seconds(db: Session, *, work_id: str) -> int:
+    # contador desnormalizado no work (ver account_closed_entry)
+    total = db.execute(select(Work.total_closed_seconds).where(Work.id == work_id)).scalar_one_or_none()
+    return int(total or 0)
 
-    open_entry = get_open_entry(db, work_id=work_id)
-    total_closed = get_total_closed_seconds(db, work_id=work_id)
 
+def _timer_state(w: Work, total_closed_seconds: int | None = None) -> dict:
     blocked_reason: str | None = None
     is_finished = False
 
@@ -94,9 +130,10 @@ def get_timer_state(db: Session, *, work_id: str, user_id: str) -> dict:
         blocked_reason = "EXPIRED"
 
     return {
-        "running": open_entry is not None,
-        "started_at": open_entry.started_at if open_entry else None,
-        "total_closed_seconds": total_closed,
+        # timer rodando sai do ponteiro no próprio work: nenhuma leitura em time_entries
+        "running": w.open_entry_id is not None,
+        "started_at": w.open_entry_started_at,
+        "total_closed_seconds": w.total_closed_seconds if total_closed_seconds is None else total_closed_seconds,
         "is_finished": is_finished,
         "blocked_reason": blocked_reason,
         "end_date": w.end_date,
@@ -104,34 +141,100 @@ def get_timer_state(db: Session, *, work_id: str, user_id: str) -> dict:
     }
 
 
-def list_entries(db: Session, *, work_id: str, user_id: str, limit: int = 200) -> list[dict]:
+def get_timer_state(db: Session, *, work_id: str, user_id: str) -> dict:
+    return timer_state_for_work(db, get_work_or_404(db, work_id=work_id, user_id=user_id))
+
+
+def timer_state_for_work(db: Session, w: Work) -> dict:
+    """Estado do timer de um work já lido (e já conferido como do usuário)."""
+    if w.closed_at is not None:
+        # encerrado: não tem entry aberta (close_work fecha o timer); total vem do fechamento
+        settlement = get_settlements(db, work_ids=[w.id]).get(w.id)
+        return _timer_state(w, settlement.total_seconds if settlement else None)
+
+    # o work já traz o total somado e o início da entry aberta
+    return _timer_state(w)
+
+
+def get_timer_states(db: Session, *, user_id: str, work_ids: list[str] | None = None) -> list[dict]:
+    """
+    Estado do timer de vários works em 2 queries (works + fechamentos), qualquer que seja N.
+    work_ids=None -> todos os works do usuário. Ids de outros usuários são ignorados.
+    """
+    q = db.query(Work).filter(Work.user_id == user_id)
+    if work_ids is not None:
+        if not work_ids:
+            return []
+        q = q.filter(Work.id.in_(work_ids))
+    works = q.order_by(Work.start_date.desc(), Work.id.desc()).all()
+    if not works:
+        return []
+
+    # entry aberta vem do ponteiro no work; encerrados leem o total do fechamento
+    settlements = get_settlements(db, work_ids=[w.id for w in works if w.closed_at is not None])
+
+    return [
+        {
+            "work_id": w.id,
+            **_timer_state(
+                w,
+                settlements[w.id].total_seconds if w.id in settlements else None,
+            ),
+        }
+        for w in works
+    ]
+
+
+def list_entries(
+    db: Session, *, work_id: str, user_id: str, limit: int = 200, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    """
+    Página de entries (mais recentes primeiro), keyset em (started_at, id).
+    Retorna (itens, next_cursor); next_cursor é None na última página.
+    Lê só as colunas da resposta (tuplas, sem montar objetos TimeEntry).
+    """
     _ = get_work_or_404(db, work_id=work_id, user_id=user_id)
 
-    entries = (
-        db.query(TimeEntry)
-        .filter(
-            TimeEntry.work_id == work_id,
-            TimeEntry.deleted_at.is_(None),
-        )
-        .order_by(TimeEntry.started_at.desc())
-        .limit(limit)
-        .all()
+    stmt = select(TimeEntry.id, TimeEntry.started_at, TimeEntry.ended_at).where(
+        TimeEntry.work_id == work_id,
+        TimeEntry.deleted_at.is_(None),
     )
-
-    items: list[dict] = []
-    for e in entries:
-        duration = 0
-        if e.ended_at is not None:
-            duration = seconds_between(e.started_at, e.ended_at)
-        items.append(
-            {
-                "id": e.id,
-                "started_at": e.started_at,
-                "ended_at": e.ended_at,
-                "duration_seconds": duration,
-            }
+    if cursor:
+        try:
+            c_started_at, c_id = decode_cursor(cursor, types=(datetime, str))
+        except ValueError:
+            raise bad_request("invalid cursor")
+        # o limite só em started_at é redundante, mas é o que o Postgres usa pra podar partições
+        stmt = stmt.where(
+            TimeEntry.started_at <= c_started_at,
+            tuple_(TimeEntry.started_at, TimeEntry.id) < tuple_(c_started_at, c_id),
         )
-    return items
+
+    rows = db.execute(
+        stmt.order_by(TimeEntry.started_at.desc(), TimeEntry.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_id, last_started_at, _ = rows[-1]
+        next_cursor = encode_cursor([last_started_at, last_id])
+
+    # entry aberta vira intervalo vazio: duração 0
+    durations = seconds_between_batch(
+        [epoch_us(started_at) if ended_at is not None else 0 for _, started_at, ended_at in rows],
+        [epoch_us(ended_at) if ended_at is not None else 0 for _, _, ended_at in rows],
+    )
+    items = [
+        {
+            "id": entry_id,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "duration_seconds": duration,
+        }
+        for (entry_id, started_at, ended_at), duration in zip(rows, durations)
+    ]
+    return items, next_cursor
 
 
 def ensure_work_is_active(w: Work) -> None:
@@ -142,8 +245,9 @@ def ensure_work_is_active(w: Work) -> None:
 
 
 def soft_delete_time_entry(db: Session, *, work_id: str, entry_id: str, user_id: str) -> None:
-    # garante que o work é do user
-    _ = get_work_or_404(db, work_id=work_id, user_id=user_id)
+    # garante que o work é do user; lock como em start/stop_timer: dois DELETEs da mesma
+    # entry não estornam o rollup duas vezes
+    w = get_work_or_404(db, work_id=work_id, user_id=user_id, lock=True)
 
     entry = (
         db.query(TimeEntry)
@@ -159,6 +263,22 @@ def soft_delete_time_entry(db: Session, *, work_id: str, entry_id: str, user_id:
     if entry.ended_at is None:
         raise HTTPException(status_code=400, detail="não é possível apagar uma entry em execução")
 
-
-    entry.deleted_at = _utcnow()
+    # condicional: sem FOR UPDATE (SQLite) só um dos concorrentes marca e estorna
+    res = db.execute(
+        update(TimeEntry)
+        .where(
+            TimeEntry.id == entry.id,
+            TimeEntry.started_at == entry.started_at,
+            TimeEntry.deleted_at.is_(None),
+        )
+        .values(deleted_at=_utcnow())
+    )
+    if res.rowcount != 1:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="time entry não encontrado")
+    account_closed_entry(db, entry, sign=-1)
+    # work encerrado: o fechamento ficou velho, regrava com a entry fora
+    resettle_work(db, work=w)
+    bump_data_version(db, user_id=user_id)
+    events.emit(db, user_id=user_id, type="entry.deleted", work_id=work_id, entry_id=entry.id)
     db.commit()
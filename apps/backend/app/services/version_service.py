@@ -0,0 +1,38 @@
+"""
+Versão dos dados por usuário (users.data_version).
+
+Toda escrita que muda o que o usuário vê (timer, entries, works) incrementa a versão
+na mesma transação. As rotas de leitura usam a versão como ETag e como chave de cache:
+se ela não mudou, a resposta também não mudou. A mesma marca manda as próximas leituras
+do usuário pro primário por um tempo (read_routing, read-your-writes).
+"""
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User
+from app.db.models.work import Work
+from app.db.read_routing import note_write
+
+
+def get_data_version(db: Session, *, user_id: str) -> int:
+    v = db.execute(select(User.data_version).where(User.id == user_id)).scalar_one_or_none()
+    return int(v or 0)
+
+
+def bump_data_version(db: Session, *, user_id: str) -> None:
+    """Incrementa a versão do usuário. Não faz commit: roda na transação de quem escreveu."""
+    db.execute(update(User).where(User.id == user_id).values(data_version=User.data_version + 1))
+    note_write(db, user_id=user_id)
+
+
+def bump_data_version_for_works(db: Session, *, work_ids: Iterable[str] | None = None) -> None:
+    """Incrementa a versão dos donos desses works (None = todos os usuários). Sem commit."""
+    stmt = update(User).values(data_version=User.data_version + 1)
+    if work_ids is not None:
+        work_ids = list(work_ids)
+        if not work_ids:
+            return
+        stmt = stmt.where(User.id.in_(select(Work.user_id).where(Work.id.in_(work_ids))))
+    db.execute(stmt)
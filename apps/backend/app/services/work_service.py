@@ -1,20 +1,108 @@
 from datetime import datetime, timezone
-from app.services.timer_service import get_work_or_404, get_open_entry
+from sqlalchemy import select, tuple_
+from app.core import events
+from app.core.errors import bad_request
+from app.services.timer_service import get_work_or_404, get_open_entry, account_closed_entry, clear_open_entry
+from app.services.settlement_service import settle_work
+from app.services.version_service import bump_data_version
 from sqlalchemy.orm import Session
 from app.db.models.work import Work
+from app.utils.cursor import decode_cursor, encode_cursor
 
 
 def close_work(db: Session, *, work_id: str, user_id: str, reason: str | None = None) -> Work:
-    w = get_work_or_404(db, work_id=work_id, user_id=user_id)
+    # mesmo lock de start/stop_timer: não abre timer no meio do encerramento
+    w = get_work_or_404(db, work_id=work_id, user_id=user_id, lock=True)
 
     # se tiver timer aberto, fecha automaticamente
-    open_entry = get_open_entry(db, work_id=work_id)
+    open_entry = get_open_entry(db, work=w)
     if open_entry:
         open_entry.ended_at = datetime.now(timezone.utc)
+        clear_open_entry(w)
+        account_closed_entry(db, open_entry)
 
     w.closed_at = datetime.now(timezone.utc)
     w.closed_reason = reason
+    # totais congelados: daqui pra frente relatórios/timer leem o fechamento
+    settle_work(db, work=w)
+    bump_data_version(db, user_id=user_id)
 
+    events.emit(
+        db,
+        user_id=user_id,
+        type="work.closed",
+        work_id=work_id,
+        closed_at=w.closed_at.isoformat(),
+        stopped_entry_id=open_entry.id if open_entry else None,
+    )
     db.commit()
     db.refresh(w)
     return w
+
+
+def create_work(
+    db: Session,
+    *,
+    user_id: str,
+    title: str,
+    sprint_name: str,
+    start_date: str,
+    end_date: str,
+    hourly_rate_cents: int,
+    currency: str,
+) -> Work:
+    w = Work(
+        user_id=user_id,
+        title=title,
+        sprint_name=sprint_name,
+        start_date=start_date,
+        end_date=end_date,
+        hourly_rate_cents=hourly_rate_cents,
+        currency=currency,
+    )
+    db.add(w)
+    bump_data_version(db, user_id=user_id)
+    db.flush()
+    events.emit(db, user_id=user_id, type="work.created", work_id=w.id)
+    db.commit()
+    db.refresh(w)
+    return w
+
+
+def list_works(
+    db: Session, *, user_id: str, limit: int | None = 200, cursor: str | None = None
+) -> tuple[list[dict], str | None]:
+    """
+    Página de works (start_date mais recente primeiro), keyset em (start_date, id).
+    limit=None: todos a partir do cursor, sem next_cursor.
+    Lê só as colunas da listagem (tuplas, sem montar objetos Work).
+    """
+    stmt = select(
+        Work.id, Work.title, Work.sprint_name, Work.hourly_rate_cents, Work.currency, Work.start_date
+    ).where(Work.user_id == user_id)
+    if cursor:
+        try:
+            c_start_date, c_id = decode_cursor(cursor, types=(str, str))
+        except ValueError:
+            raise bad_request("invalid cursor")
+        stmt = stmt.where(tuple_(Work.start_date, Work.id) < tuple_(c_start_date, c_id))
+
+    stmt = stmt.order_by(Work.start_date.desc(), Work.id.desc())
+    rows = db.execute(stmt if limit is None else stmt.limit(limit + 1)).all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].start_date, rows[-1].id])
+
+    items = [
+        {
+            "id": work_id,
+            "title": title,
+            "sprint_name": sprint_name,
+            "hourly_rate_cents": hourly_rate_cents,
+            "currency": currency,
+        }
+        for work_id, title, sprint_name, hourly_rate_cents, currency, _ in rows
+    ]
+    return items, next_cursor
@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Token opaco (base64url de JSON) com a chave de ordenação do último item da página."""
+    raw = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    data = json.dumps(raw, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *, types: Tuple[type, ...]) -> List[Any]:
+    """
+    Inverso de encode_cursor. `types` é o tipo de cada posição da chave (datetime ou str).
+    Levanta ValueError se o token for inválido ou vier com outro tipo/tamanho.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(raw, list) or len(raw) != len(types):
+        raise ValueError("invalid cursor")
+    out: List[Any] = []
+    for v, expected in zip(raw, types):
+        if expected is datetime:
+            if not (isinstance(v, dict) and set(v) == {"dt"} and isinstance(v["dt"], str)):
+                raise ValueError("invalid cursor")
+            try:
+                v = datetime.fromisoformat(v["dt"])
+            except ValueError as e:
+                raise ValueError("invalid cursor") from e
+        elif not isinstance(v, expected):
+            raise ValueError("invalid cursor")
+        out.append(v)
+    return out
@@ -1,11 +1,37 @@
+from typing import Sequence
+
+from app.utils.time import as_int64_array, numpy_for_batch
+
+SECONDS_PER_HOUR = 3600
+
+
 def cents_from_hourly_rate(rate_per_hour_cents: int, seconds: int) -> int:
     """
     Converte segundos trabalhados em centavos, usando rate por hora em centavos.
-    Arredonda pro inteiro mais próximo (você pode preferir floor).
+    Arredonda pro inteiro mais próximo, empate pro par (mesma regra do round()),
+    em aritmética inteira: o resultado não depende de erro de float.
     """
     if seconds <= 0:
         return 0
-    return int(round(rate_per_hour_cents * (seconds / 3600.0)))
+    q, r = divmod(rate_per_hour_cents * seconds, SECONDS_PER_HOUR)
+    if 2 * r > SECONDS_PER_HOUR or (2 * r == SECONDS_PER_HOUR and q % 2):
+        q += 1
+    return q
+
+
+def cents_from_hourly_rate_batch(rates_per_hour_cents: Sequence[int], seconds: Sequence[int]):
+    """
+    cents_from_hourly_rate elemento a elemento (mesmo resultado, bit a bit). Usa NumPy (int64) se houver.
+    Recebeu ndarray -> devolve ndarray; senão, list[int].
+    """
+    np = numpy_for_batch(len(seconds))
+    if np is not None:
+        secs = as_int64_array(seconds)
+        q, r = np.divmod(as_int64_array(rates_per_hour_cents) * secs, SECONDS_PER_HOUR)
+        q += (2 * r > SECONDS_PER_HOUR) | ((2 * r == SECONDS_PER_HOUR) & (q % 2 == 1))
+        out = np.where(secs > 0, q, 0)
+        return out if isinstance(seconds, np.ndarray) else out.tolist()
+    return [cents_from_hourly_rate(rate, sec) for rate, sec in zip(rates_per_hour_cents, seconds)]
 
 
 def safe_int(v, default: int = 0) -> int:
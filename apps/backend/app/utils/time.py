@@ -1,10 +1,21 @@
-from datetime import datetime, timezone, date
+from datetime import datetime, timezone, date, time, timedelta
+from functools import lru_cache
+from typing import Sequence
 try:
     from zoneinfo import ZoneInfo
     BR_TZ = ZoneInfo("America/Sao_Paulo")
 except Exception:
     BR_TZ = None
 
+# NumPy é opcional (acelera os cálculos em lote de relatórios/export) e só é importado
+# no primeiro lote grande: o import custa ~80 ms, que não entram no cold start da API.
+USE_NUMPY = True
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROS_PER_SECOND = 1_000_000
+# abaixo disso o custo de montar os arrays do NumPy não compensa
+NUMPY_MIN_BATCH = 512
+
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
@@ -23,5 +34,90 @@ def clamp_nonnegative_seconds(seconds: int) -> int:
 
 
 def seconds_between(started_at: datetime, ended_at: datetime) -> int:
-    delta = ended_at - started_at
-    return clamp_nonnegative_seconds(int(delta.total_seconds()))
+    # segundos inteiros (descarta a fração), em aritmética inteira; nunca negativo
+    return clamp_nonnegative_seconds((ended_at - started_at) // timedelta(seconds=1))
+
+
+def epoch_us(dt: datetime) -> int:
+    """Instante em microssegundos desde 1970-01-01 UTC (inteiro exato)."""
+    return (as_utc(dt) - EPOCH) // timedelta(microseconds=1)
+
+
+@lru_cache(maxsize=None)
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def numpy_for_batch(size: int):
+    """Módulo numpy se o lote compensa e o NumPy está disponível; senão None."""
+    if not USE_NUMPY or size < NUMPY_MIN_BATCH:
+        return None
+    return _import_numpy()
+
+
+def as_int64_array(values):
+    """Sequência de inteiros -> ndarray int64 (sem cópia se já for). Requer NumPy."""
+    np = _import_numpy()
+    if isinstance(values, np.ndarray):
+        return values.astype(np.int64, copy=False)
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+def seconds_between_batch(starts_us: Sequence[int], ends_us: Sequence[int]):
+    """
+    seconds_between elemento a elemento, com os instantes em epoch_us.
+    Mesmo resultado, bit a bit; usa NumPy (int64) se houver.
+    Recebeu ndarray -> devolve ndarray (dá pra encadear sem converter); senão, list[int].
+    """
+    np = numpy_for_batch(len(starts_us))
+    if np is not None:
+        delta = as_int64_array(ends_us) - as_int64_array(starts_us)
+        out = np.maximum(delta // MICROS_PER_SECOND, 0)
+        return out if isinstance(starts_us, np.ndarray) else out.tolist()
+    return [max(0, (e - s) // MICROS_PER_SECOND) for s, e in zip(starts_us, ends_us)]
+
+
+def as_utc(dt: datetime) -> datetime:
+    # SQLite devolve datetimes sem fuso; tudo que gravamos é UTC
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def br_day_start_utc(d: date) -> datetime:
+    # 00:00 do dia d no fuso BR, em UTC
+    tz = BR_TZ or timezone.utc
+    return datetime.combine(d, time(0), tzinfo=tz).astimezone(timezone.utc)
+
+
+def split_seconds_by_day_br(started_at: datetime, ended_at: datetime) -> list[tuple[date, int]]:
+    """
+    Quebra uma sessão em (dia no fuso BR, segundos), cortando na meia-noite local.
+    A soma dos pedaços é sempre igual a seconds_between(started_at, ended_at).
+    Sessão de duração zero (ou negativa) vira [(dia_do_inicio, 0)].
+    """
+    tz = BR_TZ or timezone.utc
+    start = as_utc(started_at)
+    end = as_utc(ended_at)
+
+    local_start = start.astimezone(tz)
+    if end <= start:
+        return [(local_start.date(), 0)]
+
+    out: list[tuple[date, int]] = []
+    day = local_start.date()
+    prev_whole = 0
+    while True:
+        next_midnight = datetime.combine(day + timedelta(days=1), time(0), tzinfo=tz)
+        cut = min(end, next_midnight.astimezone(timezone.utc))
+        # trunca pelo acumulado (e não por pedaço) pra soma bater com seconds_between
+        whole = (cut - start) // timedelta(seconds=1)
+        out.append((day, whole - prev_whole))
+        prev_whole = whole
+        if cut >= end:
+            return out
+        day = day + timedelta(days=1)
@@ -0,0 +1,24 @@
+"""
+Benchmarks/carga da API (fora do app; não é importado em produção). Dependência extra: httpx
+(bench/requirements.txt). Postgres local: infra/docker-compose.yml.
+
+    python -m bench seed --database-url sqlite:////tmp/bench.db --yes --users 20 --works 5 --entries 2000
+    python -m bench run --database-url sqlite:////tmp/bench.db --out result.json
+    python -m bench run ... --mode uvicorn --workers 2 --concurrency 50,200
+    python -m bench run ... --baseline baseline.json --max-regression 0.15   # exit 1 se regrediu
+    python -m bench compare result.json baseline.json
+    python -m bench micro --n 1000000 --min-speedup 10   # seconds/cents em lote vs escalar
+    python -m bench serialize --n 1000                   # página de entries/works: ORM+models vs tuplas+TypeAdapter
+    python -m bench startup --database-url sqlite:////tmp/bench.db   # import do app + primeira resposta (exit 1 se estourar a meta)
+    python -m bench summary --sizes 10000,100000,1000000  # get_summary agregado vs loop ORM: tempo e memória
+    python -m bench export --sizes 10000,100000,1000000   # pico de RSS do export (exit 1 se crescer com as linhas)
+    python -m bench streams --database-url sqlite:////tmp/bench.db --levels 100,1000,5000   # assinantes SSE: RSS e latência de /health
+    python -m bench partitions --database-url postgresql://.../bench --yes   # relatório de 1 mês com 1/5/10 anos de histórico
+
+seed e partitions apagam o schema (drop_all): exigem --database-url explícito e --yes.
+
+Com DATABASE_READ_URL (réplica, --profile replica no compose) cada resultado traz db_checkouts
+por pool: quanto da carga do cenário saiu do primário.
+
+DATABASE_URL é definido antes de importar o app (o Settings lê o ambiente no import).
+"""
@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+DEFAULT_CONCURRENCY = "50,200,1000"
+# metas de cold start (mediana), com folga sobre o medido num runner de CI comum
+DEFAULT_MAX_IMPORT_MS = 1500
+DEFAULT_MAX_FIRST_RESPONSE_MS = 2500
+
+
+def _setup_env(args: argparse.Namespace) -> None:
+    # precisa acontecer antes de qualquer import de app.* (Settings lê o ambiente no import)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    if "DATABASE_URL" not in os.environ:
+        raise SystemExit("informe --database-url ou DATABASE_URL")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    # sob carga todo request passaria do limite e o log viraria ruído na saída do bench
+    os.environ.setdefault("SLOW_REQUEST_MS", "60000")
+    # o bench mede o banco com poucos usuários martelando: o rate limit recusaria quase tudo
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+def _setup_destructive_env(args: argparse.Namespace) -> None:
+    # seed/partitions fazem drop_all: só num banco passado na linha de comando e confirmado,
+    # nunca no DATABASE_URL herdado do ambiente (que pode ser o de dev ou de produção)
+    from sqlalchemy.engine import make_url
+
+    if not args.database_url:
+        raise SystemExit(f"{args.command} apaga o banco: informe --database-url (não usa $DATABASE_URL)")
+    if not args.yes:
+        shown = make_url(args.database_url).render_as_string(hide_password=True)
+        raise SystemExit(f"{args.command} apaga e recria todas as tabelas de {shown}: confirme com --yes")
+    _setup_env(args)
+
+
+def cmd_seed(args: argparse.Namespace) -> int:
+    _setup_destructive_env(args)
+    from bench.seed import seed
+
+    counts = seed(
+        users=args.users,
+        works_per_user=args.works,
+        entries_per_work=args.entries,
+        days=args.days,
+        rng_seed=args.seed,
+    )
+    print(json.dumps(counts))
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    _setup_env(args)
+    from sqlalchemy.engine import make_url
+
+    from bench.report import compare
+    from bench.runner import run_scenarios
+    from bench.scenarios import SCENARIOS
+
+    scenarios = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"cenário desconhecido: {', '.join(unknown)}")
+    concurrency = [int(c) for c in args.concurrency.split(",")]
+
+    results = asyncio.run(
+        run_scenarios(
+            scenarios=scenarios,
+            concurrency=concurrency,
+            requests=args.requests,
+            mode=args.mode,
+            workers=args.workers,
+            max_users=args.max_users,
+            rng_seed=args.seed,
+            warmup=args.warmup,
+        )
+    )
+    report = {
+        "meta": {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "database": make_url(os.environ["DATABASE_URL"]).get_backend_name(),
+            "db_mode": os.environ.get("DB_MODE", "sync") or "sync",
+            "requests_per_scenario": args.requests,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline["results"], max_regression=args.max_regression)
+        for p in problems:
+            print(f"REGRESSÃO {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    from bench.report import compare
+
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problems = compare(current["results"], baseline["results"], max_regression=args.max_regression)
+    for p in problems:
+        print(f"REGRESSÃO {p}", file=sys.stderr)
+    if not problems:
+        print("sem regressão")
+    return 1 if problems else 0
+
+
+def cmd_micro(args: argparse.Namespace) -> int:
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    from bench.micro import run_micro
+
+    result = run_micro(n=args.n, repeat=args.repeat, rng_seed=args.seed)
+    print(json.dumps(result, indent=2))
+    if result["speedup"] < args.min_speedup:
+        print(f"REGRESSÃO batch só {result['speedup']}x mais rápido (mínimo {args.min_speedup}x)", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_serialize(args: argparse.Namespace) -> int:
+    # banco próprio em memória: não depende do seed
+    os.environ["DATABASE_URL"] = "sqlite://"
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    from bench.serialize import run_serialize
+
+    print(json.dumps(run_serialize(n=args.n, repeat=args.repeat, number=args.number), indent=2))
+    return 0
+
+
+def cmd_startup(args: argparse.Namespace) -> int:
+    _setup_env(args)
+    from bench.startup import run_startup
+
+    result = run_startup(runs=args.runs, top=args.top, app_target=args.app)
+    print(json.dumps(result, indent=2))
+    problems = []
+    if result["lazy_modules_loaded"]:
+        problems.append(f"importados no startup: {', '.join(result['lazy_modules_loaded'])}")
+    if result["import_ms"]["median"] > args.max_import_ms:
+        problems.append(f"import do app {result['import_ms']['median']} ms (máximo {args.max_import_ms} ms)")
+    if result["first_response_ms"]["median"] > args.max_first_response_ms:
+        problems.append(
+            f"primeira resposta {result['first_response_ms']['median']} ms (máximo {args.max_first_response_ms} ms)"
+        )
+    for p in problems:
+        print(f"REGRESSÃO {p}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def cmd_partitions(args: argparse.Namespace) -> int:
+    _setup_destructive_env(args)
+    from bench.partitions import run_partitions
+
+    result = run_partitions(
+        years=[int(y) for y in args.years.split(",")],
+        users=args.users,
+        works=args.works,
+        entries_per_day=args.entries_per_day,
+        repeat=args.repeat,
+        rng_seed=args.seed,
+    )
+    print(json.dumps(result, indent=2))
+    problems = [f"{op} {g}x mais lento com o histórico maior" for op, g in result["growth"].items() if g > args.max_growth]
+    for p in problems:
+        print(f"REGRESSÃO {p} (máximo {args.max_growth}x)", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    if args.database_url:
+        _setup_destructive_env(args)
+    else:
+        # banco próprio (arquivo temporário): pode apagar à vontade
+        args.database_url = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench-export.db")
+        _setup_env(args)
+    from bench.export import run_export
+
+    result = run_export(sizes=[int(n) for n in args.sizes.split(",")], fmt=args.format, rng_seed=args.seed)
+    print(json.dumps(result, indent=2))
+    if result["growth_spread_mb"] > args.max_growth_mb:
+        print(
+            f"REGRESSÃO pico de RSS do export cresce {result['growth_spread_mb']} MB com o número de linhas "
+            f"(máximo {args.max_growth_mb} MB)",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def cmd_summary(args: argparse.Namespace) -> int:
+    if args.database_url:
+        _setup_destructive_env(args)
+    else:
+        args.database_url = "sqlite:///" + os.path.join(tempfile.gettempdir(), "bench-summary.db")
+        _setup_env(args)
+    from bench.summary import run_summary
+
+    print(json.dumps(run_summary(sizes=[int(n) for n in args.sizes.split(",")], repeat=args.repeat, rng_seed=args.seed), indent=2))
+    return 0
+
+
+def cmd_streams(args: argparse.Namespace) -> int:
+    _setup_env(args)
+    from bench.streams import run_streams
+
+    result = asyncio.run(
+        run_streams(levels=[int(n) for n in args.levels.split(",")], health_samples=args.health_samples, rng_seed=args.seed)
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("seed", help="apaga e popula o banco de benchmark")
+    p.add_argument("--database-url", default=None, help="obrigatório (o banco é apagado)")
+    p.add_argument("--yes", action="store_true", help="confirma o drop_all do banco")
+    p.add_argument("--users", type=int, default=50)
+    p.add_argument("--works", type=int, default=5, help="works por usuário")
+    p.add_argument("--entries", type=int, default=500, help="entries fechadas por work")
+    p.add_argument("--days", type=int, default=365, help="janela de histórico")
+    p.add_argument("--seed", type=int, default=42)
+    p.set_defaults(func=cmd_seed)
+
+    p = sub.add_parser("run", help="roda os cenários e grava o JSON")
+    p.add_argument("--database-url", default=None, help="default: $DATABASE_URL")
+    p.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    p.add_argument("--workers", type=int, default=1, help="workers do uvicorn (--mode uvicorn)")
+    p.add_argument("--scenarios", default=None, help="separados por vírgula (default: todos)")
+    p.add_argument("--concurrency", default=DEFAULT_CONCURRENCY, help="níveis separados por vírgula")
+    p.add_argument("--requests", type=int, default=2000, help="requests por cenário e nível")
+    p.add_argument("--warmup", type=int, default=50, help="requests de aquecimento (não medidos)")
+    p.add_argument("--max-users", type=int, default=50, help="usuários semeados usados nos cenários")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", default=None, help="arquivo JSON (default: stdout)")
+    p.add_argument("--baseline", default=None, help="JSON de um run anterior pra comparar")
+    p.add_argument("--max-regression", type=float, default=0.15, help="tolerância (0.15 = 15%%)")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("compare", help="compara dois JSONs de run")
+    p.add_argument("current")
+    p.add_argument("baseline")
+    p.add_argument("--max-regression", type=float, default=0.15)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("micro", help="speedup de seconds/cents em lote vs escalar (igualdade: tests/test_batch_math.py)")
+    p.add_argument("--n", type=int, default=1_000_000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--min-speedup", type=float, default=10.0)
+    p.set_defaults(func=cmd_micro)
+
+    p = sub.add_parser("serialize", help="leitura+serialização de 1 página: ORM/models vs tuplas/TypeAdapter")
+    p.add_argument("--n", type=int, default=1000, help="itens por página")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--number", type=int, default=20)
+    p.set_defaults(func=cmd_serialize)
+
+    p = sub.add_parser("startup", help="cold start: -X importtime do app e tempo até o primeiro 200 do uvicorn")
+    p.add_argument("--database-url", default=None, help="default: $DATABASE_URL")
+    p.add_argument("--app", default="app.api.main:app", help="alvo do uvicorn (…:create_app usa --factory)")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--top", type=int, default=15, help="quantos pacotes/módulos listar no perfil")
+    p.add_argument("--max-import-ms", type=float, default=DEFAULT_MAX_IMPORT_MS)
+    p.add_argument("--max-first-response-ms", type=float, default=DEFAULT_MAX_FIRST_RESPONSE_MS)
+    p.set_defaults(func=cmd_startup)
+
+    p = sub.add_parser("partitions", help="relatório de 1 mês com histórico de 1, 5 e 10 anos (apaga o banco)")
+    p.add_argument("--database-url", default=None, help="obrigatório (o banco é apagado)")
+    p.add_argument("--yes", action="store_true", help="confirma o drop_all do banco")
+    p.add_argument("--years", default="1,5,10", help="tamanhos do histórico, separados por vírgula")
+    p.add_argument("--users", type=int, default=5)
+    p.add_argument("--works", type=int, default=2, help="works por usuário")
+    p.add_argument("--entries-per-day", type=int, default=4, help="entries por work e dia")
+    p.add_argument("--repeat", type=int, default=30, help="medições por operação e tamanho")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--max-growth", type=float, default=1.5, help="mediana do maior / do menor histórico")
+    p.set_defaults(func=cmd_partitions)
+
+    p = sub.add_parser("summary", help="get_summary agregado vs loop ORM antigo: tempo e memória com 10k, 100k e 1M entries")
+    p.add_argument("--database-url", default=None, help="default: SQLite temporário; com URL, o banco é apagado")
+    p.add_argument("--yes", action="store_true", help="confirma o drop_all do --database-url")
+    p.add_argument("--sizes", default="10000,100000,1000000", help="entries no range, separadas por vírgula")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--seed", type=int, default=42)
+    p.set_defaults(func=cmd_summary)
+
+    p = sub.add_parser("export", help="pico de RSS do export de entries com 10k, 100k e 1M linhas (exit 1 se crescer)")
+    p.add_argument("--database-url", default=None, help="default: SQLite temporário; com URL, o banco é apagado")
+    p.add_argument("--yes", action="store_true", help="confirma o drop_all do --database-url")
+    p.add_argument("--sizes", default="10000,100000,1000000", help="linhas exportadas, separadas por vírgula")
+    p.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--max-growth-mb", type=float, default=16.0, help="crescimento do maior tamanho além do menor")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("streams", help="N assinantes SSE parados num worker do uvicorn: RSS e latência de /health")
+    p.add_argument("--database-url", default=None, help="default: $DATABASE_URL (banco semeado)")
+    p.add_argument("--levels", default="100,1000,5000", help="conexões abertas, separadas por vírgula (cumulativo)")
+    p.add_argument("--health-samples", type=int, default=200, help="GET /health medidos por nível")
+    p.add_argument("--seed", type=int, default=42)
+    p.set_defaults(func=cmd_streams)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Pico de memória do export de entries (/reports/entries/export) conforme o número de linhas
+cresce (10k -> 100k -> 1M por padrão).
+
+O banco recebe o maior tamanho uma vez (um usuário, entries espalhadas pelo ano) e cada tamanho
+exporta um range de dias com ~N linhas num subprocesso novo, pelo mesmo iter_entries_export que
+a rota faz streaming. O crescimento medido é o pico de RSS (ru_maxrss) depois do export menos o
+de antes (com o processo já aquecido por um export pequeno). Com cursor do lado do servidor ele
+não depende de N.
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+
+from bench.runner import BACKEND_DIR
+
+DAYS = 365
+WORKS = 10
+
+_PROBE = """
+import json, resource, sys
+from app.db.session import SessionLocal
+from app.services.reports_service import iter_entries_export
+
+args = json.loads(sys.argv[1])
+# ru_maxrss: KiB no Linux, bytes no macOS
+scale = 1 if sys.platform == "darwin" else 1024
+
+def peak():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+with SessionLocal() as db:
+    # aquece imports, conexão e compilação da query com um dia só
+    for _ in iter_entries_export(db, user_id=args["user_id"], date_from=args["date_from"], date_to=args["date_from"], fmt=args["fmt"]):
+        pass
+    before = peak()
+    lines = size = 0
+    for chunk in iter_entries_export(db, user_id=args["user_id"], date_from=args["date_from"], date_to=args["date_to"], fmt=args["fmt"]):
+        lines += chunk.count("\\n")
+        size += len(chunk)
+    after = peak()
+print(json.dumps({"lines": lines, "bytes": size, "peak_before": before, "peak_after": after}))
+"""
+
+
+def _measure(*, user_id: str, date_from: date, date_to: date, fmt: str) -> dict:
+    args = {"user_id": user_id, "date_from": date_from.isoformat(), "date_to": date_to.isoformat(), "fmt": fmt}
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps(args)],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_export(*, sizes: list[int], fmt: str, rng_seed: int) -> dict:
+    from app.db.models import User
+    from app.db.session import SessionLocal
+    from bench.seed import seed
+
+    sizes = sorted(sizes)
+    total = seed(users=1, works_per_user=WORKS, entries_per_work=math.ceil(sizes[-1] / WORKS), days=DAYS, rng_seed=rng_seed)["entries"]
+    with SessionLocal() as db:
+        user_id = db.query(User.id).scalar()
+    first_day = date.today() - timedelta(days=DAYS)
+
+    results = {}
+    for n in sizes:
+        # entries uniformes na janela: o range proporcional a N traz ~N linhas
+        days = max(1, math.ceil(DAYS * n / total))
+        m = _measure(user_id=user_id, date_from=first_day, date_to=first_day + timedelta(days=days - 1), fmt=fmt)
+        results[str(n)] = {
+            "rows": m["lines"] - (1 if fmt == "csv" else 0),
+            "mb_exported": round(m["bytes"] / 2**20, 1),
+            "peak_rss_mb": round(m["peak_after"] / 2**20, 1),
+            "rss_growth_mb": round((m["peak_after"] - m["peak_before"]) / 2**20, 1),
+        }
+
+    growth = [r["rss_growth_mb"] for r in results.values()]
+    return {"format": fmt, "entries": total, "results": results, "growth_spread_mb": round(max(growth) - min(growth), 1)}
@@ -0,0 +1,70 @@
+"""
+Microbenchmark de utils.time.seconds_between_batch / utils.money.cents_from_hourly_rate_batch
+contra as versões escalares (um timedelta + um float por linha, como nos loops dos services).
+Só mede o speedup: a igualdade bit a bit é conferida em tests/test_batch_math.py.
+"""
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _make_data(n: int, rng_seed: int):
+    from app.utils.time import epoch_us
+
+    rng = random.Random(rng_seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    starts, ends, rates = [], [], []
+    for _ in range(n):
+        s = base + timedelta(microseconds=rng.randint(0, 365 * 86400 * 10**6))
+        starts.append(s)
+        ends.append(s + timedelta(microseconds=rng.randint(-10**6, 8 * 3600 * 10**6)))
+        rates.append(rng.choice((2500, 3500, 5000, 8000, rng.randint(1, 100_000))))
+    starts_us = [epoch_us(s) for s in starts]
+    ends_us = [epoch_us(e) for e in ends]
+    return starts, ends, starts_us, ends_us, rates
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_micro(*, n: int, repeat: int, rng_seed: int) -> dict:
+    from app.utils import time as time_utils
+    from app.utils.money import cents_from_hourly_rate, cents_from_hourly_rate_batch
+    from app.utils.time import seconds_between, seconds_between_batch
+
+    starts, ends, starts_us, ends_us, rates = _make_data(n, rng_seed)
+
+    def scalar():
+        secs = [seconds_between(s, e) for s, e in zip(starts, ends)]
+        return secs, [cents_from_hourly_rate(r, sec) for r, sec in zip(rates, secs)]
+
+    def batch():
+        if time_utils.numpy_for_batch(len(starts_us)) is None:
+            secs = seconds_between_batch(starts_us, ends_us)
+            return secs, cents_from_hourly_rate_batch(rates, secs)
+        # arrays de ponta a ponta: converte as listas uma vez e só volta pra list[int] no fim
+        as_array = time_utils.as_int64_array
+        secs = seconds_between_batch(as_array(starts_us), as_array(ends_us))
+        return secs.tolist(), cents_from_hourly_rate_batch(as_array(rates), secs).tolist()
+
+    result = {
+        "n": n,
+        "numpy": time_utils.numpy_for_batch(n) is not None,
+        "scalar_seconds": round(_best_of(scalar, repeat), 4),
+        "batch_seconds": round(_best_of(batch, repeat), 4),
+    }
+    result["speedup"] = round(result["scalar_seconds"] / result["batch_seconds"], 1)
+
+    # fallback puro Python (sem NumPy)
+    time_utils.USE_NUMPY = False
+    try:
+        result["pure_python_batch_seconds"] = round(_best_of(batch, repeat), 4)
+    finally:
+        time_utils.USE_NUMPY = True
+    return result
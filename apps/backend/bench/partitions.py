@@ -0,0 +1,177 @@
+"""
+Relatório de um mês conforme o histórico cresce (1 -> 5 -> 10 anos por padrão).
+
+Com time_entries particionada por mês (Postgres), o export do mês lê uma partição só e
+summary/timeseries leem o rollup do range: a latência tem que ficar estável com o histórico.
+No Postgres também mostra quantas partições o plano do export toca.
+Apaga e recria o schema, como o seed: aponte sempre pra um banco só de benchmark (--database-url e --yes).
+"""
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+INSERT_BATCH_SIZE = 5000
+DAYS_PER_YEAR = 365
+OPS = ("summary", "timeseries", "export")
+
+
+def _entries_for_days(work_ids: list[str], first: date, last: date, per_day: int, rng: random.Random) -> list[dict]:
+    """per_day sessões por work em cada dia de [first, last), sem sobreposição."""
+    rows = []
+    slot = 86400 // per_day
+    d = first
+    while d < last:
+        base = datetime.combine(d, datetime.min.time(), tzinfo=timezone.utc)
+        for work_id in work_ids:
+            for i in range(per_day):
+                start = base + timedelta(seconds=i * slot + rng.randint(0, slot // 4))
+                length = rng.randint(600, slot // 2)
+                rows.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "work_id": work_id,
+                        "started_at": start,
+                        "ended_at": start + timedelta(seconds=length),
+                        "note": None,
+                    }
+                )
+        d += timedelta(days=1)
+    return rows
+
+
+def _export_partitions_scanned(db, stmt) -> int | None:
+    """Partições de time_entries no plano do export (só Postgres)."""
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+    compiled = stmt.compile(dialect=dialect)
+    plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    names = set()
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Relation Name", "").startswith("time_entries"):
+            names.add(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return len(names)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_partitions(*, years: list[int], users: int, works: int, entries_per_day: int, repeat: int, rng_seed: int) -> dict:
+    from sqlalchemy import insert, text
+
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.db.models import TimeEntry, User, Work
+    from app.db.session import SessionLocal, engine
+    from app.services.partition_service import add_months, ensure_partitions, month_of
+    from app.services.reports_service import _export_stmt, get_summary, get_timeseries, iter_entries_export
+    from app.services.rollup_service import rebuild_daily_totals
+
+    years = sorted(years)
+    rng = random.Random(rng_seed)
+    # histórico termina no fim do mês passado; o relatório medido é desse mês
+    month = add_months(month_of(datetime.now(timezone.utc)), -1)
+    history_end = add_months(month, 1)
+    month_from, month_to = month.isoformat(), (history_end - timedelta(days=1)).isoformat()
+    oldest = history_end - timedelta(days=years[-1] * DAYS_PER_YEAR)
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    user_ids, work_ids = [], []
+    with SessionLocal() as db:
+        ensure_partitions(db, since=oldest)
+        password_hash = hash_password("bench-password")
+        for u in range(users):
+            user_id = str(uuid.uuid4())
+            user_ids.append(user_id)
+            db.execute(insert(User), [{"id": user_id, "email": f"hist{u}@example.com", "password_hash": password_hash, "name": f"Hist {u}"}])
+            for w in range(works):
+                work_id = str(uuid.uuid4())
+                work_ids.append(work_id)
+                db.execute(
+                    insert(Work),
+                    [
+                        {
+                            "id": work_id,
+                            "user_id": user_id,
+                            "title": f"Work {w}",
+                            "sprint_name": f"Sprint {w % 3}",
+                            "start_date": oldest.isoformat(),
+                            "end_date": (history_end + timedelta(days=365)).isoformat(),
+                            "hourly_rate_cents": rng.choice((2500, 5000)),
+                            "currency": "BRL",
+                        }
+                    ],
+                )
+        db.commit()
+
+    def measure(op: str, user_id: str) -> float:
+        params = dict(user_id=user_id, date_from=month_from, date_to=month_to)
+        t0 = time.perf_counter()
+        with SessionLocal() as db:
+            if op == "summary":
+                get_summary(db, **params)
+            elif op == "timeseries":
+                get_timeseries(db, **params, group_by=["day", "work"])
+            else:
+                for _ in iter_entries_export(db, **params, fmt="csv"):
+                    pass
+        return (time.perf_counter() - t0) * 1000
+
+    results: dict = {op: {} for op in OPS}
+    entries: dict = {}
+    partitions_scanned: dict = {}
+    loaded_years = 0
+    total = 0
+    for size in years:
+        # só a fatia mais antiga que falta: o mês medido é o mesmo em todos os tamanhos
+        first = history_end - timedelta(days=size * DAYS_PER_YEAR)
+        last = history_end - timedelta(days=loaded_years * DAYS_PER_YEAR)
+        rows = _entries_for_days(work_ids, first, last, entries_per_day, rng)
+        with SessionLocal() as db:
+            for i in range(0, len(rows), INSERT_BATCH_SIZE):
+                db.execute(insert(TimeEntry), rows[i : i + INSERT_BATCH_SIZE])
+            rebuild_daily_totals(db)
+            db.commit()
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("ANALYZE time_entries"))
+                db.execute(text("ANALYZE work_daily_totals"))
+                db.commit()
+            partitions_scanned[f"{size}y"] = _export_partitions_scanned(
+                db, _export_stmt(user_id=user_ids[0], date_from=month_from, date_to=month_to)
+            )
+        total += len(rows)
+        loaded_years = size
+        entries[f"{size}y"] = total
+
+        for op in OPS:
+            measure(op, user_ids[0])  # aquece cache/planner
+            samples = [measure(op, user_ids[i % len(user_ids)]) for i in range(repeat)]
+            results[op][f"{size}y"] = {
+                "median_ms": round(statistics.median(samples), 2),
+                "p95_ms": round(_percentile(samples, 0.95), 2),
+            }
+
+    first_key, last_key = f"{years[0]}y", f"{years[-1]}y"
+    growth = {
+        op: round(results[op][last_key]["median_ms"] / max(results[op][first_key]["median_ms"], 1e-6), 2) for op in OPS
+    }
+    return {
+        "month": month_from[:7],
+        "entries": entries,
+        "export_partitions_scanned": partitions_scanned,
+        "results": results,
+        "growth": growth,
+    }
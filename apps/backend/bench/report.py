@@ -0,0 +1,53 @@
+"""Resumo das amostras (throughput/percentis) e comparação com um baseline salvo."""
+import math
+from typing import Dict, List
+
+from bench.scenarios import Samples
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    # nearest-rank, sem interpolação
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples: Samples, expected_statuses: set) -> dict:
+    lat = sorted(samples.latencies)
+    n = len(lat)
+    errors = sum(c for s, c in samples.statuses.items() if s not in expected_statuses)
+    out = {
+        "requests": n,
+        "errors": errors,
+        "statuses": {str(s): c for s, c in sorted(samples.statuses.items())},
+        "wall_seconds": round(samples.wall_seconds, 4),
+        "throughput_rps": round(n / samples.wall_seconds, 2) if samples.wall_seconds else 0.0,
+        "latency_ms": {f"p{p}": round(percentile(lat, p) * 1000, 3) for p in PERCENTILES},
+    }
+    out["latency_ms"]["max"] = round(lat[-1] * 1000, 3) if lat else 0.0
+    out["latency_ms"]["mean"] = round(sum(lat) / n * 1000, 3) if n else 0.0
+    return out
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], *, max_regression: float) -> List[str]:
+    """
+    Regressões de `current` contra `baseline` (mesmas chaves de cenário).
+    Falha se p99 subir ou throughput cair mais que max_regression (0.15 = 15%), ou se surgirem erros.
+    """
+    problems: List[str] = []
+    for key, base in baseline.items():
+        cur = current.get(key)
+        if cur is None:
+            continue
+        base_p99, cur_p99 = base["latency_ms"]["p99"], cur["latency_ms"]["p99"]
+        if base_p99 > 0 and cur_p99 > base_p99 * (1 + max_regression):
+            problems.append(f"{key}: p99 {cur_p99:.1f}ms > baseline {base_p99:.1f}ms (+{cur_p99 / base_p99 - 1:.0%})")
+        base_rps, cur_rps = base["throughput_rps"], cur["throughput_rps"]
+        if base_rps > 0 and cur_rps < base_rps * (1 - max_regression):
+            problems.append(f"{key}: throughput {cur_rps:.0f} rps < baseline {base_rps:.0f} rps ({cur_rps / base_rps - 1:.0%})")
+        if cur["errors"] > base.get("errors", 0):
+            problems.append(f"{key}: {cur['errors']} erros (baseline {base.get('errors', 0)})")
+    return problems
@@ -0,0 +1,131 @@
+"""Monta o client (app in-process via ASGI ou uvicorn num subprocesso) e roda os cenários."""
+import asyncio
+import contextlib
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+import httpx
+
+from bench.report import summarize
+from bench.scenarios import EXPECTED_STATUSES, SCENARIOS, BenchContext
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+UVICORN_STARTUP_TIMEOUT_SECONDS = 30
+REQUEST_TIMEOUT_SECONDS = 60
+
+
+def load_context(*, max_users: int, rng_seed: int) -> BenchContext:
+    from app.core.security import create_access_token
+    from app.db.models import User, Work
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        users = db.query(User.id).order_by(User.email).limit(max_users).all()
+        if not users:
+            raise SystemExit("banco vazio: rode `python -m bench seed` antes")
+        ids = [u.id for u in users]
+        works: Dict[str, list] = {i: [] for i in ids}
+        for w_id, u_id in db.query(Work.id, Work.user_id).filter(Work.user_id.in_(ids)).order_by(Work.id):
+            works[u_id].append(w_id)
+    # token gerado aqui: os cenários não pagam argon2 (só o login_burst)
+    return BenchContext(
+        users={u: (create_access_token(subject=u), ws) for u, ws in works.items() if ws},
+        rng=random.Random(rng_seed),
+    )
+
+
+@contextlib.asynccontextmanager
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    from app.api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=REQUEST_TIMEOUT_SECONDS) as client:
+        yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(concurrency: int, *, workers: int) -> AsyncIterator[httpx.AsyncClient]:
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.api.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=os.environ.copy())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=REQUEST_TIMEOUT_SECONDS
+        ) as client:
+            deadline = time.monotonic() + UVICORN_STARTUP_TIMEOUT_SECONDS
+            while True:
+                if proc.poll() is not None:
+                    raise SystemExit(f"uvicorn saiu com código {proc.returncode}")
+                with contextlib.suppress(httpx.TransportError):
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                if time.monotonic() > deadline:
+                    raise SystemExit("uvicorn não subiu a tempo")
+                await asyncio.sleep(0.2)
+            yield client
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def _pool_checkouts(client: httpx.AsyncClient) -> Dict[str, int]:
+    # com --workers > 1 o /health/pool responde por um worker só
+    resp = await client.get("/health/pool")
+    return {name: p["checkouts"] for name, p in resp.json().items()}
+
+
+async def run_scenarios(
+    *,
+    scenarios: List[str],
+    concurrency: List[int],
+    requests: int,
+    mode: str,
+    workers: int,
+    max_users: int,
+    rng_seed: int,
+    warmup: int,
+) -> Dict[str, dict]:
+    """Resultado por chave "<cenário>@c<concorrência>"."""
+    ctx = load_context(max_users=max_users, rng_seed=rng_seed)
+    results: Dict[str, dict] = {}
+    for c in concurrency:
+        client_cm = asgi_client() if mode == "asgi" else uvicorn_client(c, workers=workers)
+        async with client_cm as client:
+            for name in scenarios:
+                fn = SCENARIOS[name]
+                if warmup:
+                    await fn(client, ctx, concurrency=min(c, warmup), requests=warmup)
+                before = await _pool_checkouts(client)
+                samples = await fn(client, ctx, concurrency=c, requests=requests)
+                key = f"{name}@c{c}"
+                results[key] = summarize(samples, EXPECTED_STATUSES[name])
+                # conexões pegas em cada pool (primary/replica) durante o cenário
+                after = await _pool_checkouts(client)
+                results[key]["db_checkouts"] = {p: n - before.get(p, 0) for p, n in after.items()}
+                print(
+                    f"{key:<28} {results[key]['throughput_rps']:>9.1f} rps  "
+                    f"p50={results[key]['latency_ms']['p50']:.1f}ms p99={results[key]['latency_ms']['p99']:.1f}ms "
+                    f"errors={results[key]['errors']}",
+                    file=sys.stderr,
+                )
+    return results
@@ -0,0 +1,142 @@
+"""
+Cenários de carga. Cada um recebe o client HTTP (ASGI ou uvicorn), o contexto com os
+dados semeados e a concorrência, e devolve as amostras (latência, status) de cada request.
+"""
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from bench.seed import BENCH_EMAIL, BENCH_PASSWORD
+
+
+@dataclass
+class BenchContext:
+    # user_id -> (token, [work_ids])
+    users: Dict[str, tuple]
+    rng: random.Random
+
+    def random_user(self) -> tuple:
+        user_id = self.rng.choice(list(self.users))
+        return (user_id, *self.users[user_id])
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    def add(self, seconds: float, status: int) -> None:
+        self.latencies.append(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+RequestFn = Callable[[int], Awaitable[int]]
+
+
+async def run_load(make_request: RequestFn, *, concurrency: int, requests: int) -> Samples:
+    """`concurrency` workers consumindo `requests` chamadas; make_request(i) devolve o status HTTP."""
+    samples = Samples()
+    counter = itertools.count()
+
+    async def worker() -> None:
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            t0 = time.perf_counter()
+            try:
+                status = await make_request(i)
+            except Exception:
+                status = 0  # erro de transporte (timeout, conexão recusada)
+            samples.add(time.perf_counter() - t0, status)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    samples.wall_seconds = time.perf_counter() - t0
+    return samples
+
+
+async def poll_storm(client, ctx: BenchContext, *, concurrency: int, requests: int) -> Samples:
+    """Vários clientes fazendo polling de GET /works/{id}/timer (metade com If-None-Match)."""
+    etags: Dict[str, str] = {}
+
+    async def req(i: int) -> int:
+        _, token, work_ids = ctx.random_user()
+        work_id = ctx.rng.choice(work_ids)
+        headers = {"Authorization": f"Bearer {token}"}
+        if i % 2 and work_id in etags:
+            headers["If-None-Match"] = etags[work_id]
+        r = await client.get(f"/works/{work_id}/timer", headers=headers)
+        if "etag" in r.headers:
+            etags[work_id] = r.headers["etag"]
+        return r.status_code
+
+    return await run_load(req, concurrency=concurrency, requests=requests)
+
+
+async def start_stop_churn(client, ctx: BenchContext, *, concurrency: int, requests: int) -> Samples:
+    """Start/stop alternados; cada worker fica num work fixo pra não brigar pelo mesmo timer."""
+    pairs = [(token, w) for _, (token, work_ids) in ctx.users.items() for w in work_ids]
+    ctx.rng.shuffle(pairs)
+
+    async def req(i: int) -> int:
+        token, work_id = pairs[i % min(concurrency, len(pairs))]
+        action = "start" if (i // min(concurrency, len(pairs))) % 2 == 0 else "stop"
+        r = await client.post(f"/works/{work_id}/timer/{action}", headers={"Authorization": f"Bearer {token}"})
+        return r.status_code
+
+    samples = await run_load(req, concurrency=concurrency, requests=requests)
+    # não deixa timer aberto pro próximo cenário
+    for token, work_id in pairs[: min(concurrency, len(pairs))]:
+        await client.post(f"/works/{work_id}/timer/stop", headers={"Authorization": f"Bearer {token}"})
+    return samples
+
+
+async def monthly_report(client, ctx: BenchContext, *, concurrency: int, requests: int) -> Samples:
+    """Dashboard do mês: /reports/summary e /reports/timeseries diário, alternados, sem cache de ETag."""
+    date_to = date.today()
+    date_from = date_to - timedelta(days=30)
+    params = {"date_from": date_from.isoformat(), "date_to": date_to.isoformat()}
+
+    async def req(i: int) -> int:
+        _, token, _ = ctx.random_user()
+        headers = {"Authorization": f"Bearer {token}"}
+        if i % 2:
+            r = await client.get("/reports/timeseries", params={**params, "group_by": "day"}, headers=headers)
+        else:
+            r = await client.get("/reports/summary", params=params, headers=headers)
+        return r.status_code
+
+    return await run_load(req, concurrency=concurrency, requests=requests)
+
+
+async def login_burst(client, ctx: BenchContext, *, concurrency: int, requests: int) -> Samples:
+    """Rajada de POST /auth/login (argon2); 503 = pool de hashing cheio, conta como rejeitado."""
+    n_users = len(ctx.users)
+
+    async def req(i: int) -> int:
+        payload = {"email": BENCH_EMAIL.format(i % n_users), "password": BENCH_PASSWORD}
+        r = await client.post("/auth/login", json=payload)
+        return r.status_code
+
+    return await run_load(req, concurrency=concurrency, requests=requests)
+
+
+SCENARIOS = {
+    "poll_storm": poll_storm,
+    "start_stop_churn": start_stop_churn,
+    "monthly_report": monthly_report,
+    "login_burst": login_burst,
+}
+# status esperados por cenário (o resto conta como erro)
+EXPECTED_STATUSES = {
+    "poll_storm": {200, 304},
+    "start_stop_churn": {200},
+    "monthly_report": {200},
+    "login_burst": {200, 503},
+}
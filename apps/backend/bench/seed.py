@@ -0,0 +1,82 @@
+"""
+Popula o banco de benchmark com usuários, works e entries fechadas (determinístico por --seed).
+Apaga e recria o schema: aponte sempre pra um banco só de benchmark (o CLI exige --database-url e --yes).
+"""
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL = "bench{}@example.com"
+INSERT_BATCH_SIZE = 5000
+
+
+def seed(*, users: int, works_per_user: int, entries_per_work: int, days: int, rng_seed: int) -> dict:
+    from sqlalchemy import insert
+
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.db.models import TimeEntry, User, Work
+    from app.db.session import SessionLocal, engine
+    from app.services.partition_service import ensure_partitions
+    from app.services.reconcile_service import find_total_drift, repair_total_drift
+    from app.services.rollup_service import rebuild_daily_totals
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    rng = random.Random(rng_seed)
+    # argon2 é caro: um hash só, repetido em todos os usuários
+    password_hash = hash_password(BENCH_PASSWORD)
+    today = date.today()
+    first_day = today - timedelta(days=days)
+    span_seconds = days * 86400
+
+    user_rows, work_rows = [], []
+    for u in range(users):
+        user_id = str(uuid.uuid4())
+        user_rows.append({"id": user_id, "email": BENCH_EMAIL.format(u), "password_hash": password_hash, "name": f"Bench {u}"})
+        for w in range(works_per_user):
+            work_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "title": f"Work {w}",
+                    "sprint_name": f"Sprint {w % 3}",
+                    "start_date": first_day.isoformat(),
+                    # longe no futuro: start/stop nunca cai em EXPIRED durante o bench
+                    "end_date": (today + timedelta(days=365)).isoformat(),
+                    "hourly_rate_cents": rng.choice((2500, 3500, 5000, 8000)),
+                    "currency": "BRL",
+                }
+            )
+
+    def entry_rows():
+        # sessões sem sobreposição, espalhadas pela janela (algumas atravessam a meia-noite);
+        # geradas sob demanda: com milhões de entries a lista inteira não cabe na memória
+        slot = span_seconds // max(entries_per_work, 1)
+        base = datetime.combine(first_day, datetime.min.time(), tzinfo=timezone.utc)
+        for work in work_rows:
+            for i in range(entries_per_work):
+                start = base + timedelta(seconds=i * slot + rng.randint(0, max(slot // 2, 1)))
+                length = rng.randint(300, max(min(slot // 2, 4 * 3600), 301))
+                yield {
+                    "id": str(uuid.uuid4()),
+                    "work_id": work["id"],
+                    "started_at": start,
+                    "ended_at": start + timedelta(seconds=length),
+                    "note": None,
+                }
+
+    with SessionLocal() as db:
+        # Postgres: create_all só cria a tabela mãe de time_entries
+        ensure_partitions(db, since=first_day)
+        for table, rows in ((User, iter(user_rows)), (Work, iter(work_rows)), (TimeEntry, entry_rows())):
+            while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+                db.execute(insert(table), batch)
+        rebuild_daily_totals(db)
+        repair_total_drift(db, find_total_drift(db))
+        db.commit()
+
+    return {"users": len(user_rows), "works": len(work_rows), "entries": len(work_rows) * entries_per_work}
@@ -0,0 +1,140 @@
+"""
+Custo de leitura + serialização de uma página de entries/works, antes e depois do caminho
+rápido: ORM + model por linha + validação do response_model (FastAPI) vs colunas em tuplas
++ TypeAdapter.dump_json. Confere que os bytes saem iguais.
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+def _best_per_call(fn, *, repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def _route(path: str):
+    from app.api.main import app
+
+    return next(r for r in app.routes if getattr(r, "path", None) == path and "GET" in r.methods)
+
+
+def _fastapi_render(route, content) -> bytes:
+    # o que o FastAPI faz com o retorno da rota quando não é um Response
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    async def go():
+        return await serialize_response(field=route.response_field, response_content=content)
+
+    return JSONResponse(asyncio.run(go())).body
+
+
+def _seed(db, n: int):
+    from app.db.models import TimeEntry, User, Work
+
+    user = User(email="serialize@example.com", password_hash="x", name="S")
+    db.add(user)
+    db.flush()
+    for i in range(n):
+        db.add(
+            Work(
+                user_id=user.id, title=f"Work {i}", sprint_name="Sprint", start_date=f"2025-01-{1 + i % 28:02d}",
+                end_date="2030-01-01", hourly_rate_cents=3500, currency="BRL",
+            )
+        )
+    db.flush()
+    work = db.query(Work).filter(Work.user_id == user.id).first()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        start = base + timedelta(hours=i)
+        db.add(TimeEntry(id=str(uuid.uuid4()), work_id=work.id, started_at=start, ended_at=start + timedelta(minutes=37)))
+    db.commit()
+    return user.id, work.id
+
+
+def run_serialize(*, n: int, repeat: int, number: int) -> dict:
+    from app.api.serialization import json_response
+    from app.db.base import Base
+    from app.db.models import TimeEntry, Work
+    from app.db.session import SessionLocal, engine
+    from app.schemas.timer import TimeEntriesResponse, TimeEntryItem, time_entries_page_adapter
+    from app.schemas.work import WorkListItem, WorksListResponse, works_page_adapter
+    from app.services.timer_service import list_entries
+    from app.services.work_service import list_works
+    from app.utils.time import seconds_between
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user_id, work_id = _seed(db, n)
+    entries_route = _route("/works/{work_id}/entries")
+    works_route = _route("/works")
+
+    # --- antes: ORM hidratado, dict, model por linha, validação de novo no response_model
+    def entries_before() -> bytes:
+        db.expunge_all()
+        rows = (
+            db.query(TimeEntry)
+            .filter(TimeEntry.work_id == work_id, TimeEntry.deleted_at.is_(None))
+            .order_by(TimeEntry.started_at.desc(), TimeEntry.id.desc())
+            .limit(n)
+            .all()
+        )
+        items = [
+            {
+                "id": e.id,
+                "started_at": e.started_at,
+                "ended_at": e.ended_at,
+                "duration_seconds": seconds_between(e.started_at, e.ended_at) if e.ended_at is not None else 0,
+            }
+            for e in rows
+        ]
+        return _fastapi_render(entries_route, TimeEntriesResponse(items=[TimeEntryItem(**x) for x in items], next_cursor=None))
+
+    def works_before() -> bytes:
+        db.expunge_all()
+        rows = db.query(Work).filter(Work.user_id == user_id).order_by(Work.start_date.desc(), Work.id.desc()).limit(n).all()
+        return _fastapi_render(
+            works_route,
+            WorksListResponse(
+                items=[
+                    WorkListItem(id=w.id, title=w.title, sprint_name=w.sprint_name, hourly_rate_cents=w.hourly_rate_cents, currency=w.currency)
+                    for w in rows
+                ],
+                next_cursor=None,
+            ),
+        )
+
+    # --- depois: services atuais (tuplas) + uma serialização só
+    def entries_after() -> bytes:
+        items, _ = list_entries(db, work_id=work_id, user_id=user_id, limit=n)
+        return json_response(time_entries_page_adapter, {"items": items, "next_cursor": None}).body
+
+    def works_after() -> bytes:
+        items, _ = list_works(db, user_id=user_id, limit=n)
+        return json_response(works_page_adapter, {"items": items, "next_cursor": None}).body
+
+    result = {"items": n}
+    for name, before, after in (("entries", entries_before, entries_after), ("works", works_before, works_after)):
+        if before() != after():
+            raise AssertionError(f"{name}: bytes diferentes antes/depois")
+        b = _best_per_call(before, repeat=repeat, number=number)
+        a = _best_per_call(after, repeat=repeat, number=number)
+        result[name] = {"before_ms": round(b * 1000, 3), "after_ms": round(a * 1000, 3), "speedup": round(b / a, 1)}
+
+    # só a serialização (sem banco), por 1000 itens
+    items, _ = list_entries(db, work_id=work_id, user_id=user_id, limit=n)
+    b = _best_per_call(lambda: _fastapi_render(entries_route, TimeEntriesResponse(items=[TimeEntryItem(**x) for x in items], next_cursor=None)), repeat=repeat, number=number)
+    a = _best_per_call(lambda: time_entries_page_adapter.dump_json({"items": items, "next_cursor": None}), repeat=repeat, number=number)
+    scale = 1000 / n
+    result["entries_serialize_only_per_1000"] = {
+        "before_ms": round(b * 1000 * scale, 3), "after_ms": round(a * 1000 * scale, 3), "speedup": round(b / a, 1)
+    }
+    db.close()
+    return result
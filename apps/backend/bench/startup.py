@@ -0,0 +1,108 @@
+"""
+Cold start da API: perfil de `python -X importtime` do app e tempo até a primeira resposta
+de um uvicorn recém-lançado (do Popen ao primeiro 200 em /health), como no Procfile.
+Também confere que os módulos carregados sob demanda continuam fora do import do app.
+"""
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from bench.runner import BACKEND_DIR, UVICORN_STARTUP_TIMEOUT_SECONDS, _free_port
+
+# pesados e só usados depois (primeiro login/token, primeiro lote grande de relatório)
+LAZY_MODULES = ("numpy", "jose", "passlib", "argon2")
+POLL_INTERVAL_SECONDS = 0.005
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app.api.main as m
+m.app
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"import_ms": elapsed * 1000, "loaded": [n for n in {lazy!r} if n in sys.modules]}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Linhas `import time: self | cumulative | nome` -> (nome, self_us, cumulative_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_profile(*, top: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, check=True,
+    )
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = _parse_importtime(proc.stderr)
+
+    # custo próprio somado por pacote de topo (app, fastapi, sqlalchemy, ...)
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    modules = sorted(rows, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "import_ms": round(probe["import_ms"], 1),
+        "lazy_modules_loaded": probe["loaded"],
+        "top_packages_self_ms": {name: round(us / 1000, 1) for name, us in packages},
+        "top_modules_self_ms": {name: round(us / 1000, 1) for name, us, _ in modules},
+    }
+
+
+def first_response_ms(*, app_target: str) -> float:
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "uvicorn", app_target,
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+    ]
+    if app_target.endswith("create_app"):
+        cmd.append("--factory")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=os.environ.copy())
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+            while True:
+                if proc.poll() is not None:
+                    raise SystemExit(f"uvicorn saiu com código {proc.returncode}")
+                with contextlib.suppress(httpx.TransportError):
+                    if client.get("/health").status_code == 200:
+                        return (time.perf_counter() - t0) * 1000
+                if time.perf_counter() - t0 > UVICORN_STARTUP_TIMEOUT_SECONDS:
+                    raise SystemExit("uvicorn não subiu a tempo")
+                time.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        proc.terminate()
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            proc.wait(timeout=10)
+        if proc.poll() is None:
+            proc.kill()
+
+
+def run_startup(*, runs: int, top: int, app_target: str) -> dict:
+    imports = [import_profile(top=top) for _ in range(runs)]
+    # perfil do run mais rápido (menos ruído de disco/CPU); tempos com mínimo e mediana
+    best = min(imports, key=lambda r: r["import_ms"])
+    firsts = [first_response_ms(app_target=app_target) for _ in range(runs)]
+    return {
+        "runs": runs,
+        "app": app_target,
+        "import_ms": {"min": best["import_ms"], "median": round(statistics.median(r["import_ms"] for r in imports), 1)},
+        "first_response_ms": {"min": round(min(firsts), 1), "median": round(statistics.median(firsts), 1)},
+        "lazy_modules_loaded": sorted({m for r in imports for m in r["lazy_modules_loaded"]}),
+        "top_packages_self_ms": best["top_packages_self_ms"],
+        "top_modules_self_ms": best["top_modules_self_ms"],
+    }
@@ -0,0 +1,150 @@
+"""
+Quantos assinantes SSE parados (/stream/timers) um worker do uvicorn aguenta.
+
+Abre N conexões (100 -> 1000 -> 5000 por padrão, mantendo as dos níveis anteriores) com o
+token de um usuário semeado e, com todas abertas, mede o RSS do worker (/proc/<pid>/status,
+só Linux) e a latência de GET /health: se o event loop engasga com os assinantes, é ali que
+aparece. O servidor sobe com SSE_MAX_STREAMS_PER_USER acima do maior nível (um usuário só).
+"""
+import asyncio
+import contextlib
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench.runner import BACKEND_DIR, UVICORN_STARTUP_TIMEOUT_SECONDS, _free_port, load_context
+
+CONNECT_CONCURRENCY = 100
+# sockets do próprio bench/uvicorn além dos assinantes (client de /health, banco, logs)
+FD_MARGIN = 64
+SETTLE_SECONDS = 1.0
+
+
+def _rss_mb(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _raise_fd_limit(needed: int) -> None:
+    # o uvicorn herda o limite deste processo; cada lado segura um socket por assinante
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = needed if hard == resource.RLIM_INFINITY else min(max(soft, needed), hard)
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    if target < needed:
+        raise SystemExit(f"limite de arquivos abertos {target} < {needed}: aumente o `ulimit -n`")
+
+
+async def _subscribe(port: int, token: str) -> asyncio.StreamWriter:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            "GET /stream/timers HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n"
+            f"Authorization: Bearer {token}\r\n\r\n"
+        ).encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 200"):
+        writer.close()
+        status = head.split(b"\r\n", 1)[0].decode()
+        raise SystemExit(f"/stream/timers respondeu {status}")
+    # primeiro chunk do stream: daqui em diante o assinante está registrado no broker
+    await reader.readuntil(b": connected\n\n")
+    return writer
+
+
+async def _health_latency(client: httpx.AsyncClient, samples: int) -> dict:
+    timings = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        (await client.get("/health")).raise_for_status()
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    return {
+        "p50": round(statistics.median(timings), 2),
+        "p99": round(timings[min(len(timings) - 1, int(0.99 * len(timings)))], 2),
+        "max": round(timings[-1], 2),
+    }
+
+
+async def run_streams(*, levels: list[int], health_samples: int, rng_seed: int) -> dict:
+    levels = sorted(levels)
+    _raise_fd_limit(levels[-1] + FD_MARGIN)
+    ctx = load_context(max_users=1, rng_seed=rng_seed)
+    token = next(iter(ctx.users.values()))[0]
+
+    port = _free_port()
+    env = os.environ.copy()
+    env["SSE_MAX_STREAMS_PER_USER"] = str(levels[-1] + 1)
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.api.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+    ]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+    writers: list[asyncio.StreamWriter] = []
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            deadline = time.monotonic() + UVICORN_STARTUP_TIMEOUT_SECONDS
+            while True:
+                if proc.poll() is not None:
+                    raise SystemExit(f"uvicorn saiu com código {proc.returncode}")
+                with contextlib.suppress(httpx.TransportError):
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                if time.monotonic() > deadline:
+                    raise SystemExit("uvicorn não subiu a tempo")
+                await asyncio.sleep(0.2)
+
+            baseline_rss = _rss_mb(proc.pid)
+            results = {
+                "0": {
+                    "subscribers": 0,
+                    "rss_mb": baseline_rss,
+                    "health_ms": await _health_latency(client, health_samples),
+                }
+            }
+            sem = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+            async def subscribe() -> asyncio.StreamWriter:
+                async with sem:
+                    return await _subscribe(port, token)
+
+            for n in levels:
+                t0 = time.perf_counter()
+                writers.extend(await asyncio.gather(*(subscribe() for _ in range(n - len(writers)))))
+                connect_s = time.perf_counter() - t0
+                await asyncio.sleep(SETTLE_SECONDS)
+
+                rss = _rss_mb(proc.pid)
+                results[str(n)] = {
+                    # contado pelo broker do servidor, não pelo bench
+                    "subscribers": (await client.get("/health/events")).json()["subscribers"],
+                    "connect_s": round(connect_s, 2),
+                    "rss_mb": rss,
+                    "rss_per_subscriber_kb": (
+                        round((rss - baseline_rss) * 1024 / n, 1) if rss is not None and baseline_rss is not None else None
+                    ),
+                    "health_ms": await _health_latency(client, health_samples),
+                }
+    finally:
+        for w in writers:
+            w.close()
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {"levels": levels, "results": results}
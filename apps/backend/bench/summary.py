@@ -0,0 +1,99 @@
+"""
+/reports/summary com 10k, 100k e 1M entries no range: get_summary atual (rollup diário, uma
+query agregada) contra o caminho antigo (todos os works + uma TimeEntry do ORM por entry e a
+soma num loop em Python). Mede tempo (melhor de --repeat) e pico de memória Python
+(tracemalloc, numa execução à parte pra não pesar no tempo).
+
+O banco recebe o maior tamanho uma vez (um usuário, entries espalhadas pelo ano) e cada
+tamanho pede um range de dias com ~N entries.
+"""
+import math
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+DAYS = 365
+WORKS = 10
+
+
+def _legacy_summary(db, *, user_id: str, date_from: str, date_to: str) -> dict:
+    """O get_summary de antes da agregação em SQL (mesmo trabalho, sem o rollup)."""
+    from app.db.models import TimeEntry, Work
+    from app.utils.money import cents_from_hourly_rate
+    from app.utils.time import seconds_between
+
+    d_from, d_to = date.fromisoformat(date_from), date.fromisoformat(date_to)
+    start_dt = datetime(d_from.year, d_from.month, d_from.day, tzinfo=timezone.utc)
+    end_dt = datetime(d_to.year, d_to.month, d_to.day, 23, 59, 59, tzinfo=timezone.utc)
+
+    work_map = {w.id: w for w in db.query(Work).filter(Work.user_id == user_id).all()}
+    entries = (
+        db.query(TimeEntry)
+        .join(Work, Work.id == TimeEntry.work_id)
+        .filter(
+            Work.user_id == user_id,
+            TimeEntry.deleted_at.is_(None),
+            TimeEntry.ended_at.is_not(None),
+            TimeEntry.started_at >= start_dt,
+            TimeEntry.started_at <= end_dt,
+        )
+        .all()
+    )
+    per_work: dict = {}
+    for e in entries:
+        per_work[e.work_id] = per_work.get(e.work_id, 0) + seconds_between(e.started_at, e.ended_at)
+    by_work = [
+        {"work_id": w_id, "total_seconds": sec, "total_earned_cents": cents_from_hourly_rate(work_map[w_id].hourly_rate_cents, sec)}
+        for w_id, sec in per_work.items()
+    ]
+    return {"total_seconds": sum(per_work.values()), "by_work": by_work}
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run_summary(*, sizes: list[int], repeat: int, rng_seed: int) -> dict:
+    from app.db.models import User
+    from app.db.session import SessionLocal
+    from app.services.reports_service import get_summary
+    from bench.seed import seed
+
+    sizes = sorted(sizes)
+    total = seed(users=1, works_per_user=WORKS, entries_per_work=math.ceil(sizes[-1] / WORKS), days=DAYS, rng_seed=rng_seed)["entries"]
+    with SessionLocal() as db:
+        user_id = db.query(User.id).scalar()
+    first_day = date.today() - timedelta(days=DAYS)
+
+    results = {}
+    for n in sizes:
+        # entries uniformes na janela: o range proporcional a N traz ~N entries
+        days = max(1, math.ceil(DAYS * n / total))
+        params = dict(user_id=user_id, date_from=first_day.isoformat(), date_to=(first_day + timedelta(days=days - 1)).isoformat())
+        row = {}
+        for name, fn in (("before", _legacy_summary), ("after", get_summary)):
+            def call(fn=fn):
+                # sessão nova por chamada: o identity map não carrega objetos de uma pra outra
+                with SessionLocal() as db:
+                    return fn(db, **params)
+
+            call()  # aquece
+            row[name] = {"ms": round(_best_of(call, repeat) * 1000, 2), "peak_mb": round(_peak_mb(call), 2)}
+        row["speedup"] = round(row["before"]["ms"] / max(row["after"]["ms"], 1e-6), 1)
+        row["memory_ratio"] = round(row["before"]["peak_mb"] / max(row["after"]["peak_mb"], 1e-6), 1)
+        results[str(n)] = row
+    return {"entries": total, "results": results}
@@ -0,0 +1,64 @@
+"""
+Fixtures dos testes. O banco é sempre um dedicado (TEST_DATABASE_URL ou um SQLite temporário),
+nunca o DATABASE_URL do ambiente: cada teste apaga e recria o schema.
+Precisa rodar antes de qualquer import de app.* (o Settings lê o ambiente no import).
+"""
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="controlador-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["JWT_SECRET"] = "test-secret"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.pop("DATABASE_READ_URL", None)
+
+from app.db.base import Base  # noqa: E402
+from app.db.models import TimeEntry, User, Work  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+
+
+def reset_schema(bind) -> None:
+    Base.metadata.drop_all(bind)
+    Base.metadata.create_all(bind)
+
+
+@pytest.fixture
+def db():
+    reset_schema(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+def add_user(db, *, email: str = "user@example.com") -> User:
+    user = User(email=email, password_hash="x", name="Test")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def add_work(db, user: User, *, title: str = "Work", start_date: date | None = None, rate: int = 3500) -> Work:
+    start = start_date or date.today() - timedelta(days=90)
+    w = Work(
+        user_id=user.id,
+        title=title,
+        sprint_name="Sprint",
+        start_date=start.isoformat(),
+        end_date=(date.today() + timedelta(days=365)).isoformat(),
+        hourly_rate_cents=rate,
+    )
+    db.add(w)
+    db.flush()
+    return w
+
+
+def add_entries(db, w: Work, *, n: int, start: datetime | None = None, spacing: timedelta = timedelta(hours=5)) -> None:
+    """n entries fechadas de 1 h, sem sobreposição, a partir de `start` (default: 60 dias atrás)."""
+    base = start or datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=60)
+    db.add_all(
+        TimeEntry(work_id=w.id, started_at=base + i * spacing, ended_at=base + i * spacing + timedelta(hours=1))
+        for i in range(n)
+    )
+    db.flush()
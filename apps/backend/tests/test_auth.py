@@ -0,0 +1,29 @@
+"""register/login: nenhuma conexão do pool fica presa enquanto o argon2 espera na fila do hashing."""
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.api.routes import auth as auth_routes
+from app.core.security import hash_password_async, verify_password_async
+from app.db.session import engine
+
+
+def _recording(fn, checked_out: list):
+    async def wrapper(*args):
+        checked_out.append(engine.pool.checkedout())
+        return await fn(*args)
+
+    return wrapper
+
+
+def test_hashing_does_not_hold_a_db_connection(db, monkeypatch):
+    checked_out: list[int] = []
+    monkeypatch.setattr(auth_routes, "hash_password_async", _recording(hash_password_async, checked_out))
+    monkeypatch.setattr(auth_routes, "verify_password_async", _recording(verify_password_async, checked_out))
+    credentials = {"email": "login@example.com", "password": "s3cret-password"}
+
+    with TestClient(app) as client:
+        assert client.post("/auth/register", json={**credentials, "name": "Login"}).status_code == 200
+        assert client.post("/auth/login", json=credentials).status_code == 200
+        assert client.post("/auth/login", json={**credentials, "password": "wrong"}).status_code == 401
+
+    assert checked_out == [0, 0, 0]
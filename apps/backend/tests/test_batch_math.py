@@ -0,0 +1,82 @@
+"""
+seconds_between_batch / cents_from_hourly_rate_batch iguais bit a bit às versões escalares, no
+caminho NumPy e no fallback puro Python. O speedup fica no bench micro.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from fractions import Fraction
+
+import pytest
+
+from app.utils import time as time_utils
+from app.utils.money import SECONDS_PER_HOUR, cents_from_hourly_rate, cents_from_hourly_rate_batch
+from app.utils.time import epoch_us, seconds_between, seconds_between_batch
+
+# acima do NUMPY_MIN_BATCH: com NumPy instalado, o lote vai pelo caminho vetorizado
+N = 4 * time_utils.NUMPY_MIN_BATCH
+
+
+def _sample(rng_seed: int = 42):
+    rng = random.Random(rng_seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    starts, ends, rates = [], [], []
+    for _ in range(N):
+        s = base + timedelta(microseconds=rng.randint(0, 365 * 86400 * 10**6))
+        starts.append(s)
+        # inclui fim antes do início (vira 0) e frações de segundo
+        ends.append(s + timedelta(microseconds=rng.randint(-10**6, 8 * 3600 * 10**6)))
+        rates.append(rng.choice((2500, 3500, 5000, 8000, rng.randint(1, 100_000))))
+    return starts, ends, rates
+
+
+@pytest.fixture(params=["numpy", "pure_python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(time_utils, "USE_NUMPY", False)
+    return request.param
+
+
+def test_batch_matches_scalar(backend):
+    starts, ends, rates = _sample()
+    expected_secs = [seconds_between(s, e) for s, e in zip(starts, ends)]
+    expected_cents = [cents_from_hourly_rate(r, sec) for r, sec in zip(rates, expected_secs)]
+
+    secs = seconds_between_batch([epoch_us(s) for s in starts], [epoch_us(e) for e in ends])
+    assert secs == expected_secs
+    assert cents_from_hourly_rate_batch(rates, secs) == expected_cents
+
+
+def test_batch_chains_ndarrays():
+    np = pytest.importorskip("numpy")
+    starts, ends, rates = _sample(7)
+    expected_secs = [seconds_between(s, e) for s, e in zip(starts, ends)]
+
+    as_array = time_utils.as_int64_array
+    secs = seconds_between_batch(as_array([epoch_us(s) for s in starts]), as_array([epoch_us(e) for e in ends]))
+    cents = cents_from_hourly_rate_batch(as_array(rates), secs)
+    assert isinstance(cents, np.ndarray)
+    assert secs.tolist() == expected_secs
+    assert cents.tolist() == [cents_from_hourly_rate(r, sec) for r, sec in zip(rates, expected_secs)]
+
+
+# rate * seconds caindo exatamente em x,5 centavo: empate vai pro par
+TIES = [(1, 1800, 0), (1, 5400, 2), (1, 9000, 2), (3, 1800, 2), (5, 2520, 4), (2500, 18, 12), (2500, 54, 38)]
+
+
+@pytest.mark.parametrize("rate,seconds,expected", TIES)
+def test_half_even_ties(backend, rate, seconds, expected):
+    assert cents_from_hourly_rate(rate, seconds) == expected
+    # o lote repete o caso até passar do NUMPY_MIN_BATCH, pra cobrir o caminho vetorizado
+    assert cents_from_hourly_rate_batch([rate] * N, [seconds] * N) == [expected] * N
+
+
+def test_rounding_matches_exact_fraction(backend):
+    rng = random.Random(3)
+    rates = [rng.randint(1, 200_000) for _ in range(N)]
+    seconds = [rng.choice((0, -5, rng.randint(1, 10 * 3600))) for _ in range(N)]
+    # Fraction arredonda meio pro par, sem erro de float
+    expected = [round(Fraction(r * s, SECONDS_PER_HOUR)) if s > 0 else 0 for r, s in zip(rates, seconds)]
+    assert [cents_from_hourly_rate(r, s) for r, s in zip(rates, seconds)] == expected
+    assert cents_from_hourly_rate_batch(rates, seconds) == expected
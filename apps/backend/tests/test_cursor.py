@@ -0,0 +1,55 @@
+"""Cursores de paginação: ida e volta, e token forjado vira 400 (nunca 500)."""
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.timer_service import list_entries
+from app.services.work_service import list_works
+from app.utils.cursor import decode_cursor, encode_cursor
+from tests.conftest import add_entries, add_user, add_work
+
+
+def _forge(raw) -> str:
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode().rstrip("=")
+
+
+FORGED = [
+    "not-base64!",
+    _forge({"dt": "2024-01-01T00:00:00"}),
+    _forge([{"dt": "2024-01-01T00:00:00+00:00"}]),
+    _forge([{"dt": 5}, "x"]),
+    _forge([{"dt": "ontem"}, "x"]),
+    _forge([None, "x"]),
+    _forge([{"dt": "2024-01-01T00:00:00+00:00"}, 7]),
+]
+
+
+def test_round_trip():
+    started_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    token = encode_cursor([started_at, "entry-id"])
+    assert decode_cursor(token, types=(datetime, str)) == [started_at, "entry-id"]
+    assert decode_cursor(encode_cursor(["2024-05-01", "work-id"]), types=(str, str)) == ["2024-05-01", "work-id"]
+
+
+@pytest.mark.parametrize("token", FORGED + [_forge(["a", "b"])])
+def test_forged_entries_cursor_is_bad_request(db, token):
+    user = add_user(db)
+    w = add_work(db, user)
+    add_entries(db, w, n=3)
+    db.commit()
+    with pytest.raises(HTTPException) as exc:
+        list_entries(db, work_id=w.id, user_id=user.id, limit=2, cursor=token)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("token", FORGED + [_forge([{"dt": "2024-01-01T00:00:00+00:00"}, "x"])])
+def test_forged_works_cursor_is_bad_request(db, token):
+    user = add_user(db)
+    add_work(db, user)
+    db.commit()
+    with pytest.raises(HTTPException) as exc:
+        list_works(db, user_id=user.id, limit=2, cursor=token)
+    assert exc.value.status_code == 400
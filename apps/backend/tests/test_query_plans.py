@@ -0,0 +1,153 @@
+"""
+As queries dos services usam índice (nada de varrer time_entries/works/rollup inteiros).
+
+Os SELECTs emitidos pelos services são capturados e rodam de novo com EXPLAIN:
+- Postgres (TEST_POSTGRES_URL; sem ela o caso é pulado): com enable_seqscan=off o planner só
+  escolhe Seq Scan quando nenhum índice serve, então Seq Scan numa tabela do app é falha.
+- Banco dos testes (SQLite por padrão): EXPLAIN QUERY PLAN sem "SCAN <tabela do app>".
+"""
+import contextlib
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.session import engine
+from app.services.partition_service import ensure_partitions
+from app.services.reports_service import get_summary, get_timeseries, iter_entries_export
+from app.services.rollup_service import rebuild_daily_totals
+from app.services.timer_service import (
+    get_timer_state,
+    get_timer_states,
+    list_entries,
+    soft_delete_time_entry,
+    start_timer,
+    stop_timer,
+)
+from app.services.work_service import close_work, list_works
+from tests.conftest import add_entries, add_user, add_work, reset_schema
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+APP_TABLES = {t.name for t in Base.metadata.sorted_tables}
+
+
+def _is_app_table(name: str) -> bool:
+    # partições de time_entries (time_entries_2026_10, time_entries_default) contam como a mãe
+    return name in APP_TABLES or name.startswith("time_entries_")
+
+
+@contextlib.contextmanager
+def _captured_selects(bind):
+    statements: list[tuple[str, object]] = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before)
+
+
+def _postgres_full_scans(conn, statement: str, parameters) -> list[str]:
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scans, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node["Node Type"] == "Seq Scan" and _is_app_table(node.get("Relation Name", "")):
+            scans.append(node["Relation Name"])
+        stack.extend(node.get("Plans", ()))
+    return scans
+
+
+def _sqlite_full_scans(conn, statement: str, parameters) -> list[str]:
+    scans = []
+    for _, _, _, detail in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+        words = detail.split()
+        # "SCAN works" / "SCAN works USING INDEX ..." percorre a tabela/índice inteiro;
+        # "SEARCH ... USING INDEX" é o acesso indexado
+        if words[0] == "SCAN" and _is_app_table(words[1]):
+            scans.append(detail)
+    return scans
+
+
+@pytest.fixture(params=["app", "postgres"])
+def plan_db(request):
+    if request.param == "app":
+        bind = engine
+    elif not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL não definida")
+    else:
+        bind = create_engine(POSTGRES_URL)
+    reset_schema(bind)
+    with Session(bind=bind) as db:
+        # Postgres: create_all só cria a tabela mãe de time_entries
+        ensure_partitions(db, since=date.today() - timedelta(days=120))
+        db.commit()
+        yield db
+    if bind is not engine:
+        bind.dispose()
+
+
+def _seed(db: Session):
+    user = add_user(db)
+    works = [add_work(db, user, title=f"Work {i}") for i in range(3)]
+    for w in works:
+        add_entries(db, w, n=40)
+    rebuild_daily_totals(db)
+    db.commit()
+    return user, works
+
+
+def _exercise_services(db: Session, user, works) -> None:
+    date_from = (date.today() - timedelta(days=90)).isoformat()
+    date_to = date.today().isoformat()
+
+    start_timer(db, work_id=works[0].id, user_id=user.id)
+    get_timer_state(db, work_id=works[0].id, user_id=user.id)
+    stop_timer(db, work_id=works[0].id, user_id=user.id)
+    get_timer_states(db, user_id=user.id)
+    get_timer_states(db, user_id=user.id, work_ids=[w.id for w in works])
+
+    items, cursor = list_entries(db, work_id=works[0].id, user_id=user.id, limit=10)
+    list_entries(db, work_id=works[0].id, user_id=user.id, limit=10, cursor=cursor)
+    _, cursor = list_works(db, user_id=user.id, limit=1)
+    list_works(db, user_id=user.id, limit=1, cursor=cursor)
+    list_works(db, user_id=user.id, limit=None)
+    soft_delete_time_entry(db, work_id=works[0].id, entry_id=items[-1]["id"], user_id=user.id)
+
+    # encerrado: relatórios e timer leem o fechamento
+    close_work(db, work_id=works[1].id, user_id=user.id)
+    get_timer_state(db, work_id=works[1].id, user_id=user.id)
+    get_summary(db, user_id=user.id, date_from=date_from, date_to=date_to)
+    get_timeseries(db, user_id=user.id, date_from=date_from, date_to=date_to, group_by=["day", "work"])
+    for _ in iter_entries_export(db, user_id=user.id, date_from=date_from, date_to=date_to, fmt="csv"):
+        pass
+    db.commit()
+
+
+def test_service_queries_use_indexes(plan_db: Session):
+    bind = plan_db.get_bind()
+    user, works = _seed(plan_db)
+    with _captured_selects(bind) as statements:
+        _exercise_services(plan_db, user, works)
+    assert statements
+
+    full_scans = _postgres_full_scans if bind.dialect.name == "postgresql" else _sqlite_full_scans
+    problems = []
+    with bind.connect() as conn:
+        for statement, parameters in statements:
+            with conn.begin():
+                scans = full_scans(conn, statement, parameters)
+            if scans:
+                problems.append(f"{', '.join(scans)} <- {' '.join(statement.split())[:300]}")
+    assert not problems, "queries sem índice:\n" + "\n".join(problems)
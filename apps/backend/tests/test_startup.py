@@ -0,0 +1,23 @@
+"""Import do app (cold start): os backends pesados só carregam no primeiro uso. A meta de tempo fica no bench startup."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LAZY_MODULES = ("passlib", "jose", "numpy")
+
+
+def test_app_import_leaves_crypto_and_numpy_out():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.api.main"],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, check=True,
+    )
+    # linhas `import time: self | cumulative | nome`; o nome vem indentado pela profundidade
+    imported = {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "self [us]" not in line
+    }
+    assert imported, proc.stderr
+    assert not imported & set(LAZY_MODULES)
@@ -0,0 +1,116 @@
+"""get_summary (rollup + fechamentos) tem que sair byte a byte igual ao loop por entry de antes."""
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+from app.db.models import TimeEntry, Work
+from app.services.reports_service import get_summary
+from app.services.rollup_service import rebuild_daily_totals
+from app.services.timer_service import soft_delete_time_entry, start_timer
+from app.services.work_service import close_work
+from app.utils.money import cents_from_hourly_rate
+from app.utils.time import seconds_between
+from tests.conftest import add_entries, add_user, add_work
+
+
+def _legacy_summary(db, *, user_id: str, date_from: str, date_to: str) -> Dict:
+    """
+    O get_summary de antes da agregação em SQL, como estava. Única mudança: o ORDER BY das
+    entries, que antes não existia (empates no ganho saíam na ordem que o banco devolvesse).
+    """
+    d_from = date.fromisoformat(date_from)
+    d_to = date.fromisoformat(date_to)
+
+    start_dt = datetime(d_from.year, d_from.month, d_from.day, tzinfo=timezone.utc)
+    end_dt = datetime(d_to.year, d_to.month, d_to.day, tzinfo=timezone.utc)
+    end_dt = end_dt.replace(hour=23, minute=59, second=59)
+
+    works = db.query(Work).filter(Work.user_id == user_id).all()
+    work_map = {w.id: w for w in works}
+
+    entries = (
+        db.query(TimeEntry)
+        .join(Work, Work.id == TimeEntry.work_id)
+        .filter(
+            Work.user_id == user_id,
+            TimeEntry.deleted_at.is_(None),
+            TimeEntry.ended_at.is_not(None),
+            TimeEntry.started_at >= start_dt,
+            TimeEntry.started_at <= end_dt,
+        )
+        .order_by(Work.start_date.desc(), Work.id.desc(), TimeEntry.started_at)
+        .all()
+    )
+
+    per_work_seconds: Dict[str, int] = {}
+    for e in entries:
+        sec = seconds_between(e.started_at, e.ended_at)
+        per_work_seconds[e.work_id] = per_work_seconds.get(e.work_id, 0) + sec
+
+    items: List[dict] = []
+    total_seconds = 0
+    total_earned_cents = 0
+    for work_id, sec in per_work_seconds.items():
+        w = work_map[work_id]
+        earned = cents_from_hourly_rate(w.hourly_rate_cents, sec)
+        items.append(
+            {
+                "work_id": w.id,
+                "title": w.title,
+                "sprint_name": w.sprint_name,
+                "total_seconds": sec,
+                "total_earned_cents": earned,
+                "currency": w.currency,
+            }
+        )
+        total_seconds += sec
+        total_earned_cents += earned
+
+    items.sort(key=lambda x: x["total_earned_cents"], reverse=True)
+    return {
+        "from": date_from,
+        "to": date_to,
+        "total_seconds": total_seconds,
+        "total_earned_cents": total_earned_cents,
+        "currency": "BRL",
+        "by_work": items,
+    }
+
+
+def test_summary_matches_legacy_loop(db):
+    user = add_user(db)
+    # entries das 10h às 11h UTC: o dia em UTC (loop antigo) é o mesmo dia no fuso BR (rollup)
+    first = datetime.combine(date.today() - timedelta(days=60), time(10), tzinfo=timezone.utc)
+    daily = timedelta(days=1)
+
+    # três works empatados no ganho, criados fora da ordem da listagem (start_date, id desc)
+    tied = [
+        add_work(db, user, title="Tied old", start_date=date.today() - timedelta(days=90)),
+        add_work(db, user, title="Tied new", start_date=date.today() - timedelta(days=70)),
+        add_work(db, user, title="Tied new 2", start_date=date.today() - timedelta(days=70)),
+    ]
+    for w in tied:
+        add_entries(db, w, n=5, start=first, spacing=daily)
+    top = add_work(db, user, title="Top", rate=9999)
+    add_entries(db, top, n=7, start=first, spacing=daily)
+    closed = add_work(db, user, title="Closed", rate=1234)
+    add_entries(db, closed, n=4, start=first, spacing=daily)
+    odd = add_work(db, user, title="Odd rate", rate=3333)
+    db.add(TimeEntry(work_id=odd.id, started_at=first, ended_at=first + timedelta(seconds=1789)))
+    # fora do range pedido: não entra em nenhum dos dois
+    add_entries(db, odd, n=2, start=first - timedelta(days=20), spacing=daily)
+    rebuild_daily_totals(db)
+    db.commit()
+
+    close_work(db, work_id=closed.id, user_id=user.id)
+    deleted = db.query(TimeEntry).filter(TimeEntry.work_id == top.id).order_by(TimeEntry.started_at).first()
+    soft_delete_time_entry(db, work_id=top.id, entry_id=deleted.id, user_id=user.id)
+    start_timer(db, work_id=tied[0].id, user_id=user.id)
+
+    date_from = (first - timedelta(days=5)).date().isoformat()
+    date_to = date.today().isoformat()
+    db.expire_all()
+    new = get_summary(db, user_id=user.id, date_from=date_from, date_to=date_to)
+    old = _legacy_summary(db, user_id=user.id, date_from=date_from, date_to=date_to)
+
+    assert json.dumps(new) == json.dumps(old)
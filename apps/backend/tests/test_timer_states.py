@@ -0,0 +1,88 @@
+"""GET /timers e get_timer_states: número de queries constante, qualquer que seja o número de works."""
+import contextlib
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.main import app
+from app.core.security import create_access_token
+from app.db import query_stats
+from app.db.models import User
+from app.db.session import engine
+from app.services.timer_service import get_timer_states, start_timer
+from app.services.work_service import close_work
+from tests.conftest import add_entries, add_user, add_work
+
+# todo tamanho já tem um work encerrado e um timer aberto (os dois caminhos da leitura)
+SIZES = (2, 10, 40)
+
+
+def _running(i: int) -> bool:
+    return i % 3 == 1
+
+
+def _grow_to(db, user_id: str, work_ids: list, n: int) -> None:
+    """Completa `work_ids` até n: o 1º e depois 1 a cada 4 encerrados, 1 a cada 3 com timer aberto."""
+    user = db.get(User, user_id)
+    while len(work_ids) < n:
+        i = len(work_ids)
+        w = add_work(db, user, title=f"Work {i}")
+        add_entries(db, w, n=3)
+        db.commit()
+        if _running(i):
+            start_timer(db, work_id=w.id, user_id=user_id)
+        elif i % 4 == 0:
+            close_work(db, work_id=w.id, user_id=user_id)
+        work_ids.append(w.id)
+
+
+@contextlib.contextmanager
+def _count_statements():
+    # conta no engine (o TestClient roda o app em outra thread, fora do contextvar do query_stats)
+    counter = {"n": 0}
+
+    def before(*_):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+
+
+def test_service_query_count_does_not_grow_with_works(db):
+    user_id = add_user(db).id
+    work_ids: list = []
+    counts = {}
+    for n in SIZES:
+        _grow_to(db, user_id, work_ids, n)
+        db.expunge_all()
+        stats, token = query_stats.begin()
+        try:
+            states = get_timer_states(db, user_id=user_id)
+        finally:
+            query_stats.end(token)
+        assert len(states) == n
+        assert sum(s["running"] for s in states) == sum(_running(i) for i in range(n))
+        counts[n] = stats.count
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_route_query_count_does_not_grow_with_works(db):
+    user_id = add_user(db).id
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(subject=user_id)}
+    work_ids: list = []
+    counts = {}
+    with TestClient(app) as client:
+        client.get("/timers", headers=headers)  # aquece o cache de auth
+        for n in SIZES:
+            _grow_to(db, user_id, work_ids, n)
+            ids = ",".join(work_ids)
+            with _count_statements() as counter:
+                resp = client.get(f"/timers?work_ids={ids}", headers=headers)
+            assert resp.status_code == 200
+            assert len(resp.json()["items"]) == n
+            counts[n] = counter["n"]
+    assert len(set(counts.values())) == 1, counts
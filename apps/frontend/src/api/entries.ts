@@ -22,12 +22,20 @@ export type TimeEntryItem = {
 
 export type TimeEntriesResponse = {
   items: TimeEntryItem[];
+  next_cursor?: string | null;
 };
 
 export async function getTimerState(workId: string) {
   return apiFetch<TimerStateResponse>(`/works/${workId}/timer`);
 }
 
+export type TimerStateItem = TimerStateResponse & { work_id: string };
+
+export async function getTimerStates(workIds?: string[]) {
+  const q = workIds ? `?work_ids=${encodeURIComponent(workIds.join(","))}` : "";
+  return apiFetch<{ items: TimerStateItem[] }>(`/timers${q}`);
+}
+
 export async function getEntries(workId: string, limit = 200) {
   return apiFetch<TimeEntriesResponse>(`/works/${workId}/entries?limit=${limit}`);
 }
@@ -22,3 +22,66 @@ export async function getSummary(dateFrom: string, dateTo: string) {
   const q = new URLSearchParams({ date_from: dateFrom, date_to: dateTo });
   return apiFetch<SummaryResponse>(`/reports/summary?${q.toString()}`);
 }
+
+export type TimeseriesGroup = "day" | "week" | "month" | "sprint" | "work";
+
+export type TimeseriesBucket = {
+  day?: string;
+  week?: string; // segunda-feira da semana ISO (YYYY-MM-DD)
+  month?: string; // primeiro dia do mês (YYYY-MM-DD)
+  sprint_name?: string;
+  work_id?: string;
+  title?: string;
+  total_seconds: number;
+  total_earned_cents: number;
+};
+
+export type TimeseriesResponse = {
+  from: string;
+  to: string;
+  group_by: TimeseriesGroup[];
+  total_seconds: number;
+  total_earned_cents: number;
+  currency: string;
+  buckets: TimeseriesBucket[];
+};
+
+export async function getTimeseries(dateFrom: string, dateTo: string, groupBy: TimeseriesGroup[]) {
+  const q = new URLSearchParams({ date_from: dateFrom, date_to: dateTo, group_by: groupBy.join(",") });
+  return apiFetch<TimeseriesResponse>(`/reports/timeseries?${q.toString()}`);
+}
+
+// ranges longos (acima de REPORT_SYNC_MAX_DAYS no backend) rodam em background
+export type ReportJobStatus = "queued" | "running" | "done" | "failed" | "canceled";
+
+export type ReportJob<T = SummaryResponse | TimeseriesResponse> = {
+  id: string;
+  kind: "summary" | "timeseries";
+  params: { date_from: string; date_to: string; group_by?: TimeseriesGroup[] };
+  status: ReportJobStatus;
+  result: T | null;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+};
+
+export async function createReportJob(
+  kind: "summary" | "timeseries",
+  dateFrom: string,
+  dateTo: string,
+  groupBy?: TimeseriesGroup[]
+) {
+  return apiFetch<ReportJob>("/reports/jobs", {
+    method: "POST",
+    body: JSON.stringify({ kind, date_from: dateFrom, date_to: dateTo, group_by: groupBy }),
+  });
+}
+
+export async function getReportJob(id: string) {
+  return apiFetch<ReportJob>(`/reports/jobs/${id}`);
+}
+
+export async function cancelReportJob(id: string) {
+  return apiFetch<ReportJob>(`/reports/jobs/${id}/cancel`, { method: "POST" });
+}
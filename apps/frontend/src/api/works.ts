@@ -19,7 +19,7 @@ export type WorkListItem = {
   currency: string;
 };
 
-export type WorksListResponse = { items: WorkListItem[] };
+export type WorksListResponse = { items: WorkListItem[]; next_cursor?: string | null };
 
 export async function createWork(payload: WorkCreateRequest) {
   return apiFetch<WorkCreateResponse>("/works", {